@@ -0,0 +1,13 @@
+"""
+Benchmarks for cloudsentry-cli.
+
+``benchmarks.generate``
+    Seeded generator for synthetic but realistically shaped Terraform plans.
+``benchmarks.run``
+    Runner that measures throughput, peak RSS and per-stage timings of
+    ``scan_plan`` and ``cmd_scan`` and compares them with a stored baseline.
+
+Run from the repository root::
+
+    PYTHONPATH=src python -m benchmarks.run --sizes 1000,10000
+"""
@@ -0,0 +1,250 @@
+"""
+Seeded generator for synthetic Terraform plan JSON.
+
+The output has the shape of ``terraform show -json plan.out``: the
+``resource_changes`` the scanner reads, plus ``planned_values``,
+``prior_state`` and ``configuration`` sections that it has to skip over.
+The same arguments and seed always produce the same plan.
+
+Usage::
+
+    python -m benchmarks.generate --resources 50000 --seed 1 -o big.json
+
+    from benchmarks.generate import PlanSpec, write_plan
+    write_plan("big.json", PlanSpec(resources=50000, prior_state_bloat=4096))
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+# Resource type → relative weight, roughly what an AWS monorepo looks like.
+DEFAULT_TYPE_MIX = {
+    "aws_s3_bucket": 20,
+    "aws_security_group": 15,
+    "aws_security_group_rule": 15,
+    "aws_instance": 15,
+    "aws_iam_role": 10,
+    "aws_db_instance": 5,
+    "aws_lambda_function": 10,
+    "aws_route53_record": 10,
+}
+
+# Plan action → relative weight.
+DEFAULT_ACTION_MIX = {
+    "create": 40,
+    "update": 30,
+    "no-op": 25,
+    "delete": 5,
+}
+
+_RISKY_PORTS = (22, 3389)
+_SAFE_PORTS = (80, 443, 5432, 8080)
+
+
+@dataclass
+class PlanSpec:
+    """Parameters of a synthetic plan."""
+
+    resources: int = 1000
+    seed: int = 0
+    type_mix: dict[str, int] = field(default_factory=lambda: dict(DEFAULT_TYPE_MIX))
+    action_mix: dict[str, int] = field(default_factory=lambda: dict(DEFAULT_ACTION_MIX))
+    # Fraction of resources configured to trigger a built-in check.
+    violation_rate: float = 0.05
+    # Ingress blocks per aws_security_group.
+    sg_rules: int = 4
+    # Maximum module nesting depth; 0 puts everything in the root module.
+    module_depth: int = 2
+    # Number of distinct modules at each nesting level.
+    modules_per_level: int = 8
+    # Extra bytes of attribute data per resource in prior_state.
+    prior_state_bloat: int = 512
+
+
+def generate_plan(spec: PlanSpec) -> dict[str, Any]:
+    """Build the plan document described by *spec*."""
+    rng = random.Random(spec.seed)
+    types = list(spec.type_mix)
+    type_weights = [spec.type_mix[t] for t in types]
+    actions = list(spec.action_mix)
+    action_weights = [spec.action_mix[a] for a in actions]
+
+    resource_changes = []
+    planned = []
+    prior = []
+    for i in range(spec.resources):
+        resource_type = rng.choices(types, type_weights)[0]
+        action = rng.choices(actions, action_weights)[0]
+        module = _module_address(rng, spec)
+        name = f"r{i}"
+        address = f"{module}.{resource_type}.{name}" if module else f"{resource_type}.{name}"
+        violating = rng.random() < spec.violation_rate
+        after = _attributes(rng, resource_type, i, violating, spec.sg_rules)
+        before = None if action == "create" else _mutate(rng, after)
+
+        change = {
+            "address": address,
+            "mode": "managed",
+            "type": resource_type,
+            "name": name,
+            "provider_name": "registry.terraform.io/hashicorp/aws",
+            "change": {
+                "actions": [action],
+                "before": before,
+                "after": None if action == "delete" else after,
+                "after_unknown": {"id": action == "create", "arn": action == "create"},
+                "before_sensitive": False if before is None else {},
+                "after_sensitive": {},
+            },
+        }
+        if module:
+            change["module_address"] = module
+        resource_changes.append(change)
+
+        if action != "delete":
+            planned.append({
+                "address": address,
+                "type": resource_type,
+                "name": name,
+                "values": after,
+            })
+        if before is not None:
+            prior.append({
+                "address": address,
+                "type": resource_type,
+                "name": name,
+                "values": {**before, "bloat": _bloat(rng, spec.prior_state_bloat)},
+            })
+
+    return {
+        "format_version": "1.2",
+        "terraform_version": "1.7.0",
+        "planned_values": {"root_module": {"resources": planned}},
+        "resource_changes": resource_changes,
+        "prior_state": {
+            "format_version": "1.0",
+            "values": {"root_module": {"resources": prior}},
+        },
+        "configuration": {
+            "provider_config": {"aws": {"name": "aws", "full_name": "hashicorp/aws"}},
+            "root_module": {"resources": [
+                {"address": t, "type": t, "expressions": {}} for t in types
+            ]},
+        },
+    }
+
+
+def write_plan(path: str, spec: Optional[PlanSpec] = None) -> int:
+    """Write the plan for *spec* to *path*.  Returns the file size in bytes."""
+    text = json.dumps(generate_plan(spec or PlanSpec()))
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(text)
+    return len(text.encode())
+
+
+# ---------------------------------------------------------------------------
+# Attribute builders
+# ---------------------------------------------------------------------------
+
+def _module_address(rng: random.Random, spec: PlanSpec) -> str:
+    depth = rng.randint(0, spec.module_depth)
+    return ".".join(
+        f"module.m{level}_{rng.randrange(spec.modules_per_level)}"
+        for level in range(depth)
+    )
+
+
+def _attributes(
+    rng: random.Random,
+    resource_type: str,
+    index: int,
+    violating: bool,
+    sg_rules: int,
+) -> dict[str, Any]:
+    tags = {"Name": f"{resource_type}-{index}", "team": rng.choice(["core", "data", "web"])}
+    if resource_type == "aws_s3_bucket":
+        acl = rng.choice(["public-read", "public-read-write"]) if violating else "private"
+        return {"bucket": f"bucket-{index}", "acl": acl, "force_destroy": False, "tags": tags}
+    if resource_type == "aws_security_group":
+        ingress = [_ingress(rng, violating and n == 0) for n in range(sg_rules)]
+        return {"name": f"sg-{index}", "ingress": ingress, "egress": [], "tags": tags}
+    if resource_type == "aws_security_group_rule":
+        return {"type": "ingress", "security_group_id": f"sg-{index:08x}",
+                **_ingress(rng, violating)}
+    if resource_type == "aws_instance":
+        return {"ami": f"ami-{index:08x}", "instance_type": rng.choice(["t3.micro", "m5.large"]),
+                "associate_public_ip_address": violating, "tags": tags}
+    if resource_type == "aws_iam_role":
+        policy = {"Version": "2012-10-17", "Statement": [{
+            "Effect": "Allow", "Action": "sts:AssumeRole",
+            "Principal": {"Service": "ec2.amazonaws.com"},
+        }]}
+        return {"name": f"role-{index}", "assume_role_policy": json.dumps(policy), "tags": tags}
+    if resource_type == "aws_db_instance":
+        return {"identifier": f"db-{index}", "engine": "postgres",
+                "storage_encrypted": not violating, "publicly_accessible": violating,
+                "tags": tags}
+    return {"name": f"{resource_type}-{index}", "tags": tags}
+
+
+def _ingress(rng: random.Random, open_to_world: bool) -> dict[str, Any]:
+    port = rng.choice(_RISKY_PORTS if open_to_world else _SAFE_PORTS)
+    cidr = "0.0.0.0/0" if open_to_world else f"10.{rng.randrange(256)}.0.0/16"
+    return {
+        "from_port": port,
+        "to_port": port,
+        "protocol": "tcp",
+        "cidr_blocks": [cidr],
+        "ipv6_cidr_blocks": [],
+        "description": "",
+    }
+
+
+def _mutate(rng: random.Random, after: dict[str, Any]) -> dict[str, Any]:
+    before = dict(after)
+    before["tags"] = {**after.get("tags", {}), "revision": str(rng.randrange(100))}
+    return before
+
+
+def _bloat(rng: random.Random, size: int) -> str:
+    return "".join(rng.choices("abcdefghijklmnopqrstuvwxyz0123456789", k=size))
+
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.generate",
+        description="Write a synthetic Terraform plan JSON file.",
+    )
+    defaults = PlanSpec()
+    parser.add_argument("-o", "--output", required=True, metavar="FILE")
+    parser.add_argument("--resources", type=int, default=defaults.resources)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--violation-rate", type=float, default=defaults.violation_rate)
+    parser.add_argument("--sg-rules", type=int, default=defaults.sg_rules)
+    parser.add_argument("--module-depth", type=int, default=defaults.module_depth)
+    parser.add_argument("--prior-state-bloat", type=int, default=defaults.prior_state_bloat,
+                        metavar="BYTES")
+    args = parser.parse_args(argv)
+
+    size = write_plan(args.output, PlanSpec(
+        resources=args.resources,
+        seed=args.seed,
+        violation_rate=args.violation_rate,
+        sg_rules=args.sg_rules,
+        module_depth=args.module_depth,
+        prior_state_bloat=args.prior_state_bloat,
+    ))
+    print(f"Wrote {args.output} ({args.resources} resources, {size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
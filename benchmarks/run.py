@@ -0,0 +1,356 @@
+"""
+Benchmark runner for ``scan_plan`` and ``cmd_scan``.
+
+For every plan size a synthetic plan is generated (see
+:mod:`benchmarks.generate`), then each target is run in a fresh Python
+process so its peak RSS is not polluted by earlier cases:
+
+``scan_plan``
+    The public library call, with the *load* and *evaluate* stages timed
+    by its :class:`~cloudsentry_cli.profile.ScanProfile`, then *report*
+    (write the JSON report).
+``cmd_scan``
+    The whole CLI command with console output discarded; stage timings
+    come from its ``--profile`` report section.
+
+``--decoders json,orjson`` runs every case once per JSON backend (see
+:mod:`cloudsentry_cli.decoders`) on the same plan, to compare them; backends
+that are not installed are skipped.
+
+Each case is run ``--repeat`` times and the fastest run is kept.  With
+``--baseline FILE`` the results are compared to a stored run and the exit
+code is 1 if throughput dropped or peak RSS grew by more than
+``--tolerance``; ``--save-baseline`` writes the current run to that file.
+
+Usage::
+
+    PYTHONPATH=src python -m benchmarks.run --sizes 1000,10000,100000
+    PYTHONPATH=src python -m benchmarks.run --baseline benchmarks/baseline.json
+    PYTHONPATH=src python -m benchmarks.run --sizes 100000 --decoders json,orjson
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from benchmarks.generate import PlanSpec, write_plan
+from cloudsentry_cli.decoders import AUTO, DECODER_CHOICES, available_decoders, get_decoder
+
+TARGETS = ("scan_plan", "cmd_scan")
+DEFAULT_SIZES = (1000, 10000)
+DEFAULT_TOLERANCE = 0.2
+
+
+# ---------------------------------------------------------------------------
+# Measurement (runs inside the child process)
+# ---------------------------------------------------------------------------
+
+def measure(
+    target: str,
+    plan_path: str,
+    stream: bool = False,
+    decoder: str = AUTO,
+) -> dict[str, Any]:
+    """Run *target* once on *plan_path* in this process and return its metrics."""
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = os.path.join(tmp, "report.json")
+        if target == "scan_plan":
+            result = _measure_scan_plan(plan_path, report_path, stream, decoder)
+        elif target == "cmd_scan":
+            result = _measure_cmd_scan(plan_path, report_path, stream, decoder)
+        else:
+            raise ValueError(f"Unknown benchmark target: {target}")
+    result["decoder"] = "stream" if stream else get_decoder(decoder).name
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def _measure_scan_plan(
+    plan_path: str,
+    report_path: str,
+    stream: bool,
+    decoder: str,
+) -> dict[str, Any]:
+    from cloudsentry_cli.profile import ScanProfile
+    from cloudsentry_cli.report import JsonReportWriter
+    from cloudsentry_cli.scanner import ScanStats, scan_plan
+
+    stats = ScanStats()
+    profile = ScanProfile()
+    t0 = time.perf_counter()
+    findings = scan_plan(plan_path, stream=stream, stats=stats, profile=profile, decoder=decoder)
+    t1 = time.perf_counter()
+    writer = JsonReportWriter(report_path)
+    for finding in findings:
+        writer.write_finding(finding)
+    writer.close({"tool": "cloudsentry-cli"})
+    t2 = time.perf_counter()
+    profile.add_stage("report", t2 - t1)
+
+    return {
+        "resources": stats.resources,
+        "findings": len(findings),
+        "seconds": t2 - t0,
+        "stages": profile.stages,
+    }
+
+
+def _measure_cmd_scan(
+    plan_path: str,
+    report_path: str,
+    stream: bool,
+    decoder: str,
+) -> dict[str, Any]:
+    from cloudsentry_cli.cli import build_parser, cmd_scan
+    from cloudsentry_cli.report import read_report
+
+    argv = [
+        "scan", "--input", plan_path, "--output", report_path, "--profile",
+        "--decoder", decoder,
+    ]
+    if stream:
+        argv.append("--stream")
+    args = build_parser().parse_args(argv)
+    t0 = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        cmd_scan(args)
+    seconds = time.perf_counter() - t0
+
+    report = read_report(report_path)
+    return {
+        "resources": report["evaluations"]["resources"],
+        "findings": report["summary"]["total_findings"],
+        "seconds": seconds,
+        "stages": report["profile"]["stages"],
+    }
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# ---------------------------------------------------------------------------
+# Orchestration
+# ---------------------------------------------------------------------------
+
+def run_case(
+    target: str,
+    plan_path: str,
+    stream: bool = False,
+    repeat: int = 1,
+    decoder: str = AUTO,
+) -> dict[str, Any]:
+    """Run *target* in *repeat* fresh processes and keep the fastest run."""
+    runs = [_run_child(target, plan_path, stream, decoder) for _ in range(repeat)]
+    best = min(runs, key=lambda r: r["seconds"])
+    best["resources_per_sec"] = best["resources"] / best["seconds"] if best["seconds"] else 0.0
+    return best
+
+
+def _run_child(target: str, plan_path: str, stream: bool, decoder: str) -> dict[str, Any]:
+    argv = [
+        sys.executable, "-m", "benchmarks.run",
+        "--child", target, "--plan", plan_path, "--decoder", decoder,
+    ]
+    if stream:
+        argv.append("--stream")
+    proc = subprocess.run(
+        argv, check=True, capture_output=True, text=True, env=_child_env()
+    )
+    return json.loads(proc.stdout)
+
+
+def _child_env() -> dict[str, str]:
+    """Environment whose PYTHONPATH finds this checkout's packages."""
+    import cloudsentry_cli
+
+    paths = [
+        str(Path(cloudsentry_cli.__file__).resolve().parents[1]),
+        str(Path(__file__).resolve().parents[1]),
+    ]
+    if os.environ.get("PYTHONPATH"):
+        paths.append(os.environ["PYTHONPATH"])
+    return {**os.environ, "PYTHONPATH": os.pathsep.join(paths)}
+
+
+def compare(
+    cases: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[str]:
+    """Return a description of every regression of *cases* against *baseline*.
+
+    A case regresses when its throughput is more than *tolerance* below the
+    baseline's, or its peak RSS more than *tolerance* above it.  Cases
+    missing from the baseline are not compared.
+    """
+    regressions = []
+    for name, case in cases.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if case["resources_per_sec"] < base["resources_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {case['resources_per_sec']:.0f}/s vs "
+                f"{base['resources_per_sec']:.0f}/s in baseline"
+            )
+        if (
+            case.get("peak_rss_mb") and base.get("peak_rss_mb")
+            and case["peak_rss_mb"] > base["peak_rss_mb"] * (1 + tolerance)
+        ):
+            regressions.append(
+                f"{name}: peak RSS {case['peak_rss_mb']:.0f} MB vs "
+                f"{base['peak_rss_mb']:.0f} MB in baseline"
+            )
+    return regressions
+
+
+def _print_table(
+    cases: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+) -> None:
+    print(
+        f"{'CASE':<30} {'RES/S':>10} {'Δ':>7} {'RSS MB':>8} "
+        f"{'LOAD s':>8} {'EVAL s':>8} {'REPORT s':>9} {'TOTAL s':>8}"
+    )
+    for name, case in cases.items():
+        stages = case["stages"]
+        base = baseline.get(name)
+        delta = (
+            f"{case['resources_per_sec'] / base['resources_per_sec'] - 1:+.0%}"
+            if base else "–"
+        )
+        rss = case.get("peak_rss_mb")
+        print(
+            f"{name:<30} {case['resources_per_sec']:>10.0f} {delta:>7} "
+            f"{'–' if rss is None else f'{rss:.0f}':>8} "
+            f"{_stage(stages, 'load'):>8} {_stage(stages, 'evaluate'):>8} "
+            f"{_stage(stages, 'report'):>9} {case['seconds']:>8.3f}"
+        )
+
+
+def _stage(stages: dict[str, float], name: str) -> str:
+    return f"{stages[name]:.3f}" if name in stages else "–"
+
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Benchmark scan_plan and cmd_scan on synthetic plans.",
+    )
+    parser.add_argument(
+        "--sizes",
+        default=",".join(map(str, DEFAULT_SIZES)),
+        help="Comma-separated plan sizes (resources). Default: %(default)s.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--targets",
+        default=",".join(TARGETS),
+        help="Comma-separated subset of: %(default)s.",
+    )
+    parser.add_argument("--stream", action="store_true",
+                        help="Benchmark the streaming plan reader.")
+    parser.add_argument(
+        "--decoders",
+        default=AUTO,
+        help=(
+            "Comma-separated JSON backends to compare on the same plans, "
+            f"from: {', '.join(DECODER_CHOICES)}. Default: %(default)s."
+        ),
+    )
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per case; the fastest is kept. Default: 3.")
+    parser.add_argument("--output", metavar="FILE", help="Write results as JSON.")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="Compare with (or, with --save-baseline, write) this file.")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed regression as a fraction. Default: %(default)s.")
+    # Internal: measure one case in this process and print it as JSON.
+    parser.add_argument("--child", choices=TARGETS, help=argparse.SUPPRESS)
+    parser.add_argument("--plan", help=argparse.SUPPRESS)
+    parser.add_argument("--decoder", default=AUTO, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.plan, args.stream, args.decoder)))
+        return 0
+
+    targets = [t for t in args.targets.split(",") if t]
+    unknown = set(targets) - set(TARGETS)
+    if unknown:
+        parser.error(f"unknown target(s): {', '.join(sorted(unknown))}")
+    decoders = [d for d in args.decoders.split(",") if d]
+    unknown = set(decoders) - set(DECODER_CHOICES)
+    if unknown:
+        parser.error(f"unknown decoder(s): {', '.join(sorted(unknown))}")
+    installed = set(available_decoders()) | {AUTO}
+    for name in sorted(set(decoders) - installed):
+        print(f"Skipping decoder {name}: not installed")
+    decoders = [d for d in decoders if d in installed]
+
+    baseline: dict[str, dict[str, Any]] = {}
+    if args.baseline and not args.save_baseline:
+        baseline = json.loads(Path(args.baseline).read_text())["cases"]
+
+    cases: dict[str, dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(s) for s in args.sizes.split(",")):
+            plan_path = os.path.join(tmp, f"plan-{size}.json")
+            write_plan(plan_path, PlanSpec(resources=size, seed=args.seed))
+            for target in targets:
+                for decoder in decoders:
+                    name = f"{target}/{size}" + ("/stream" if args.stream else "")
+                    if decoder != AUTO:
+                        name += f"/{decoder}"
+                    cases[name] = run_case(
+                        target, plan_path, stream=args.stream,
+                        repeat=args.repeat, decoder=decoder,
+                    )
+
+    _print_table(cases, baseline)
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "stream": args.stream,
+        },
+        "cases": cases,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    if args.baseline and args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(results, indent=2))
+        print(f"Baseline written to: {args.baseline}")
+        return 0
+
+    regressions = compare(cases, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION  {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
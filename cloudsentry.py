@@ -1,166 +1,60 @@
-import sys
-import logging
+"""
+Compatibility entry point for the live AWS scan.
+
+The scanner itself is ``cloudsentry-cli live`` (see
+``src/cloudsentry_cli/live.py``); this script keeps ``python cloudsentry.py``
+working by translating the CLOUDSENTRY_* environment variables it has
+always read into ``live`` options.  Extra command-line arguments are passed
+through, e.g. ``python cloudsentry.py --snapshot inventory.sqlite``.
+
+    CLOUDSENTRY_MODE               "mock" (default) or anything else for AWS
+    CLOUDSENTRY_REGIONS            comma-separated regions
+    CLOUDSENTRY_ROLE_ARNS          comma-separated roles to assume
+    CLOUDSENTRY_SCAN_WORKERS       --workers
+    CLOUDSENTRY_IAM_SOURCE         --iam-source
+    CLOUDSENTRY_IAM_WORKERS        --iam-workers
+    CLOUDSENTRY_SNAPSHOT_STORE     --snapshot-store
+    CLOUDSENTRY_SNAPSHOT_TTL_IAM   --snapshot-ttl iam_users=SECONDS
+    CLOUDSENTRY_SNAPSHOT_TTL_EC2   --snapshot-ttl security_groups=SECONDS
+"""
+
 import os
-import json
-from datetime import datetime, timezone, timedelta
+import sys
 
-# -----------------------------
-# Logging Setup
-# -----------------------------
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(message)s"
+try:
+    from cloudsentry_cli.cli import main as cli_main
+except ImportError:  # running from a checkout without installing the package
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+    from cloudsentry_cli.cli import main as cli_main
+
+_OPTIONS = (
+    ("CLOUDSENTRY_SCAN_WORKERS", "--workers", "{}"),
+    ("CLOUDSENTRY_IAM_SOURCE", "--iam-source", "{}"),
+    ("CLOUDSENTRY_IAM_WORKERS", "--iam-workers", "{}"),
+    ("CLOUDSENTRY_SNAPSHOT_STORE", "--snapshot-store", "{}"),
+    ("CLOUDSENTRY_SNAPSHOT_TTL_IAM", "--snapshot-ttl", "iam_users={}"),
+    ("CLOUDSENTRY_SNAPSHOT_TTL_EC2", "--snapshot-ttl", "security_groups={}"),
 )
 
-MODE = os.getenv("CLOUDSENTRY_MODE", "mock")
-USE_MOCK = MODE == "mock"
-
-# -----------------------------
-# AWS Clients (only if needed)
-# -----------------------------
-if not USE_MOCK:
-    import boto3
-    iam = boto3.client("iam")
-    ec2 = boto3.client("ec2")
-
-# -----------------------------
-# IAM Data
-# -----------------------------
-if USE_MOCK:
-    iam_users = [
-        {
-            "UserName": "test-admin",
-            "HasAdminAccess": True,
-            "HasMFA": False,
-            "AccessKeys": [
-                {
-                    "LastRotated": datetime.now(timezone.utc) - timedelta(days=120)
-                }
-            ]
-        }
-    ]
-else:
-    iam_users = []
-
-    for user in iam.list_users()["Users"]:
-        username = user["UserName"]
-
-        mfa = iam.list_mfa_devices(UserName=username)["MFADevices"]
-        keys = iam.list_access_keys(UserName=username)["AccessKeyMetadata"]
-
-        access_keys = [{"LastRotated": k["CreateDate"]} for k in keys]
-
-        iam_users.append({
-            "UserName": username,
-            "HasAdminAccess": False,
-            "HasMFA": bool(mfa),
-            "AccessKeys": access_keys
-        })
-
-# -----------------------------
-# Security Groups
-# -----------------------------
-if USE_MOCK:
-    security_groups = [
-        {
-            "GroupId": "sg-0123",
-            "IpPermissions": [
-                {
-                    "FromPort": 22,
-                    "IpRanges": [{"CidrIp": "0.0.0.0/0"}]
-                }
-            ]
-        }
-    ]
-else:
-    security_groups = ec2.describe_security_groups()["SecurityGroups"]
-
-# -----------------------------
-# Findings Engine
-# -----------------------------
-findings = []
-severity_counts = {"HIGH": 0, "MEDIUM": 0, "LOW": 0}
-high_risk_exists = False
-
-# -----------------------------
-# IAM Access Key Rotation
-# -----------------------------
-ROTATION_THRESHOLD_DAYS = 90
-now = datetime.now(timezone.utc)
-
-for user in iam_users:
-    for key in user.get("AccessKeys", []):
-        if (now - key["LastRotated"]).days > ROTATION_THRESHOLD_DAYS:
-            findings.append({
-                "resource": f"iam_user:{user['UserName']}",
-                "issue": "Access key not rotated in over 90 days",
-                "severity": "HIGH",
-                "recommendation": "Rotate or remove unused access keys"
-            })
-            severity_counts["HIGH"] += 1
-
-# -----------------------------
-# IAM MFA
-# -----------------------------
-for user in iam_users:
-    if user["HasAdminAccess"] and not user["HasMFA"]:
-        findings.append({
-            "resource": f"iam_user:{user['UserName']}",
-            "issue": "Admin access without MFA",
-            "severity": "HIGH",
-            "recommendation": "Enable MFA"
-        })
-        severity_counts["HIGH"] += 1
-
-# -----------------------------
-# Security Group Checks
-# -----------------------------
-for sg in security_groups:
-    for rule in sg.get("IpPermissions", []):
-        if rule.get("FromPort") in [22, 3389]:
-            for ip in rule.get("IpRanges", []):
-                if ip.get("CidrIp") == "0.0.0.0/0":
-                    findings.append({
-                        "resource": f"security_group:{sg['GroupId']}",
-                        "issue": f"Port {rule['FromPort']} open to the world",
-                        "severity": "HIGH",
-                        "recommendation": "Restrict CIDR or use SSM"
-                    })
-                    severity_counts["HIGH"] += 1
 
-# -----------------------------
-# Logging
-# -----------------------------
-for f in findings:
-    logging.info(f"{f['severity']} | {f['resource']} | {f['issue']}")
-    if f["severity"] == "HIGH":
-        high_risk_exists = True
+def live_argv(environ=os.environ, argv=()):
+    """``cloudsentry-cli`` arguments equivalent to *environ* plus *argv*."""
+    args = ["live"]
+    if environ.get("CLOUDSENTRY_MODE", "mock") == "mock" and "--snapshot" not in argv:
+        args.append("--mock")
+    for name, flag in (("CLOUDSENTRY_REGIONS", "--region"), ("CLOUDSENTRY_ROLE_ARNS", "--role-arn")):
+        for value in environ.get(name, "").split(","):
+            if value.strip():
+                args += [flag, value.strip()]
+    for name, flag, template in _OPTIONS:
+        if environ.get(name):
+            args += [flag, template.format(environ[name])]
+    return args + list(argv)
 
-# -----------------------------
-# JSON REPORT (ALWAYS WRITTEN)
-# -----------------------------
-report = {
-    "tool": "CloudSentry",
-    "mode": MODE,
-    "scan_time": datetime.now(timezone.utc).isoformat(),
-    "summary": {
-        "total_findings": len(findings),
-        "high": severity_counts["HIGH"],
-        "medium": severity_counts["MEDIUM"],
-        "low": severity_counts["LOW"]
-    },
-    "findings": findings
-}
 
-with open("cloudsentry_report.json", "w") as f:
-    json.dump(report, f, indent=2)
+def main():
+    cli_main(live_argv(os.environ, sys.argv[1:]))
 
-# -----------------------------
-# EXIT
-# -----------------------------
-if high_risk_exists:
-    logging.error("High risk detected — failing CI")
-    sys.exit(1)
 
-logging.info("No high risk detected — passing CI")
-sys.exit(0)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Persistent findings cache.
+
+Between two CI runs on the same branch almost every ``change.after`` block is
+unchanged, so re-running every check is wasted work.  The cache stores the
+findings produced for a resource under a key derived from:
+
+* the resource type,
+* the canonical JSON of ``change.after``,
+* the identity of every check that applies to the type (module, name and
+  either an explicit ``version`` attribute or a digest of its bytecode), and
+* the cloudsentry-cli version.
+
+Any change to the resource content or to an applicable check therefore misses
+the cache.  Entries are stored in a single SQLite file and the least recently
+used ones are evicted once the file's payload grows beyond ``max_bytes``.
+
+Findings are stored without their ``resource`` label so identical
+configurations under different names share one entry; the scanner re-applies
+the label on a hit.
+
+Usage::
+
+    from cloudsentry_cli.cache import FindingsCache
+    from cloudsentry_cli.scanner import scan_plan
+
+    with FindingsCache(".cloudsentry-cache.sqlite") as cache:
+        findings = scan_plan("tfplan.json", cache=cache)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from types import CodeType
+from typing import Any, Callable, Iterable, Optional
+
+from cloudsentry_cli import __version__
+
+# Default payload budget for the cache file.
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Bump when the key derivation or stored value layout changes.
+_CACHE_FORMAT = 1
+
+# Inserts per transaction.  Short transactions keep the write lock free for
+# other processes sharing the file during a batch scan.
+_COMMIT_EVERY = 500
+
+# Fraction of max_bytes to shrink to when eviction kicks in, so eviction does
+# not run again on the very next insert.
+_EVICT_TO = 0.8
+
+
+class FindingsCache:
+    """SQLite-backed findings store with size-based LRU eviction."""
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self._db = sqlite3.connect(path, timeout=30)
+        try:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS findings ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS findings_last_used ON findings (last_used)"
+            )
+            self._size: int = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM findings"
+            ).fetchone()[0]
+        except sqlite3.Error:
+            self._db.close()
+            raise
+        # Recency updates for hits are batched and written on close().
+        self._touched: list[str] = []
+        self._uncommitted = 0
+
+    def get(self, key: str) -> Optional[list[dict[str, Any]]]:
+        """Return the cached findings for *key*, or None on a miss."""
+        row = self._db.execute(
+            "SELECT value FROM findings WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._touched.append(key)
+        return json.loads(row[0])
+
+    def put(self, key: str, findings: list[dict[str, Any]]) -> None:
+        """Store *findings* under *key*, evicting old entries if over budget."""
+        value = json.dumps(findings, separators=(",", ":"))
+        self._db.execute(
+            "INSERT OR REPLACE INTO findings (key, value, size, last_used) "
+            "VALUES (?, ?, ?, ?)",
+            (key, value, len(value), time.time()),
+        )
+        self._size += len(value)
+        if self._size > self.max_bytes:
+            self._evict()
+        self._uncommitted += 1
+        if self._uncommitted >= _COMMIT_EVERY:
+            self._db.commit()
+            self._uncommitted = 0
+
+    def close(self) -> None:
+        """Flush recency updates and pending inserts, then close the file."""
+        if self._touched:
+            now = time.time()
+            self._db.executemany(
+                "UPDATE findings SET last_used = ? WHERE key = ?",
+                ((now, key) for key in self._touched),
+            )
+            self._touched.clear()
+        self._db.commit()
+        self._db.close()
+
+    def __enter__(self) -> "FindingsCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _evict(self) -> None:
+        target = int(self.max_bytes * _EVICT_TO)
+        self._size = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM findings"
+        ).fetchone()[0]
+        victims: list[tuple[str]] = []
+        for key, size in self._db.execute(
+            "SELECT key, size FROM findings ORDER BY last_used"
+        ):
+            if self._size <= target:
+                break
+            victims.append((key,))
+            self._size -= size
+        self._db.executemany("DELETE FROM findings WHERE key = ?", victims)
+
+
+# ---------------------------------------------------------------------------
+# Key derivation
+# ---------------------------------------------------------------------------
+
+def checks_fingerprint(checks: Iterable[Callable[..., Any]]) -> str:
+    """Digest of the identities of *checks*, in order."""
+    h = hashlib.sha256()
+    for fn in checks:
+        h.update(check_identity(fn).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def cache_key(resource_digest: str, checks_digest: str) -> str:
+    """Cache key for one resource evaluated by the checks in *checks_digest*.
+
+    *resource_digest* is :func:`cloudsentry_cli.plan_stream.content_digest`
+    of the resource's type and ``change.after``.
+    """
+    payload = f"{_CACHE_FORMAT}|{__version__}|{checks_digest}|{resource_digest}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def check_identity(fn: Callable[..., Any]) -> str:
+    """Stable identity of a check: qualified name plus version.
+
+    A check may set a ``version`` attribute explicitly; otherwise a digest of
+    its bytecode and constants is used, so editing the function body
+    invalidates its cache entries.  Changes confined to helpers the check
+    calls are only picked up through the package version.
+    """
+    name = f"{getattr(fn, '__module__', '?')}.{getattr(fn, '__qualname__', repr(fn))}"
+    version = getattr(fn, "version", None)
+    if version is None:
+        code = getattr(fn, "__code__", None)
+        version = _code_digest(code) if code is not None else "unversioned"
+    return f"{name}@{version}"
+
+
+def _code_digest(code: CodeType) -> str:
+    h = hashlib.sha256(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            h.update(_code_digest(const).encode())
+        else:
+            h.update(repr(const).encode())
+    return h.hexdigest()[:16]
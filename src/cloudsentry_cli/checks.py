@@ -1,119 +1,271 @@
 """
 Security checks that evaluate a single Terraform resource's ``change.after``
-configuration and return a list of finding dicts.
-
-Each finding has the shape::
+configuration and return a list of :class:`~cloudsentry_cli.findings.Finding`
+objects, whose report form is::
 
     {
         "resource": "<type>.<name>",
         "issue":    "<human-readable description>",
         "severity": "LOW" | "MEDIUM" | "HIGH" | "CRITICAL",
         "recommendation": "<fix guidance>",
+        "rule_id":  "<stable rule identifier>",
+        "params":   {<values substituted into the issue text>},
     }
 
+Checks may still return plain dicts of that shape; the scanner converts them.
+
+The static text of each kind of finding lives in a :class:`Rule`, defined
+once with :func:`define_rule`; checks build findings with
+``rule.finding(label, **params)``.  That lets compact reports store the text
+once per rule instead of once per finding.
+
 To add a new check:
-1. Write a function that accepts (resource_type, resource_name, after) and
-   returns a list of findings (empty = no issues).
-2. Register it in CHECKS below – no other code needs to change.
+1. Define its rule(s), then write a function that accepts (resource_type,
+   resource_name, after) and returns a list of findings (empty = no issues).
+   Findings must not depend on resource_name other than through the
+   ``resource`` label, so identical configurations can share cached results.
+2. Decorate it with ``@handles("aws_...")`` to declare the resource types it
+   evaluates.  Undecorated checks are type-agnostic and run on every resource.
+   Decorate it with ``@emits(RULE, ...)`` too, so fail-fast scans know its
+   worst severity; undeclared checks are treated as CRITICAL.
+3. Register it in CHECKS below – no other code needs to change.  Checks added
+   at runtime go through :func:`register_check` so the dispatch index stays
+   current.
+
+Simple attribute requirements do not need Python at all: see
+:mod:`cloudsentry_cli.rulefile` for declarative JSON/YAML rules.
 """
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Union
+
+from cloudsentry_cli.findings import Finding, Severity
+from cloudsentry_cli.network import ExposureMatcher
+
+CheckFn = Callable[[str, str, dict[str, Any]], list[Finding]]
+
+# Dispatch-index key for checks that apply to every resource type.
+WILDCARD = "*"
+
+
+class Rule(NamedTuple):
+    """Static description shared by every finding of one kind.
+
+    ``issue`` is a :meth:`str.format` template over the finding's params.
+    """
+
+    id: str
+    severity: Severity
+    issue: str
+    recommendation: str
+
+    def render_issue(self, params: dict[str, Any]) -> str:
+        return self.issue.format(**params) if params else self.issue
+
+    def finding(self, resource: str, **params: Any) -> Finding:
+        """Build a finding for *resource*."""
+        return Finding(
+            resource,
+            self.severity,
+            self.render_issue(params),
+            self.recommendation,
+            self.id,
+            params,
+        )
+
+
+# Every defined rule by id, for report writers and readers.
+RULES: dict[str, Rule] = {}
+
+
+def define_rule(
+    id: str,
+    severity: Union[str, Severity],
+    issue: str,
+    recommendation: str,
+) -> Rule:
+    """Create a :class:`Rule` and add it to :data:`RULES`.
+
+    Redefining an id with identical content is a no-op; with different
+    content it is an error, since reports identify rules by id alone.
+    """
+    rule = Rule(id, Severity.parse(severity), issue, recommendation)
+    existing = RULES.get(id)
+    if existing is not None and existing != rule:
+        raise ValueError(f"Rule {id!r} is already defined differently")
+    RULES[id] = rule
+    return rule
+
+
+def handles(*resource_types: str) -> Callable[[CheckFn], CheckFn]:
+    """Declare the Terraform resource types a check function evaluates."""
+    def decorate(fn: CheckFn) -> CheckFn:
+        fn.resource_types = frozenset(resource_types)  # type: ignore[attr-defined]
+        return fn
+    return decorate
+
+
+def emits(*rules: Rule) -> Callable[[CheckFn], CheckFn]:
+    """Declare the rules a check function builds its findings from."""
+    def decorate(fn: CheckFn) -> CheckFn:
+        fn.rules = tuple(rules)  # type: ignore[attr-defined]
+        return fn
+    return decorate
+
+
+def check_severity(fn: CheckFn) -> Severity:
+    """The most severe finding *fn* can produce, from its ``@emits`` rules.
+
+    Checks that do not declare their rules could produce anything, so they
+    count as :attr:`Severity.CRITICAL`.
+    """
+    rules = getattr(fn, "rules", ())
+    return max((rule.severity for rule in rules), default=Severity.CRITICAL)
 
 
 # ---------------------------------------------------------------------------
 # Individual check functions
 # ---------------------------------------------------------------------------
 
+# SSH and RDP; compiled once, shared by both security-group resource shapes.
+_SSH_RDP_EXPOSURE = ExposureMatcher(risky_ports=(22, 3389))
+
+SG_OPEN_INGRESS = define_rule(
+    "CS-SG-001",
+    severity=Severity.HIGH,
+    issue="Port {port} open to the world ({cidr}) in ingress rule",
+    recommendation=(
+        "Restrict the CIDR to known IP ranges or use "
+        "AWS Systems Manager Session Manager instead of "
+        "exposing SSH/RDP."
+    ),
+)
+
+SG_RULE_OPEN_INGRESS = define_rule(
+    "CS-SG-002",
+    severity=Severity.HIGH,
+    issue="Port {port} open to the world ({cidr})",
+    recommendation=(
+        "Restrict the CIDR to known IP ranges or use "
+        "AWS Systems Manager Session Manager."
+    ),
+)
+
+S3_PUBLIC_ACL = define_rule(
+    "CS-S3-001",
+    severity=Severity.HIGH,
+    issue='S3 bucket ACL is set to "{acl}" which allows broad access',
+    recommendation=(
+        'Set acl to "private" and use bucket policies to grant '
+        "least-privilege access."
+    ),
+)
+
+IAM_KEY_NOT_ROTATED = define_rule(
+    "CS-IAM-001",
+    severity=Severity.HIGH,
+    issue="Access key not rotated in over {max_age_days} days",
+    recommendation="Rotate or remove unused access keys.",
+)
+
+IAM_ADMIN_WITHOUT_MFA = define_rule(
+    "CS-IAM-002",
+    severity=Severity.HIGH,
+    issue="Admin access without MFA",
+    recommendation="Enable MFA for every user with administrative access.",
+)
+
+# Access keys older than this many days must be rotated.
+ACCESS_KEY_MAX_AGE_DAYS = 90
+
+
+@handles("aws_security_group", "aws_security_group_rule")
+@emits(SG_OPEN_INGRESS, SG_RULE_OPEN_INGRESS)
 def check_sg_open_ingress(
     resource_type: str,
     resource_name: str,
     after: dict[str, Any],
-) -> list[dict[str, Any]]:
-    """Flag security group ingress rules open to 0.0.0.0/0 on SSH/RDP ports."""
-    findings: list[dict[str, Any]] = []
+) -> list[Finding]:
+    """Flag security group ingress rules open to the world on SSH/RDP ports.
+
+    "The world" covers 0.0.0.0/0 and ::/0 plus public ranges spanning
+    about as much, such as 0.0.0.0/1; see :mod:`cloudsentry_cli.network`.
+    The matching CIDR is recorded in each finding's ``cidr`` param.
+    """
+    findings: list[Finding] = []
 
     if resource_type not in ("aws_security_group", "aws_security_group_rule"):
         return findings
 
-    risky_ports = {22, 3389}
     label = f"{resource_type}.{resource_name}"
 
     # aws_security_group: ingress is a list of rule blocks
-    for rule in after.get("ingress", []):
-        from_port = rule.get("from_port", -1)
-        to_port = rule.get("to_port", -1)
-        cidr_blocks = rule.get("cidr_blocks", [])
-        ipv6_cidr_blocks = rule.get("ipv6_cidr_blocks", [])
-
-        for port in risky_ports:
-            if _port_in_range(port, from_port, to_port):
-                if "0.0.0.0/0" in cidr_blocks or "::/0" in ipv6_cidr_blocks:
-                    findings.append({
-                        "resource": label,
-                        "issue": (
-                            f"Port {port} open to the world "
-                            f"(0.0.0.0/0 or ::/0) in ingress rule"
-                        ),
-                        "severity": "HIGH",
-                        "recommendation": (
-                            "Restrict the CIDR to known IP ranges or use "
-                            "AWS Systems Manager Session Manager instead of "
-                            "exposing SSH/RDP."
-                        ),
-                    })
+    for rule in after.get("ingress") or []:
+        ports, cidr = _SSH_RDP_EXPOSURE.exposure(rule)
+        for port in ports:
+            findings.append(SG_OPEN_INGRESS.finding(label, port=port, cidr=cidr))
 
     # aws_security_group_rule (standalone resource)
-    if resource_type == "aws_security_group_rule":
-        rule_type = after.get("type", "")
-        if rule_type == "ingress":
-            from_port = after.get("from_port", -1)
-            to_port = after.get("to_port", -1)
-            cidr_blocks = after.get("cidr_blocks", [])
-            ipv6_cidr_blocks = after.get("ipv6_cidr_blocks", [])
-
-            for port in risky_ports:
-                if _port_in_range(port, from_port, to_port):
-                    if "0.0.0.0/0" in cidr_blocks or "::/0" in ipv6_cidr_blocks:
-                        findings.append({
-                            "resource": label,
-                            "issue": (
-                                f"Port {port} open to the world "
-                                f"(0.0.0.0/0 or ::/0)"
-                            ),
-                            "severity": "HIGH",
-                            "recommendation": (
-                                "Restrict the CIDR to known IP ranges or use "
-                                "AWS Systems Manager Session Manager."
-                            ),
-                        })
+    if resource_type == "aws_security_group_rule" and after.get("type") == "ingress":
+        ports, cidr = _SSH_RDP_EXPOSURE.exposure(after)
+        for port in ports:
+            findings.append(SG_RULE_OPEN_INGRESS.finding(label, port=port, cidr=cidr))
 
     return findings
 
 
+@handles("aws_s3_bucket")
+@emits(S3_PUBLIC_ACL)
 def check_s3_public_acl(
     resource_type: str,
     resource_name: str,
     after: dict[str, Any],
-) -> list[dict[str, Any]]:
+) -> list[Finding]:
     """Flag S3 buckets with a public ACL."""
-    findings: list[dict[str, Any]] = []
+    findings: list[Finding] = []
 
     if resource_type != "aws_s3_bucket":
         return findings
 
     acl = after.get("acl", "")
     if acl in ("public-read", "public-read-write", "authenticated-read"):
-        findings.append({
-            "resource": f"{resource_type}.{resource_name}",
-            "issue": f'S3 bucket ACL is set to "{acl}" which allows broad access',
-            "severity": "HIGH",
-            "recommendation": (
-                'Set acl to "private" and use bucket policies to grant '
-                "least-privilege access."
-            ),
-        })
+        findings.append(
+            S3_PUBLIC_ACL.finding(f"{resource_type}.{resource_name}", acl=acl)
+        )
+
+    return findings
+
+
+@handles("aws_iam_user")
+@emits(IAM_KEY_NOT_ROTATED, IAM_ADMIN_WITHOUT_MFA)
+def check_iam_user_credentials(
+    resource_type: str,
+    resource_name: str,
+    after: dict[str, Any],
+) -> list[Finding]:
+    """Flag stale access keys and admin users without MFA.
+
+    Reads the credential attributes live collectors record on
+    ``aws_iam_user`` (see :mod:`cloudsentry_cli.live`): ``access_keys``
+    with each key's ``age_days``, ``mfa_enabled`` and ``admin``.  Plan
+    resources do not carry them and produce no findings.
+    """
+    findings: list[Finding] = []
+
+    if resource_type != "aws_iam_user":
+        return findings
+
+    label = f"{resource_type}.{resource_name}"
+
+    for key in after.get("access_keys") or []:
+        if key.get("age_days", 0) > ACCESS_KEY_MAX_AGE_DAYS:
+            findings.append(
+                IAM_KEY_NOT_ROTATED.finding(label, max_age_days=ACCESS_KEY_MAX_AGE_DAYS)
+            )
+
+    if after.get("admin") and after.get("mfa_enabled") is False:
+        findings.append(IAM_ADMIN_WITHOUT_MFA.finding(label))
 
     return findings
 
@@ -125,16 +277,90 @@ def check_s3_public_acl(
 CHECKS = [
     check_sg_open_ingress,
     check_s3_public_acl,
+    check_iam_user_credentials,
 ]
 
 
 # ---------------------------------------------------------------------------
-# Helpers
+# Dispatch index – resource type → applicable checks, built once
 # ---------------------------------------------------------------------------
 
-def _port_in_range(port: int, from_port: int, to_port: int) -> bool:
-    """Return True if *port* falls within [from_port, to_port]."""
-    try:
-        return int(from_port) <= port <= int(to_port)
-    except (TypeError, ValueError):
-        return False
+def build_dispatch_index(
+    checks: Iterable[CheckFn],
+) -> dict[str, tuple[CheckFn, ...]]:
+    """Map each declared resource type to the checks that apply to it.
+
+    Every entry also contains the type-agnostic checks, and the
+    :data:`WILDCARD` entry holds only those, for undeclared types.  Checks keep
+    their registration order within each entry so findings come out in the
+    same order as a plain loop over *checks*.
+    """
+    checks = list(checks)
+    declared = {
+        resource_type
+        for fn in checks
+        for resource_type in getattr(fn, "resource_types", ())
+    }
+    index = {
+        resource_type: tuple(
+            fn for fn in checks
+            if resource_type in getattr(fn, "resource_types", (resource_type,))
+        )
+        for resource_type in declared
+    }
+    index[WILDCARD] = tuple(
+        fn for fn in checks if not hasattr(fn, "resource_types")
+    )
+    return index
+
+
+_DISPATCH_INDEX = build_dispatch_index(CHECKS)
+
+
+# (resource type, severity) → (dispatch index it was derived from, checks).
+_GATE_INDEX: dict[tuple[str, Severity], tuple[dict[str, Any], tuple[CheckFn, ...]]] = {}
+
+
+def checks_for(
+    resource_type: str,
+    at_least: Optional[Severity] = None,
+) -> tuple[CheckFn, ...]:
+    """Return the registered checks that apply to *resource_type*.
+
+    With *at_least*, only checks that can produce a finding of that severity
+    or above are returned, most severe first (registration order breaks
+    ties).  Fail-fast scans use this to reach a blocking finding sooner.
+    """
+    index = _DISPATCH_INDEX
+    applicable = index.get(resource_type, index[WILDCARD])
+    if at_least is None:
+        return applicable
+    cached = _GATE_INDEX.get((resource_type, at_least))
+    if cached is not None and cached[0] is index:
+        return cached[1]
+    gate = tuple(sorted(
+        (fn for fn in applicable if check_severity(fn) >= at_least),
+        key=check_severity,
+        reverse=True,
+    ))
+    _GATE_INDEX[(resource_type, at_least)] = (index, gate)
+    return gate
+
+
+def register_check(check_fn: CheckFn) -> None:
+    """Append *check_fn* to :data:`CHECKS` and rebuild the dispatch index."""
+    register_checks([check_fn])
+
+
+def register_checks(check_fns: Iterable[CheckFn]) -> None:
+    """Append several checks, rebuilding the dispatch index only once."""
+    global _DISPATCH_INDEX
+    CHECKS.extend(check_fns)
+    _DISPATCH_INDEX = build_dispatch_index(CHECKS)
+
+
+def reset_checks(check_fns: Iterable[CheckFn]) -> None:
+    """Replace the contents of :data:`CHECKS` and rebuild the dispatch index."""
+    global _DISPATCH_INDEX
+    CHECKS[:] = list(check_fns)
+    _DISPATCH_INDEX = build_dispatch_index(CHECKS)
@@ -4,123 +4,849 @@ cloudsentry-cli – command line entry point.
 Commands
 --------
 scan    Scan a Terraform plan JSON file for security issues.
+live    Scan live AWS inventory (IAM users, security groups) with the same checks.
+watch   Rescan a plan whenever it changes and print new/resolved findings.
+serve   Keep the checks warm and run scans sent by ``cloudsentry-client``.
 
 Examples
 --------
     cloudsentry-cli scan --input tfplan.json
     cloudsentry-cli scan --input tfplan.json --fail-on MEDIUM --output report.json
+    cloudsentry-cli scan --input tfplan.json --fail-fast
+    cloudsentry-cli scan --input tfplan.json --profile
+    cloudsentry-cli scan --input 'stacks/**/tfplan.json' --console top-20
+    cloudsentry-cli scan --input huge-tfplan.json --stream --jobs 8
+    cloudsentry-cli scan --input 'stacks/**/tfplan.json' --workers 8
+    cloudsentry-cli scan --manifest plans.txt
+    cloudsentry-cli scan --input tfplan.json --cache .cloudsentry-cache.sqlite
+    cloudsentry-cli scan --input new.json --baseline old.json
+    cloudsentry-cli scan --input tfplan.json --rules team-rules.yaml
+    cloudsentry-cli scan --input tfplan.json --format ndjson --output report.ndjson
+    cloudsentry-cli scan --input tfplan.json --format compact
+    cloudsentry-cli scan --input huge-tfplan.json --decoder orjson
+    cloudsentry-cli live --region us-east-1 --region eu-west-1
+    cloudsentry-cli live --role-arn arn:aws:iam::123456789012:role/audit
+    cloudsentry-cli live --snapshot-store inventory.sqlite
+    cloudsentry-cli live --snapshot inventory.sqlite
+    cloudsentry-cli watch --input tfplan.json
+    cloudsentry-cli serve --workers 4
 """
 
 from __future__ import annotations
 
 import argparse
-import json
+import glob
+import os
+import sqlite3
 import sys
+import time
 from datetime import datetime, timezone
+from itertools import chain
 from pathlib import Path
+from typing import Iterator, Optional, TypeVar
 
 from cloudsentry_cli import __version__
-from cloudsentry_cli.scanner import scan_plan
+from cloudsentry_cli.cache import DEFAULT_MAX_BYTES, FindingsCache
+from cloudsentry_cli.client import TOKEN_ENV
+from cloudsentry_cli.console import ConsoleMode, ConsoleRenderer, parse_console_mode
+from cloudsentry_cli.decoders import AUTO, DECODER_CHOICES, get_decoder
+from cloudsentry_cli.findings import Finding, Severity
+from cloudsentry_cli.live import (
+    COLLECTORS,
+    DEFAULT_IAM_WORKERS,
+    DEFAULT_WORKERS,
+    IAM_SOURCES,
+    TargetResult,
+    client_config,
+    collect,
+    mock_results,
+    tag_findings,
+)
+from cloudsentry_cli.profile import ScanProfile
+from cloudsentry_cli.rulefile import register_rule_files
+from cloudsentry_cli.report import REPORT_FORMATS, ReportWriter, open_report_writer
+from cloudsentry_cli.scanner import (
+    ScanStats,
+    evaluate_resources,
+    iter_findings,
+    load_baseline,
+    scan_plans,
+)
+from cloudsentry_cli.server import DEFAULT_QUEUE, serve
+from cloudsentry_cli.snapshot import SnapshotStore, replay_snapshot
+from cloudsentry_cli.watch import DEFAULT_INTERVAL, FindingsDelta, IncrementalScan, file_changes
 
-# Severity ordering (higher index = higher severity)
-SEVERITY_ORDER = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+T = TypeVar("T")
 
+# Returned by next() on an exhausted iterator; see _started.
+_EXHAUSTED = object()
 
-def _severity_index(severity: str) -> int:
-    """Return the numeric rank of *severity* (higher = more severe)."""
-    try:
-        return SEVERITY_ORDER.index(severity.upper())
-    except ValueError:
-        return -1
+# Severity ordering (higher index = higher severity)
+SEVERITY_ORDER = [s.name for s in Severity]
 
 
 def cmd_scan(args: argparse.Namespace) -> int:
     """Execute the ``scan`` sub-command.  Returns an exit code (0 or 1)."""
     try:
-        findings = scan_plan(args.input)
-    except FileNotFoundError as exc:
+        register_rule_files(
+            args.rules,
+            cache_dir=Path(args.rules_cache) if args.rules_cache else None,
+        )
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    try:
+        get_decoder(args.decoder)
+    except ImportError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    if args.manifest or glob.has_magic(args.input or ""):
+        if args.baseline:
+            print("ERROR: --baseline applies to single-plan scans only",
+                  file=sys.stderr)
+            return 1
+        return _cmd_scan_batch(args)
+
+    stats = ScanStats()
+    cache = None
+    try:
+        baseline = (
+            load_baseline(args.baseline, stream=args.stream, decoder=args.decoder)
+            if args.baseline else None
+        )
+        cache = _open_cache(args)
+    except (FileNotFoundError, ValueError) as exc:
         print(f"ERROR: {exc}", file=sys.stderr)
         return 1
 
-    threshold_index = _severity_index(args.fail_on)
+    threshold = Severity.parse(args.fail_on)
+    tally = _Tally(threshold)
+    profile = ScanProfile() if args.profile else None
+    try:
+        # The plan is only opened once the first finding is requested; ask
+        # for it now so a missing or malformed plan is reported on its own.
+        findings = _started(iter_findings(
+            args.input,
+            stream=args.stream,
+            jobs=args.jobs,
+            cache=cache,
+            baseline=baseline,
+            stats=stats,
+            fail_at=threshold if args.fail_fast else None,
+            profile=profile,
+            decoder=args.decoder,
+        ))
+    except (FileNotFoundError, ValueError) as exc:
+        if cache is not None:
+            cache.close()
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    writer = _open_writer(args, profile)
+
+    print("=" * 60)
+    print(f"CloudSentry CLI  v{__version__}")
+    print(f"Input : {args.input}")
+    print(f"Threshold: {args.fail_on}")
+    print("-" * 60)
 
     # -----------------------------------------------------------------------
-    # Classify findings against the threshold
+    # Single pass: classify, count, report and print each finding as the
+    # scanner produces it, so nothing has to hold the full list.
     # -----------------------------------------------------------------------
-    failing_findings = [
-        f for f in findings
-        if _severity_index(f.get("severity", "")) >= threshold_index
-    ]
+    renderer = ConsoleRenderer(args.console)
+    try:
+        for finding in findings:
+            failing = tally.add(finding)
+            writer.write_finding(finding)
+            renderer.add(finding, failing)
+    except (FileNotFoundError, ValueError) as exc:
+        # A streamed plan can still turn out malformed part-way through.
+        renderer.flush()
+        writer.abort()
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if cache is not None:
+            cache.close()
+    renderer.finish()
 
     # -----------------------------------------------------------------------
     # Console summary
     # -----------------------------------------------------------------------
-    total = len(findings)
-    by_severity: dict[str, int] = {s: 0 for s in SEVERITY_ORDER}
-    for f in findings:
-        sev = f.get("severity", "").upper()
-        if sev in by_severity:
-            by_severity[sev] += 1
+    summary = tally.summary()
+    if tally.total:
+        print("-" * 60)
+    _print_counts(summary)
+    if cache is not None:
+        _print_cache_stats(stats)
+    if args.baseline:
+        print(
+            f"Baseline       : {args.baseline} "
+            f"({stats.unchanged} unchanged resource(s) skipped)"
+        )
+    _print_evaluations(stats)
+    if args.fail_fast:
+        _print_fail_fast(stats.stopped_early)
+    _print_decoder(args)
+    print("-" * 60)
+    _print_verdict(tally.failing, args.fail_on)
+
+    # -----------------------------------------------------------------------
+    # Report
+    # -----------------------------------------------------------------------
+    report = {
+        "tool": "cloudsentry-cli",
+        "version": __version__,
+        "scan_time": datetime.now(timezone.utc).isoformat(),
+        "input": str(args.input),
+        "fail_on": args.fail_on,
+        **_partial_marker(args),
+        "decoder": _decoder_name(args),
+        "summary": summary,
+        "evaluations": _evaluations(stats),
+    }
+    if args.baseline:
+        report["baseline"] = {
+            "input": str(args.baseline),
+            "unchanged_resources": stats.unchanged,
+        }
+    if profile is not None:
+        report["profile"] = profile.to_dict()
+    writer.close(report)
+    print(f"Report written to: {writer.path}")
+    if profile is not None:
+        _print_profile(profile)
+
+    return 1 if tally.failing else 0
+
+
+def _cmd_scan_batch(args: argparse.Namespace) -> int:
+    """Scan every plan matched by ``--input`` / ``--manifest`` in a pool.
+
+    Produces one aggregated report with a summary per plan.  The exit code is
+    1 if any plan has a finding at or above the threshold or failed to load.
+    """
+    try:
+        input_paths = _resolve_inputs(args)
+    except FileNotFoundError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    if not input_paths:
+        print(f"ERROR: no plan files matched {args.input or args.manifest}",
+              file=sys.stderr)
+        return 1
+
+    try:
+        # Workers open the cache themselves; check it once before they start.
+        cache = _open_cache(args)
+    except ValueError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    if cache is not None:
+        cache.close()
+
+    threshold = Severity.parse(args.fail_on)
+    tally = _Tally(threshold)
+    plans = 0
+    errors = 0
+    stats = ScanStats()
+    profile = ScanProfile() if args.profile else None
+    writer = _open_writer(args, profile)
 
     print("=" * 60)
     print(f"CloudSentry CLI  v{__version__}")
-    print(f"Input : {args.input}")
+    print(f"Input : {args.manifest or args.input} ({len(input_paths)} plan(s))")
     print(f"Threshold: {args.fail_on}")
     print("-" * 60)
-    print(f"Total findings : {total}")
-    for sev in SEVERITY_ORDER:
-        print(f"  {sev:<10}: {by_severity[sev]}")
+
+    results = scan_plans(
+        input_paths,
+        workers=args.workers,
+        stream=args.stream,
+        cache_path=args.cache,
+        cache_max_bytes=args.cache_max_mb * 1024 * 1024,
+        fail_at=threshold if args.fail_fast else None,
+        profile=profile is not None,
+        decoder=args.decoder,
+    )
+    renderer = ConsoleRenderer(args.console)
+    stopped_early = False
+    for result in results:
+        if result.stats is not None:
+            stats.cache_hits += result.stats.cache_hits
+            stats.cache_misses += result.stats.cache_misses
+            stats.evaluated += result.stats.evaluated
+            stats.deduplicated += result.stats.deduplicated
+        if profile is not None and result.profile is not None:
+            profile.merge(result.profile)
+        plans += 1
+        if result.error is not None:
+            errors += 1
+            renderer.line(f"  ✖ {result.input} – ERROR: {result.error}")
+            writer.write_plan({"input": result.input, "error": result.error})
+            continue
+
+        plan_tally = _Tally(threshold)
+        failing = [plan_tally.add(finding) for finding in result.findings]
+        tally.merge(plan_tally)
+        marker = "✖" if plan_tally.failing else "✔"
+        renderer.line(
+            f"  {marker} {result.input} – {plan_tally.total} finding(s), "
+            f"{plan_tally.failing} at or above threshold"
+        )
+        for finding, is_failing in zip(result.findings, failing):
+            renderer.add(finding, is_failing, indent="      ")
+        writer.write_plan({
+            "input": result.input,
+            "summary": plan_tally.summary(),
+            "findings": result.findings,
+        })
+        if args.fail_fast and plan_tally.failing:
+            stopped_early = True
+            break
+    results.close()
+    renderer.finish()
+
+    summary = {
+        "plans": plans,
+        "plan_errors": errors,
+        **tally.summary(),
+    }
     print("-" * 60)
+    _print_counts(summary)
+    if errors:
+        print(f"Plan errors    : {errors}")
+    if args.cache:
+        _print_cache_stats(stats)
+    _print_evaluations(stats)
+    if args.fail_fast:
+        _print_fail_fast(stopped_early)
+    _print_decoder(args)
+    print("-" * 60)
+    _print_verdict(tally.failing, args.fail_on)
 
-    if findings:
-        for f in findings:
-            marker = "✖" if _severity_index(f.get("severity", "")) >= threshold_index else "·"
-            print(
-                f"  {marker} [{f.get('severity', '?'):8}] "
-                f"{f.get('resource', '?')} – {f.get('issue', '')}"
+    report = {
+        "tool": "cloudsentry-cli",
+        "version": __version__,
+        "scan_time": datetime.now(timezone.utc).isoformat(),
+        "input": str(args.manifest or args.input),
+        "fail_on": args.fail_on,
+        **_partial_marker(args),
+        "decoder": _decoder_name(args),
+        "summary": summary,
+        "evaluations": _evaluations(stats),
+    }
+    if profile is not None:
+        report["profile"] = profile.to_dict()
+    writer.close(report)
+    print(f"Report written to: {writer.path}")
+    if profile is not None:
+        _print_profile(profile)
+
+    return 1 if tally.failing or errors else 0
+
+
+def cmd_live(args: argparse.Namespace) -> int:
+    """Execute the ``live`` sub-command.  Returns an exit code (0 or 1).
+
+    Every (account, region, collector) target is evaluated with the same
+    checks as ``scan`` and reported like a batch-mode plan.  The exit code
+    is 1 if any finding is at or above the threshold or any target could
+    not be collected.
+    """
+    threshold = Severity.parse(args.fail_on)
+    tally = _Tally(threshold)
+    targets = 0
+    errors = 0
+    stopped_early = False
+    mode = "mock" if args.mock else "snapshot" if args.snapshot else "live"
+    profile = ScanProfile() if args.profile else None
+
+    store = None
+    try:
+        if args.mock:
+            results = mock_results()
+        elif args.snapshot:
+            results = replay_snapshot(args.snapshot)
+        else:
+            store = SnapshotStore(args.snapshot_store) if args.snapshot_store else None
+            results = collect(
+                args.role_arn,
+                args.region,
+                args.collector,
+                workers=args.workers,
+                config=client_config(max(args.iam_workers, args.workers)),
+                store=store,
+                ttls=dict(args.snapshot_ttl),
+                options={"iam_source": args.iam_source, "iam_workers": args.iam_workers},
             )
-        print("-" * 60)
+    except ImportError:
+        print("ERROR: live scans need boto3: pip install 'cloudsentry-cli[aws]'",
+              file=sys.stderr)
+        return 1
+    except FileNotFoundError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    if profile is not None:
+        results = profile.timed(results, "load")
 
-    if failing_findings:
-        print(
-            f"FAIL  {len(failing_findings)} finding(s) at or above threshold "
-            f"'{args.fail_on}'."
-        )
-    else:
-        print("PASS  No findings at or above threshold.")
     print("=" * 60)
+    print(f"CloudSentry CLI  v{__version__}")
+    print(f"Input : {_live_input(args, mode)}")
+    print(f"Threshold: {args.fail_on}")
+    print("-" * 60)
+
+    writer = _open_writer(args, profile)
+    renderer = ConsoleRenderer(args.console)
+    fail_at = threshold if args.fail_fast else None
+    try:
+        for result in results:
+            targets += 1
+            label = result.target.label
+            if result.error is not None:
+                errors += 1
+                renderer.line(f"  ✖ {label} – ERROR: {result.error}")
+                writer.write_plan({"input": label, **_target_fields(result),
+                                   "error": result.error})
+                continue
+
+            findings = tag_findings(
+                evaluate_resources(result.resources, fail_at, profile), result.target
+            )
+            target_tally = _Tally(threshold)
+            failing = [target_tally.add(finding) for finding in findings]
+            tally.merge(target_tally)
+            marker = "✖" if target_tally.failing else "✔"
+            renderer.line(
+                f"  {marker} {label} – {len(result.resources)} resource(s), "
+                f"{target_tally.total} finding(s), {target_tally.failing} at or "
+                f"above threshold{' (snapshot)' if result.cached else ''}"
+            )
+            for finding, is_failing in zip(findings, failing):
+                renderer.add(finding, is_failing, indent="      ")
+            writer.write_plan({
+                "input": label,
+                **_target_fields(result),
+                "summary": target_tally.summary(),
+                "findings": findings,
+            })
+            if args.fail_fast and target_tally.failing:
+                stopped_early = True
+                break
+    except (FileNotFoundError, ValueError) as exc:
+        renderer.flush()
+        writer.abort()
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        getattr(results, "close", lambda: None)()
+        if store is not None:
+            store.close()
+    renderer.finish()
+
+    summary = {"targets": targets, "target_errors": errors, **tally.summary()}
+    print("-" * 60)
+    _print_counts(summary)
+    if errors:
+        print(f"Target errors  : {errors}")
+    if args.fail_fast:
+        _print_fail_fast(stopped_early)
+    print("-" * 60)
+    _print_verdict(tally.failing, args.fail_on)
 
-    # -----------------------------------------------------------------------
-    # JSON report
-    # -----------------------------------------------------------------------
     report = {
         "tool": "cloudsentry-cli",
         "version": __version__,
         "scan_time": datetime.now(timezone.utc).isoformat(),
-        "input": str(args.input),
+        "input": _live_input(args, mode),
+        "mode": mode,
         "fail_on": args.fail_on,
-        "summary": {
-            "total_findings": total,
-            **{s.lower(): by_severity[s] for s in SEVERITY_ORDER},
-        },
-        "findings": findings,
+        **_partial_marker(args),
+        "summary": summary,
+    }
+    if profile is not None:
+        report["profile"] = profile.to_dict()
+    writer.close(report)
+    print(f"Report written to: {writer.path}")
+    if profile is not None:
+        _print_profile(profile)
+
+    return 1 if tally.failing or errors else 0
+
+
+def cmd_watch(args: argparse.Namespace) -> int:
+    """Execute the ``watch`` sub-command until interrupted.
+
+    Rescans ``--input`` every time it changes, re-evaluating only resources
+    whose ``change.after`` differs from the previous version, and prints the
+    new and resolved findings.  Returns 1 if findings at or above the
+    threshold remain when it stops, else 0.
+    """
+    try:
+        register_rule_files(
+            args.rules,
+            cache_dir=Path(args.rules_cache) if args.rules_cache else None,
+        )
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    try:
+        get_decoder(args.decoder)
+    except ImportError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    threshold = Severity.parse(args.fail_on)
+    scan = IncrementalScan(stream=args.stream, decoder=args.decoder)
+    print(f"Watching {args.input} (threshold {args.fail_on}); Ctrl-C to stop.")
+    try:
+        for _ in file_changes(args.input, args.interval):
+            start = time.perf_counter()
+            try:
+                delta = scan.update(args.input)
+            except (FileNotFoundError, ValueError) as exc:
+                # Often a plan caught mid-write; the next write triggers a retry.
+                print(f"ERROR: {exc}", file=sys.stderr)
+                continue
+            _print_delta(delta, scan.findings(), threshold, time.perf_counter() - start)
+    except KeyboardInterrupt:
+        pass
+    return 1 if any(f.severity >= threshold for f in scan.findings()) else 0
+
+
+# ---------------------------------------------------------------------------
+# Scan helpers
+# ---------------------------------------------------------------------------
+
+def _started(items: Iterator[T]) -> Iterator[T]:
+    """*items* with its first element already fetched.
+
+    Errors raised while a lazy source opens its input surface here, before
+    the caller has printed anything.
+    """
+    first = next(items, _EXHAUSTED)
+    if first is _EXHAUSTED:
+        return iter(())
+    return chain((first,), items)
+
+
+def _resolve_inputs(args: argparse.Namespace) -> list[str]:
+    """Expand ``--input`` globs and ``--manifest`` entries into plan paths.
+
+    Glob matches are sorted so batch reports are deterministic.  Manifest
+    files list one path or glob per line; blank lines and ``#`` comments are
+    ignored.
+    """
+    patterns: list[str] = []
+    if args.input:
+        patterns.append(args.input)
+    if args.manifest:
+        manifest = Path(args.manifest)
+        if not manifest.exists():
+            raise FileNotFoundError(f"Manifest file not found: {args.manifest}")
+        for line in manifest.read_text().splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                patterns.append(line)
+
+    paths: list[str] = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            paths.extend(sorted(glob.glob(pattern, recursive=True)))
+        else:
+            paths.append(pattern)
+    return list(dict.fromkeys(paths))
+
+
+def _live_input(args: argparse.Namespace, mode: str) -> str:
+    if mode == "mock":
+        return "mock inventory"
+    if mode == "snapshot":
+        return f"snapshot {args.snapshot}"
+    accounts = ", ".join(args.role_arn) or "current account"
+    regions = ", ".join(args.region) or "default region"
+    return f"AWS {accounts} ({regions})"
+
+
+def _target_fields(result: TargetResult) -> dict:
+    fields: dict = dict(result.target._asdict())
+    if result.fetched_at is not None:
+        fields["fetched_at"] = result.fetched_at.isoformat()
+        fields["resources"] = len(result.resources)
+    return fields
+
+
+def _open_cache(args: argparse.Namespace) -> Optional[FindingsCache]:
+    """The ``--cache`` database; ValueError if it cannot be opened."""
+    if not args.cache:
+        return None
+    try:
+        return FindingsCache(args.cache, args.cache_max_mb * 1024 * 1024)
+    except sqlite3.Error as exc:
+        raise ValueError(f"cannot open cache {args.cache}: {exc}") from exc
+
+
+def _open_writer(
+    args: argparse.Namespace,
+    profile: Optional[ScanProfile],
+) -> ReportWriter:
+    writer = open_report_writer(args.format, args.output)
+    return writer if profile is None else _ProfiledWriter(writer, profile)
+
+
+class _ProfiledWriter:
+    """Report writer wrapper that charges its time to the ``report`` stage.
+
+    The report's ``profile`` section is fixed before ``close()`` writes the
+    file, so only the console table includes that final write.
+    """
+
+    def __init__(self, writer: ReportWriter, profile: ScanProfile) -> None:
+        self._writer = writer
+        self._profile = profile
+        self.path = writer.path
+
+    def write_finding(self, finding: Finding) -> None:
+        start = time.perf_counter()
+        self._writer.write_finding(finding)
+        self._profile.add_stage("report", time.perf_counter() - start)
+
+    def write_plan(self, plan: dict) -> None:
+        start = time.perf_counter()
+        self._writer.write_plan(plan)
+        self._profile.add_stage("report", time.perf_counter() - start)
+
+    def close(self, report: dict) -> None:
+        start = time.perf_counter()
+        self._writer.close(report)
+        self._profile.add_stage("report", time.perf_counter() - start)
+
+    def abort(self) -> None:
+        self._writer.abort()
+
+
+class _Tally:
+    """Running severity counts for the summary and the exit code."""
+
+    def __init__(self, threshold: Severity) -> None:
+        self.threshold = threshold
+        self.total = 0
+        self.failing = 0
+        self.by_severity = [0] * len(Severity)
+
+    def add(self, finding: Finding) -> bool:
+        """Count *finding*; returns True if it is at or above the threshold."""
+        severity = finding.severity
+        self.total += 1
+        self.by_severity[severity] += 1
+        if severity >= self.threshold:
+            self.failing += 1
+            return True
+        return False
+
+    def merge(self, other: "_Tally") -> None:
+        self.total += other.total
+        self.failing += other.failing
+        for severity, count in enumerate(other.by_severity):
+            self.by_severity[severity] += count
+
+    def summary(self) -> dict[str, int]:
+        """The report ``summary`` block: total and per-severity counts."""
+        return {
+            "total_findings": self.total,
+            **{s.name.lower(): self.by_severity[s] for s in Severity},
+        }
+
+
+def _print_counts(summary: dict[str, int]) -> None:
+    print(f"Total findings : {summary['total_findings']}")
+    for sev in SEVERITY_ORDER:
+        print(f"  {sev:<10}: {summary[sev.lower()]}")
+
+
+def _print_cache_stats(stats: ScanStats) -> None:
+    print(f"Cache          : {stats.cache_hits} hit(s), {stats.cache_misses} miss(es)")
+
+
+def _print_profile(profile: ScanProfile, limit: int = 10) -> None:
+    stages = "  ".join(f"{stage} {seconds:.3f}s" for stage, seconds in profile.stages.items())
+    print("-" * 60)
+    print(f"Profile        : {stages}")
+    ranked = profile.ranked_checks()
+    if not ranked:
+        return
+    print(f"  {'CHECK':<32} {'CALLS':>8} {'TOTAL s':>9} {'MAX ms':>8}  SLOWEST RESOURCE")
+    for name, check in ranked[:limit]:
+        slowest = check.slowest()
+        print(
+            f"  {name:<32} {check.calls:>8} {check.total:>9.3f} "
+            f"{check.max * 1000:>8.2f}  {slowest[0][1] if slowest else ''}"
+        )
+    if len(ranked) > limit:
+        print(f"  … {len(ranked) - limit} more check(s) in the report")
+
+
+def _print_delta(
+    delta: FindingsDelta,
+    current: list[Finding],
+    threshold: Severity,
+    elapsed: float,
+) -> None:
+    stamp = datetime.now().strftime("%H:%M:%S")
+    removed = f", {delta.removed} removed" if delta.removed else ""
+    print(
+        f"[{stamp}] {delta.evaluated} resource(s) re-evaluated, "
+        f"{delta.unchanged} unchanged{removed} in {elapsed:.2f}s"
+    )
+    for marker, findings in (("+", delta.new), ("-", delta.resolved)):
+        for f in findings:
+            print(f"  {marker} [{f.severity.name:8}] {f.resource} – {f.issue}")
+    failing = sum(f.severity >= threshold for f in current)
+    verdict = "FAIL" if failing else "PASS"
+    print(
+        f"  {verdict}  {len(current)} finding(s), {failing} at or above "
+        f"'{threshold.name}' (+{len(delta.new)} new, -{len(delta.resolved)} resolved)"
+    )
+
+
+def _evaluations(stats: ScanStats) -> dict[str, int]:
+    """Unique evaluations vs resources scanned (identical instances share one)."""
+    return {
+        "resources": stats.evaluated + stats.deduplicated,
+        "unique": stats.evaluated,
     }
 
-    output_path = Path(args.output)
-    output_path.write_text(json.dumps(report, indent=2))
-    print(f"Report written to: {output_path}")
 
-    return 1 if failing_findings else 0
+def _print_evaluations(stats: ScanStats) -> None:
+    evaluations = _evaluations(stats)
+    print(
+        f"Evaluations    : {evaluations['unique']} unique of "
+        f"{evaluations['resources']} resource(s)"
+    )
+
+
+def _decoder_name(args: argparse.Namespace) -> str:
+    """JSON backend that loads the plans; ``stream`` for the streaming reader."""
+    return "stream" if args.stream else get_decoder(args.decoder).name
+
+
+def _print_decoder(args: argparse.Namespace) -> None:
+    print(f"Decoder        : {_decoder_name(args)}")
+
+
+def _partial_marker(args: argparse.Namespace) -> dict[str, bool]:
+    """``{"partial": True}`` for fail-fast reports, which omit findings."""
+    return {"partial": True} if args.fail_fast else {}
+
+
+def _print_fail_fast(stopped_early: bool) -> None:
+    if stopped_early:
+        print("Fail-fast      : stopped at the first blocking finding")
+    else:
+        print("Fail-fast      : no blocking finding; lower-severity checks skipped")
+
+
+def _print_verdict(failing_count: int, fail_on: str) -> None:
+    if failing_count:
+        print(
+            f"FAIL  {failing_count} finding(s) at or above threshold "
+            f"'{fail_on}'."
+        )
+    else:
+        print("PASS  No findings at or above threshold.")
+    print("=" * 60)
 
 
 # ---------------------------------------------------------------------------
 # Argument parser
 # ---------------------------------------------------------------------------
 
+def _console_mode(spec: str) -> ConsoleMode:
+    try:
+        return parse_console_mode(spec)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+
+
+def _add_gate_arguments(parser: argparse.ArgumentParser) -> None:
+    """Threshold, console, profiling and report options shared by scan and live."""
+    parser.add_argument(
+        "--fail-on",
+        dest="fail_on",
+        default="HIGH",
+        choices=SEVERITY_ORDER,
+        metavar="SEVERITY",
+        help=(
+            "Minimum severity that causes a non-zero exit code. "
+            "Choices: LOW, MEDIUM, HIGH, CRITICAL. Default: HIGH."
+        ),
+    )
+    parser.add_argument(
+        "--console",
+        default=ConsoleMode("full"),
+        type=_console_mode,
+        metavar="full|summary|top-N",
+        help=(
+            "Console output: every finding ('full'), counts grouped by "
+            "resource type and check ('summary'), or that table plus the N "
+            "most severe findings ('top-N', e.g. top-20). The report always "
+            "has every finding. Default: full."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Time every check call and the load/evaluate/report stages; adds "
+            "a 'profile' section to the report and a table to the console."
+        ),
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help=(
+            "Gate mode: run only checks that can reach --fail-on, most severe "
+            "first, and stop at the first finding at or above it. The report "
+            "is marked partial."
+        ),
+    )
+    parser.add_argument(
+        "--output",
+        default="cloudsentry_report.json",
+        metavar="FILE",
+        help="Path for the JSON report output. Default: cloudsentry_report.json.",
+    )
+    parser.add_argument(
+        "--format",
+        default="json",
+        choices=REPORT_FORMATS,
+        help=(
+            "Report format. 'ndjson' writes one finding per line as it is "
+            "produced plus a trailing summary record, in constant memory. "
+            "'compact' stores each rule's text once and findings as "
+            "[resource, rule_id, params]. Default: json."
+        ),
+    )
+
+
+def _snapshot_ttl(spec: str) -> tuple[str, float]:
+    name, sep, seconds = spec.partition("=")
+    if not sep or name not in COLLECTORS:
+        raise argparse.ArgumentTypeError(
+            f"expected COLLECTOR=SECONDS with COLLECTOR one of {', '.join(COLLECTORS)}"
+        )
+    try:
+        return name, float(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid TTL: {seconds!r}") from None
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="cloudsentry-cli",
-        description="CloudSentry CLI – Terraform plan security scanner",
+        description="CloudSentry CLI – Terraform plan and live AWS security scanner",
     )
     parser.add_argument(
         "--version", action="version", version=f"%(prog)s {__version__}"
@@ -133,28 +859,286 @@ def build_parser() -> argparse.ArgumentParser:
         "scan",
         help="Scan a Terraform plan JSON file.",
     )
+    inputs = scan_parser.add_mutually_exclusive_group(required=True)
+    inputs.add_argument(
+        "--input",
+        metavar="FILE",
+        help=(
+            "Path to the Terraform plan JSON file (terraform show -json plan.out). "
+            "A glob such as 'stacks/**/tfplan.json' scans every match in batch mode."
+        ),
+    )
+    inputs.add_argument(
+        "--manifest",
+        metavar="FILE",
+        help="File listing plan paths or globs, one per line, to scan in batch mode.",
+    )
+    _add_gate_arguments(scan_parser)
+    scan_parser.add_argument(
+        "--rules",
+        action="append",
+        default=[],
+        metavar="FILE",
+        help=(
+            "Declarative rule file (JSON, or YAML with PyYAML installed) to run "
+            "alongside the built-in checks. Repeatable."
+        ),
+    )
+    scan_parser.add_argument(
+        "--rules-cache",
+        dest="rules_cache",
+        metavar="DIR",
+        help=(
+            "Where validated rule files are cached, keyed by file hash. "
+            "Default: $XDG_CACHE_HOME/cloudsentry/rules."
+        ),
+    )
+    scan_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Parse the plan incrementally so memory is bounded by the largest "
+            "resource change instead of the whole file. Use for multi-GB plans."
+        ),
+    )
+    scan_parser.add_argument(
+        "--decoder",
+        default=AUTO,
+        choices=DECODER_CHOICES,
+        help=(
+            "JSON backend for loading plans (memory-mapped). 'auto' uses "
+            "orjson when installed, else the standard library. Default: auto."
+        ),
+    )
+    scan_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Process pool size for batch mode. Default: number of available CPUs.",
+    )
+    scan_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help=(
+            "Evaluate a single large plan in N worker processes. Findings keep "
+            "plan order, so the report matches a serial scan. Default: 1."
+        ),
+    )
+    scan_parser.add_argument(
+        "--baseline",
+        metavar="FILE",
+        help=(
+            "Plan JSON to diff against. Only resources that are new or whose "
+            "change.after differs from the baseline are evaluated."
+        ),
+    )
+    scan_parser.add_argument(
+        "--cache",
+        metavar="FILE",
+        help=(
+            "SQLite findings cache. Resources whose content and applicable "
+            "checks are unchanged since a previous run are not re-evaluated."
+        ),
+    )
     scan_parser.add_argument(
+        "--cache-max-mb",
+        dest="cache_max_mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        metavar="MB",
+        help=(
+            "Size budget for --cache; least recently used entries are evicted "
+            f"beyond it. Default: {DEFAULT_MAX_BYTES // (1024 * 1024)}."
+        ),
+    )
+
+    # -- live ----------------------------------------------------------------
+    live_parser = sub.add_parser(
+        "live",
+        help="Scan live AWS inventory with the same checks.",
+    )
+    sources = live_parser.add_mutually_exclusive_group()
+    sources.add_argument(
+        "--snapshot",
+        metavar="FILE",
+        help=(
+            "Replay the inventory saved in this snapshot store instead of "
+            "calling AWS. Findings are the same on every replay."
+        ),
+    )
+    sources.add_argument(
+        "--mock",
+        action="store_true",
+        help="Scan a small built-in inventory; no AWS credentials or boto3 needed.",
+    )
+    live_parser.add_argument(
+        "--role-arn",
+        dest="role_arn",
+        action="append",
+        default=[],
+        metavar="ARN",
+        help=(
+            "Role to assume for each account to scan. Repeatable. "
+            "Default: the current credentials' account."
+        ),
+    )
+    live_parser.add_argument(
+        "--region",
+        action="append",
+        default=[],
+        metavar="REGION",
+        help="Region to scan regional services in. Repeatable. Default: the session's region.",
+    )
+    live_parser.add_argument(
+        "--collector",
+        action="append",
+        choices=list(COLLECTORS),
+        metavar="NAME",
+        help=(
+            "Only run this collector. Repeatable. "
+            f"Choices: {', '.join(COLLECTORS)}. Default: all."
+        ),
+    )
+    live_parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        metavar="N",
+        help=(
+            "Concurrent (account, region, collector) jobs. "
+            f"Default: {DEFAULT_WORKERS}."
+        ),
+    )
+    live_parser.add_argument(
+        "--iam-source",
+        dest="iam_source",
+        default="credential-report",
+        choices=IAM_SOURCES,
+        help=(
+            "Read IAM users from the credential report (one call, falls back "
+            "to the API when denied) or with per-user API calls. "
+            "Default: credential-report."
+        ),
+    )
+    live_parser.add_argument(
+        "--iam-workers",
+        dest="iam_workers",
+        type=int,
+        default=DEFAULT_IAM_WORKERS,
+        metavar="N",
+        help=f"Concurrent per-user IAM API calls. Default: {DEFAULT_IAM_WORKERS}.",
+    )
+    live_parser.add_argument(
+        "--snapshot-store",
+        dest="snapshot_store",
+        metavar="FILE",
+        help=(
+            "SQLite inventory snapshot. Targets fetched within their TTL are "
+            "read from it; the rest are fetched and saved to it."
+        ),
+    )
+    live_parser.add_argument(
+        "--snapshot-ttl",
+        dest="snapshot_ttl",
+        action="append",
+        default=[],
+        type=_snapshot_ttl,
+        metavar="COLLECTOR=SECONDS",
+        help=(
+            "Override a collector's snapshot TTL. Repeatable. Defaults: "
+            + ", ".join(f"{c.name}={c.ttl}" for c in COLLECTORS.values()) + "."
+        ),
+    )
+    _add_gate_arguments(live_parser)
+
+    # -- watch ---------------------------------------------------------------
+    watch_parser = sub.add_parser(
+        "watch",
+        help="Rescan a plan on every change and print new/resolved findings.",
+    )
+    watch_parser.add_argument(
         "--input",
         required=True,
         metavar="FILE",
-        help="Path to the Terraform plan JSON file (terraform show -json plan.out).",
+        help="Terraform plan JSON file to watch (re-render it with terraform show -json).",
     )
-    scan_parser.add_argument(
+    watch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        metavar="SECONDS",
+        help=f"How often to check the file for changes. Default: {DEFAULT_INTERVAL:g}.",
+    )
+    watch_parser.add_argument(
         "--fail-on",
         dest="fail_on",
         default="HIGH",
         choices=SEVERITY_ORDER,
         metavar="SEVERITY",
         help=(
-            "Minimum severity that causes a non-zero exit code. "
-            "Choices: LOW, MEDIUM, HIGH, CRITICAL. Default: HIGH."
+            "Severity counted as failing in the status line and the exit code "
+            "on Ctrl-C. Default: HIGH."
         ),
     )
-    scan_parser.add_argument(
-        "--output",
-        default="cloudsentry_report.json",
+    watch_parser.add_argument(
+        "--rules",
+        action="append",
+        default=[],
         metavar="FILE",
-        help="Path for the JSON report output. Default: cloudsentry_report.json.",
+        help="Declarative rule file to run alongside the built-in checks. Repeatable.",
+    )
+    watch_parser.add_argument(
+        "--rules-cache",
+        dest="rules_cache",
+        metavar="DIR",
+        help="Where validated rule files are cached. Default: $XDG_CACHE_HOME/cloudsentry/rules.",
+    )
+    watch_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse the plan incrementally, for plans too large to load at once.",
+    )
+    watch_parser.add_argument(
+        "--decoder",
+        default=AUTO,
+        choices=DECODER_CHOICES,
+        help="JSON backend for loading the plan. Default: auto.",
+    )
+
+    # -- serve ---------------------------------------------------------------
+    serve_parser = sub.add_parser(
+        "serve",
+        help="Run a scan daemon for cloudsentry-client.",
+    )
+    serve_parser.add_argument(
+        "--listen",
+        default=None,
+        metavar="ADDR",
+        help=(
+            "unix:PATH or loopback HOST:PORT to accept scan requests on; TCP "
+            f"requires a shared token in ${TOKEN_ENV}. "
+            "Default: a per-user socket in $XDG_RUNTIME_DIR."
+        ),
+    )
+    serve_parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        metavar="N",
+        help="Scans run concurrently. Default: number of CPUs.",
+    )
+    serve_parser.add_argument(
+        "--queue",
+        type=int,
+        default=DEFAULT_QUEUE,
+        metavar="N",
+        help=(
+            "Scans that may wait for a free worker; further requests are "
+            f"refused with 503. Default: {DEFAULT_QUEUE}."
+        ),
     )
 
     return parser
@@ -164,12 +1148,20 @@ def build_parser() -> argparse.ArgumentParser:
 # Entry point
 # ---------------------------------------------------------------------------
 
-def main() -> None:
+def main(argv: Optional[list[str]] = None) -> None:
     parser = build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.command == "scan":
         sys.exit(cmd_scan(args))
+    elif args.command == "live":
+        sys.exit(cmd_live(args))
+    elif args.command == "watch":
+        sys.exit(cmd_watch(args))
+    elif args.command == "serve":
+        if args.workers < 1 or args.queue < 0:
+            parser.error("--workers must be at least 1 and --queue not negative")
+        sys.exit(serve(args.listen, args.workers, args.queue, os.environ.get(TOKEN_ENV)))
     else:
         parser.print_help()
         sys.exit(1)
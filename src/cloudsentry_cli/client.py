@@ -0,0 +1,183 @@
+"""
+Thin client for ``cloudsentry-cli serve``.
+
+Forwards ``scan`` arguments to a running daemon and reproduces the scan's
+output and exit code, so a CI step can swap ``cloudsentry-cli scan`` for
+``cloudsentry-client scan`` without other changes::
+
+    cloudsentry-cli serve &
+    cloudsentry-client scan --input tfplan.json --fail-on HIGH --output report.json
+
+Both default to the same per-user Unix socket.  A daemon listening on TCP
+needs the shared token in ``$CLOUDSENTRY_TOKEN`` on both sides.
+
+Relative paths are resolved in the client's working directory, which is
+sent with the request.  When no daemon is listening the scan runs in
+process instead (``--no-fallback`` turns that into an error).
+
+Deliberately imports nothing from the rest of the package until it has to
+fall back, so forwarding a scan costs little more than interpreter start-up.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import sys
+import tempfile
+from typing import Any, Optional
+
+SERVER_ENV = "CLOUDSENTRY_SERVER"
+TOKEN_ENV = "CLOUDSENTRY_TOKEN"
+UNIX_PREFIX = "unix:"
+SOCKET_NAME = "cloudsentry.sock"
+
+# Exit code when the daemon cannot be reached or refuses the request.
+UNAVAILABLE_EXIT = 2
+
+
+class ServerUnavailable(Exception):
+    """No daemon is listening at the given address, or it dropped the request."""
+
+
+def default_server() -> str:
+    """The per-user daemon socket: in ``$XDG_RUNTIME_DIR`` if set, else a
+    private ``cloudsentry-<uid>`` directory under the temp dir."""
+    directory = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(
+        tempfile.gettempdir(), f"cloudsentry-{os.getuid()}"
+    )
+    return f"{UNIX_PREFIX}{os.path.join(directory, SOCKET_NAME)}"
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: Optional[float] = None) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self._path = path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+        sock.connect(self._path)
+        self.sock = sock
+
+
+def _connection(server: str, timeout: Optional[float]) -> http.client.HTTPConnection:
+    if server.startswith(UNIX_PREFIX):
+        return _UnixHTTPConnection(server[len(UNIX_PREFIX):], timeout)
+    host, _, port = server.rpartition(":")
+    return http.client.HTTPConnection(host.strip("[]"), int(port), timeout=timeout)
+
+
+def request(
+    server: str,
+    method: str,
+    path: str,
+    body: Optional[dict[str, Any]] = None,
+    timeout: Optional[float] = None,
+    token: Optional[str] = None,
+) -> tuple[int, dict[str, Any]]:
+    """Send one request to the daemon at *server*; ``(status, json body)``.
+
+    *token* is sent as a bearer token; daemons listening on TCP require it.
+
+    Raises
+    ------
+    ServerUnavailable
+        If nothing is listening at *server*, or the connection breaks
+        before a reply arrives (e.g. a daemon worker crashed).
+    """
+    conn = _connection(server, timeout)
+    payload = json.dumps(body).encode() if body is not None else None
+    headers = {"Content-Type": "application/json"} if payload is not None else {}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    try:
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+        except (ConnectionError, FileNotFoundError) as exc:
+            raise ServerUnavailable(f"No cloudsentry daemon at {server}: {exc}") from exc
+        try:
+            response = conn.getresponse()
+            data = response.read()
+        except (ConnectionError, http.client.HTTPException) as exc:
+            raise ServerUnavailable(
+                f"cloudsentry daemon at {server} dropped the request: {exc!r}"
+            ) from exc
+        return response.status, json.loads(data or b"{}")
+    finally:
+        conn.close()
+
+
+def forward_scan(
+    server: str,
+    argv: list[str],
+    cwd: Optional[str] = None,
+    token: Optional[str] = None,
+) -> dict[str, Any]:
+    """Run ``scan *argv*`` on the daemon; the reply has exit_code/stdout/stderr."""
+    status, body = request(
+        server, "POST", "/scan", {"argv": argv, "cwd": os.path.abspath(cwd or os.getcwd())},
+        token=token,
+    )
+    if status != 200:
+        return {
+            "exit_code": UNAVAILABLE_EXIT,
+            "stdout": "",
+            "stderr": f"ERROR: cloudsentry daemon at {server}: "
+                      f"{body.get('error', f'HTTP {status}')}\n",
+        }
+    return body
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cloudsentry-client",
+        description="Forward a scan to a running `cloudsentry-cli serve` daemon.",
+    )
+    parser.add_argument(
+        "--server",
+        default=os.environ.get(SERVER_ENV) or default_server(),
+        metavar="ADDR",
+        help=(
+            f"Daemon address, unix:PATH or HOST:PORT (with ${TOKEN_ENV}). "
+            f"Default: ${SERVER_ENV} or the per-user socket in $XDG_RUNTIME_DIR."
+        ),
+    )
+    parser.add_argument(
+        "--no-fallback",
+        dest="fallback",
+        action="store_false",
+        help="Fail instead of scanning in process when no daemon is listening.",
+    )
+    parser.add_argument("command", choices=["scan"])
+    parser.add_argument(
+        "args",
+        nargs=argparse.REMAINDER,
+        help="Arguments for `cloudsentry-cli scan`.",
+    )
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    try:
+        result = forward_scan(args.server, args.args, token=os.environ.get(TOKEN_ENV))
+    except ServerUnavailable as exc:
+        if not args.fallback:
+            print(f"ERROR: {exc}", file=sys.stderr)
+            sys.exit(UNAVAILABLE_EXIT)
+        from cloudsentry_cli.cli import main as cli_main
+
+        cli_main(["scan", *args.args])
+        return
+    sys.stdout.write(result.get("stdout", ""))
+    sys.stderr.write(result.get("stderr", ""))
+    sys.exit(result.get("exit_code", 1))
+
+
+if __name__ == "__main__":
+    main()
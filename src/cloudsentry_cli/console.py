@@ -0,0 +1,160 @@
+"""
+Console rendering of findings for ``cloudsentry-cli scan``.
+
+Writing one ``print()`` per finding dominates the run time of a large scan
+on CI runners and floods the log viewer, so findings go through a
+:class:`ConsoleRenderer` that buffers its output and supports three modes:
+
+``full``
+    Every finding, one line each (the classic output).
+``summary``
+    A table of finding counts grouped by resource type and check (rule id),
+    worst severity first.
+``top-N``
+    The summary table plus the N most severe findings.
+
+The report file always contains every finding, whatever the console mode.
+
+Usage::
+
+    from cloudsentry_cli.console import ConsoleRenderer, parse_console_mode
+
+    renderer = ConsoleRenderer(parse_console_mode("top-20"))
+    for finding in findings:
+        renderer.add(finding, failing=finding.severity >= threshold)
+    renderer.finish()
+"""
+
+from __future__ import annotations
+
+import heapq
+import sys
+from typing import IO, NamedTuple, Optional
+
+from cloudsentry_cli.findings import Finding, Severity
+
+# Lines held before the buffer is written out.
+DEFAULT_BUFFER_LINES = 1000
+
+
+class ConsoleMode(NamedTuple):
+    """A parsed ``--console`` value; *limit* is N for ``top-N``."""
+
+    kind: str
+    limit: int = 0
+
+
+def parse_console_mode(spec: str) -> ConsoleMode:
+    """Parse ``full``, ``summary`` or ``top-N``.
+
+    Raises
+    ------
+    ValueError
+        If *spec* is none of those.
+    """
+    if spec in ("full", "summary"):
+        return ConsoleMode(spec)
+    kind, _, limit = spec.partition("-")
+    if kind == "top" and limit.isdigit() and int(limit) > 0:
+        return ConsoleMode("top", int(limit))
+    raise ValueError(f"expected full, summary or top-N, got {spec!r}")
+
+
+class _Group:
+    """Counts for one (resource type, check) pair."""
+
+    __slots__ = ("count", "failing", "worst")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.failing = 0
+        self.worst = Severity.LOW
+
+
+class ConsoleRenderer:
+    """Buffered writer for the finding lines of one scan."""
+
+    def __init__(
+        self,
+        mode: ConsoleMode = ConsoleMode("full"),
+        out: Optional[IO[str]] = None,
+        buffer_lines: int = DEFAULT_BUFFER_LINES,
+    ) -> None:
+        self.mode = mode
+        self._out = out if out is not None else sys.stdout
+        self._buffer_lines = buffer_lines
+        self._lines: list[str] = []
+        self._groups: dict[tuple[str, str], _Group] = {}
+        # Min-heap of (severity, -sequence, line): the root is the least
+        # severe, latest finding, i.e. the first to drop out of the top N.
+        self._top: list[tuple[int, int, str]] = []
+        self._seen = 0
+
+    def add(self, finding: Finding, failing: bool, indent: str = "  ") -> None:
+        """Render (or aggregate) one finding."""
+        if self.mode.kind == "full":
+            self.line(_format_finding(finding, failing, indent))
+            return
+
+        key = (finding.resource.partition(".")[0], finding.rule_id or finding.issue)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = _Group()
+        group.count += 1
+        group.failing += failing
+        if finding.severity > group.worst:
+            group.worst = finding.severity
+
+        self._seen += 1
+        if self.mode.kind == "top":
+            entry = (int(finding.severity), -self._seen, _format_finding(finding, failing))
+            if len(self._top) < self.mode.limit:
+                heapq.heappush(self._top, entry)
+            elif entry > self._top[0]:
+                heapq.heapreplace(self._top, entry)
+
+    def line(self, text: str) -> None:
+        """Queue a line of output, in order with the finding lines."""
+        self._lines.append(text)
+        if len(self._lines) >= self._buffer_lines:
+            self.flush()
+
+    def finish(self) -> None:
+        """Write the summary sections (if any) and flush everything."""
+        if self._groups:
+            self._render_groups()
+        if self._top:
+            self._render_top()
+        self.flush()
+
+    def flush(self) -> None:
+        if self._lines:
+            self._lines.append("")
+            self._out.write("\n".join(self._lines))
+            self._lines.clear()
+        self._out.flush()
+
+    def _render_groups(self) -> None:
+        self.line("Findings by resource type and check:")
+        self.line(f"  {'COUNT':>7}  {'FAILING':>7}  {'WORST':<8}  {'RESOURCE TYPE':<32}  CHECK")
+        groups = sorted(
+            self._groups.items(),
+            key=lambda item: (-item[1].worst, -item[1].count, item[0]),
+        )
+        for (resource_type, check), group in groups:
+            self.line(
+                f"  {group.count:>7}  {group.failing:>7}  {group.worst.name:<8}  "
+                f"{resource_type:<32}  {check}"
+            )
+
+    def _render_top(self) -> None:
+        self.line(f"Top {len(self._top)} of {self._seen} finding(s), most severe first:")
+        for _, _, text in sorted(self._top, reverse=True):
+            self.line(text)
+        if self._seen > len(self._top):
+            self.line(f"  … {self._seen - len(self._top)} more in the report")
+
+
+def _format_finding(f: Finding, failing: bool, indent: str = "  ") -> str:
+    marker = "✖" if failing else "·"
+    return f"{indent}{marker} [{f.severity.name:8}] {f.resource} – {f.issue}"
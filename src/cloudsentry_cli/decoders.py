@@ -0,0 +1,165 @@
+"""
+Pluggable JSON decoding for plan files.
+
+Loading a multi-GB plan is dominated by JSON decoding.  A plan file is
+memory-mapped rather than read into a separate buffer, then handed to the
+selected backend:
+
+``json``
+    The standard library; always available, the zero-dependency default.
+``orjson``
+    A considerably faster decoder, used when installed
+    (``pip install cloudsentry-cli[fast]``).  It decodes the mapped bytes
+    in place, without first copying them into a ``str``.
+
+Decoding a large plan allocates millions of dicts and lists, and on the
+stdlib and orjson alike the cyclic garbage collector re-traverses them over
+and over while they are built, roughly doubling decode time.  A decoded
+JSON document cannot contain reference cycles, so the collector is paused
+for the duration of each decode.
+
+``auto`` (the default) picks the fastest installed backend.  Every backend
+returns the same plain ``dict``/``list`` document, and decode errors are
+:class:`ValueError` subclasses for all of them.
+
+Usage::
+
+    from cloudsentry_cli.decoders import get_decoder, load_json
+
+    decoder = get_decoder("auto")
+    print(decoder.name)
+    plan = load_json("tfplan.json", decoder)
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import mmap
+import os
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import IO, Any, Callable, Iterator, NamedTuple, Optional, Union
+
+AUTO = "auto"
+
+# Fastest first; "auto" picks the first one that imports.
+BACKENDS = ("orjson", "json")
+DECODER_CHOICES = (AUTO, *BACKENDS)
+
+
+class Decoder(NamedTuple):
+    """A JSON backend: *loads* accepts ``str`` or any bytes-like object."""
+
+    name: str
+    loads: Callable[[Any], Any]
+
+
+def _stdlib_loads(data: Any) -> Any:
+    # str() decodes straight from the buffer, without an intermediate bytes copy.
+    return json.loads(data if isinstance(data, str) else str(data, "utf-8"))
+
+
+def _load_backend(name: str) -> Decoder:
+    if name == "json":
+        return Decoder("json", _stdlib_loads)
+    if name == "orjson":
+        import orjson
+
+        return Decoder("orjson", orjson.loads)
+    raise ValueError(f"Unknown JSON decoder {name!r}; choose from {', '.join(DECODER_CHOICES)}")
+
+
+@lru_cache(maxsize=None)
+def get_decoder(name: str = AUTO) -> Decoder:
+    """The decoder called *name*, or the fastest installed one for ``auto``.
+
+    Raises
+    ------
+    ImportError
+        If the requested backend is not installed.
+    ValueError
+        If *name* is not a known backend.
+    """
+    if name != AUTO:
+        try:
+            return _load_backend(name)
+        except ImportError:
+            raise ImportError(
+                f"JSON decoder {name!r} is not installed "
+                f"(pip install cloudsentry-cli[fast])"
+            ) from None
+    for backend in BACKENDS:
+        try:
+            return _load_backend(backend)
+        except ImportError:
+            continue
+    raise AssertionError("the stdlib json backend is always available")
+
+
+def available_decoders() -> list[str]:
+    """Names of the backends that are installed, fastest first."""
+    names = []
+    for backend in BACKENDS:
+        try:
+            get_decoder(backend)
+        except ImportError:
+            continue
+        names.append(backend)
+    return names
+
+
+def load_json(
+    source: Union[str, "os.PathLike[str]", IO[str], IO[bytes]],
+    decoder: Decoder,
+    use_mmap: bool = True,
+) -> Any:
+    """Decode the JSON document in *source* (a path or an open file).
+
+    Regular files opened in binary mode are memory-mapped; text streams,
+    pipes, empty files and file objects without a descriptor are read.
+    Pass ``use_mmap=False`` to always read: a mapped file that another
+    process truncates mid-decode kills this one with SIGBUS.
+    """
+    if hasattr(source, "read"):
+        return _decode_file(source, decoder, use_mmap)  # type: ignore[arg-type]
+    with open(source, "rb") as fh:
+        return _decode_file(fh, decoder, use_mmap)
+
+
+def _decode_file(
+    fh: Union[IO[str], IO[bytes]],
+    decoder: Decoder,
+    use_mmap: bool = True,
+) -> Any:
+    mapped = _map(fh) if use_mmap else None
+    if mapped is None:
+        data = fh.read()
+        with _gc_paused():
+            return decoder.loads(data)
+    with mapped, memoryview(mapped) as view, _gc_paused():
+        return decoder.loads(view)
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _map(fh: Union[IO[str], IO[bytes]]) -> Optional[mmap.mmap]:
+    """A read-only mapping of the whole of *fh*, or None if it cannot be mapped."""
+    if "b" not in getattr(fh, "mode", ""):
+        return None
+    try:
+        if fh.tell() != 0:
+            return None
+        return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # No descriptor (io.UnsupportedOperation), a pipe, or an empty file.
+        return None
@@ -0,0 +1,126 @@
+"""
+Finding and severity types shared by checks, the scanner and reports.
+
+:class:`Severity` is an :class:`~enum.IntEnum`, so thresholds and counts
+compare integer ranks instead of re-parsing severity strings per finding.
+
+:class:`Finding` is a slotted record.  It behaves as a read-only mapping with
+the classic finding keys (``finding["severity"]`` is still ``"HIGH"``), but
+the plain dict a report needs is only built by :meth:`Finding.to_dict` when
+the finding is serialized.
+
+Usage::
+
+    from cloudsentry_cli.findings import Finding, Severity
+
+    f = Finding("aws_s3_bucket.logs", Severity.HIGH, "Public ACL", "Fix it")
+    f.severity >= Severity.MEDIUM      # True
+    f.to_dict()["severity"]            # "HIGH"
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from enum import IntEnum
+from typing import Any, Iterator, Optional, Union
+
+
+class Severity(IntEnum):
+    """Finding severity; a higher value is more severe."""
+
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+    CRITICAL = 3
+
+    @classmethod
+    def parse(cls, value: Union[str, "Severity"]) -> "Severity":
+        """Return the member named *value* (case-insensitive).
+
+        Raises
+        ------
+        ValueError
+            If *value* is not a severity name.
+        """
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls[str(value).upper()]
+        except KeyError:
+            raise ValueError(
+                f"Unknown severity {value!r}; expected one of "
+                f"{', '.join(s.name for s in cls)}"
+            ) from None
+
+
+# Mapping keys, in report order.  rule_id and params are only present for
+# findings built from a rule.
+_KEYS = ("resource", "issue", "severity", "recommendation", "rule_id", "params")
+_BASE_KEYS = _KEYS[:4]
+
+
+class Finding(Mapping):
+    """One issue found on one resource."""
+
+    __slots__ = ("resource", "severity", "issue", "recommendation", "rule_id", "params")
+
+    def __init__(
+        self,
+        resource: str,
+        severity: Severity,
+        issue: str,
+        recommendation: str,
+        rule_id: Optional[str] = None,
+        params: Optional[dict[str, Any]] = None,
+    ) -> None:
+        self.resource = resource
+        self.severity = severity
+        self.issue = issue
+        self.recommendation = recommendation
+        self.rule_id = rule_id
+        self.params = params if params is not None else {}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], resource: Optional[str] = None) -> "Finding":
+        """Build a finding from its dict form.
+
+        *resource* supplies the label when *data* has none (cached findings
+        are stored unlabelled).
+        """
+        return cls(
+            data.get("resource", resource),
+            Severity.parse(data["severity"]),
+            data["issue"],
+            data["recommendation"],
+            data.get("rule_id"),
+            data.get("params"),
+        )
+
+    def to_dict(self, resource: bool = True) -> dict[str, Any]:
+        """The JSON view of the finding, optionally without ``resource``."""
+        data: dict[str, Any] = {"resource": self.resource} if resource else {}
+        data["issue"] = self.issue
+        data["severity"] = self.severity.name
+        data["recommendation"] = self.recommendation
+        if self.rule_id is not None:
+            data["rule_id"] = self.rule_id
+            data["params"] = self.params
+        return data
+
+    # -- read-only mapping view, for code written against finding dicts -----
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "severity":
+            return self.severity.name
+        if key in _BASE_KEYS or (key in _KEYS and self.rule_id is not None):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_KEYS if self.rule_id is not None else _BASE_KEYS)
+
+    def __len__(self) -> int:
+        return len(_KEYS) if self.rule_id is not None else len(_BASE_KEYS)
+
+    def __repr__(self) -> str:
+        return f"Finding({self.to_dict()!r})"
@@ -0,0 +1,564 @@
+"""
+Live AWS inventory collectors.
+
+A collector reads one kind of resource from a running AWS account and
+returns it as :class:`~cloudsentry_cli.plan_stream.ResourceChange` records
+shaped like the matching Terraform resource, so the checks in
+:mod:`cloudsentry_cli.checks` evaluate live state exactly as they evaluate
+a plan (see :func:`~cloudsentry_cli.scanner.evaluate_resources`).
+
+``iam_users`` (once per account)
+    ``aws_iam_user`` with ``mfa_enabled``, ``admin`` and ``access_keys``
+    (each key's ``age_days`` at collection time).  Read from the IAM
+    credential report, with per-user API calls for rows it cannot answer.
+``security_groups`` (per account and region)
+    ``aws_security_group`` with Terraform-style ``ingress`` blocks.
+
+:func:`collect` runs the collectors for every account (an assumed role, or
+the current credentials) and region on one bounded thread pool and yields a
+:class:`TargetResult` per (account, region, collector), in a fixed order.
+With a :class:`~cloudsentry_cli.snapshot.SnapshotStore`, inventory younger
+than the collector's TTL is reused instead of fetched.  :func:`tag_findings`
+records a target's ``account`` and ``region`` in each of its findings'
+``params``, so findings stay traceable once merged into one report.
+
+More collectors plug in with :func:`collector`.  boto3 is only imported
+once a collector needs a session, so plan scans and snapshot replays run
+without it; install it with ``pip install 'cloudsentry-cli[aws]'``.
+
+Usage::
+
+    from cloudsentry_cli.live import collect
+    from cloudsentry_cli.scanner import evaluate_resources
+
+    for result in collect(regions=["us-east-1", "eu-west-1"]):
+        for finding in tag_findings(evaluate_resources(result.resources), result.target):
+            print(finding.params["account"], finding.params["region"], finding.issue)
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from cloudsentry_cli.findings import Finding
+from cloudsentry_cli.plan_stream import ResourceChange
+
+try:
+    from botocore.exceptions import ClientError
+except ImportError:  # boto3 not installed, so no AWS call can raise it
+    class ClientError(Exception):  # type: ignore[no-redef]
+        """Stand-in for botocore's ClientError."""
+
+        def __init__(self, error_response: dict, operation_name: str) -> None:
+            super().__init__(f"An error occurred calling {operation_name}: {error_response}")
+            self.response = error_response
+
+if TYPE_CHECKING:
+    from cloudsentry_cli.snapshot import SnapshotStore
+
+# Concurrent (account, region, collector) jobs.
+DEFAULT_WORKERS = 8
+
+# Concurrent per-user IAM calls within one account.
+DEFAULT_IAM_WORKERS = 16
+
+# Region of account-wide collectors such as IAM.
+GLOBAL_REGION = "global"
+
+# Live resources describe current state, not a planned change.
+LIVE_ACTIONS = ["read"]
+
+IAM_SOURCES = ("credential-report", "api")
+
+CREDENTIAL_REPORT_POLL_SECONDS = 2
+CREDENTIAL_REPORT_TIMEOUT_SECONDS = 120
+
+
+class CollectContext(NamedTuple):
+    """What a collector is given for one account and region."""
+
+    account: str
+    region: str
+    # Service name → boto3 client for this account and region.
+    clients: Mapping[str, Any]
+    # Collection time; ages (e.g. of access keys) are measured from it.
+    now: datetime
+    options: Mapping[str, Any]
+
+
+CollectorFn = Callable[[CollectContext], Iterable[ResourceChange]]
+
+
+class Collector(NamedTuple):
+    name: str
+    fn: CollectorFn
+    # boto3 services the collector needs clients for.
+    services: tuple[str, ...]
+    # False for account-wide (global) services.
+    per_region: bool
+    # Default snapshot TTL in seconds.
+    ttl: int
+
+
+class LiveTarget(NamedTuple):
+    account: str
+    region: str
+    collector: str
+
+    @property
+    def label(self) -> str:
+        return f"{self.account}/{self.region}/{self.collector}"
+
+
+def tag_findings(findings: Iterable[Finding], target: LiveTarget) -> list[Finding]:
+    """*findings* with *target*'s ``account`` and ``region`` added to their params."""
+    tagged = []
+    for finding in findings:
+        finding.params = {**finding.params, "account": target.account, "region": target.region}
+        tagged.append(finding)
+    return tagged
+
+
+class TargetResult(NamedTuple):
+    """Inventory of one target, or why it could not be collected."""
+
+    target: LiveTarget
+    resources: list[ResourceChange]
+    error: Optional[str] = None
+    fetched_at: Optional[datetime] = None
+    # True when the resources came from a snapshot rather than AWS.
+    cached: bool = False
+
+
+# Registered collectors by name, in registration (and report) order.
+COLLECTORS: dict[str, Collector] = {}
+
+
+def collector(
+    name: str,
+    services: Sequence[str],
+    per_region: bool = True,
+    ttl: int = 300,
+) -> Callable[[CollectorFn], CollectorFn]:
+    """Register the decorated function as the collector *name*."""
+    def decorate(fn: CollectorFn) -> CollectorFn:
+        register_collector(Collector(name, fn, tuple(services), per_region, ttl))
+        return fn
+    return decorate
+
+
+def register_collector(entry: Collector) -> None:
+    COLLECTORS[entry.name] = entry
+
+
+# ---------------------------------------------------------------------------
+# Sessions
+# ---------------------------------------------------------------------------
+
+def open_session(role_arn: Optional[str] = None) -> Any:
+    """A boto3 session for the current credentials, or for *role_arn* via STS."""
+    import boto3
+
+    session = boto3.Session()
+    if role_arn is None:
+        return session
+    creds = session.client("sts").assume_role(
+        RoleArn=role_arn, RoleSessionName="cloudsentry"
+    )["Credentials"]
+    return boto3.Session(
+        aws_access_key_id=creds["AccessKeyId"],
+        aws_secret_access_key=creds["SecretAccessKey"],
+        aws_session_token=creds["SessionToken"],
+    )
+
+
+def client_config(max_pool_connections: int = DEFAULT_IAM_WORKERS) -> Any:
+    """botocore client config: a connection per concurrent call, standard retries."""
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=max_pool_connections,
+        retries={"mode": "standard", "max_attempts": 10},
+    )
+
+
+def _paginate(client: Any, operation: str, result_key: str, **kwargs: Any) -> list[Any]:
+    """Every item of *result_key* across all pages of *operation*."""
+    return [
+        item
+        for page in client.get_paginator(operation).paginate(**kwargs)
+        for item in page.get(result_key, [])
+    ]
+
+
+# ---------------------------------------------------------------------------
+# IAM users
+# ---------------------------------------------------------------------------
+
+class _IamUser(NamedTuple):
+    name: str
+    admin: bool
+    mfa: bool
+    key_dates: list[datetime]
+
+
+def iam_user_resource(user: _IamUser, now: datetime) -> ResourceChange:
+    return ResourceChange(
+        type="aws_iam_user",
+        name=user.name,
+        address=f"aws_iam_user.{user.name}",
+        actions=LIVE_ACTIONS,
+        after={
+            "name": user.name,
+            "admin": user.admin,
+            "mfa_enabled": user.mfa,
+            "access_keys": [{"age_days": (now - d).days} for d in user.key_dates],
+        },
+    )
+
+
+@collector("iam_users", services=("iam",), per_region=False, ttl=3600)
+def collect_iam_users(ctx: CollectContext) -> list[ResourceChange]:
+    """IAM users, from the credential report or (``iam_source="api"``) per user.
+
+    If the report cannot be generated, e.g. iam:GenerateCredentialReport is
+    denied, a warning is written to stderr and the per-user API is used
+    instead.  Users deleted while they are being described are left out.
+    """
+    iam = ctx.clients["iam"]
+    source = ctx.options.get("iam_source", "credential-report")
+    workers = ctx.options.get("iam_workers", DEFAULT_IAM_WORKERS)
+    if source not in IAM_SOURCES:
+        raise ValueError(f"Unknown IAM source: {source}")
+
+    report = None
+    if source == "credential-report":
+        try:
+            report = fetch_credential_report(iam, ctx.options.get("sleep"))
+        except (TimeoutError, ClientError) as exc:
+            print(
+                f"WARNING: {ctx.account}: IAM credential report unavailable ({exc}); "
+                f"falling back to per-user API calls",
+                file=sys.stderr,
+            )
+    listed = _paginate(iam, "list_users", "Users")
+    if report is None:
+        users = _describe_users(iam, listed, workers)
+    else:
+        users = _users_from_report(iam, report, listed, workers)
+    return [iam_user_resource(user, ctx.now) for user in users]
+
+
+def _describe_user(iam: Any, user: Mapping[str, Any]) -> Optional[_IamUser]:
+    """MFA devices and access keys of one user (two paginated calls).
+
+    None if the user no longer exists (deleted since it was listed).
+    """
+    name = user["UserName"]
+    try:
+        mfa = _paginate(iam, "list_mfa_devices", "MFADevices", UserName=name)
+        keys = _paginate(iam, "list_access_keys", "AccessKeyMetadata", UserName=name)
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") == "NoSuchEntity":
+            return None
+        raise
+    return _IamUser(name, False, bool(mfa), [k["CreateDate"] for k in keys])
+
+
+def _describe_users(
+    iam: Any,
+    users: Sequence[Mapping[str, Any]],
+    workers: int,
+) -> list[_IamUser]:
+    """:func:`_describe_user` for each of *users* on a bounded thread pool.
+
+    boto3 clients are thread-safe; results keep the order of *users*, less
+    any that no longer exist.
+    """
+    if workers <= 1:
+        described = [_describe_user(iam, user) for user in users]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            described = list(pool.map(lambda user: _describe_user(iam, user), users))
+    return [user for user in described if user is not None]
+
+
+def fetch_credential_report(iam: Any, sleep: Optional[Callable[[float], None]] = None) -> str:
+    """Generate the account's credential report and return its CSV text.
+
+    AWS builds the report asynchronously (and reuses one younger than four
+    hours), so ``generate_credential_report`` is polled until COMPLETE.
+
+    Raises
+    ------
+    TimeoutError
+        If the report is not ready within ``CREDENTIAL_REPORT_TIMEOUT_SECONDS``.
+    """
+    sleep = sleep or time.sleep
+    waited = 0
+    while iam.generate_credential_report()["State"] != "COMPLETE":
+        if waited >= CREDENTIAL_REPORT_TIMEOUT_SECONDS:
+            raise TimeoutError("IAM credential report was not ready in time")
+        sleep(CREDENTIAL_REPORT_POLL_SECONDS)
+        waited += CREDENTIAL_REPORT_POLL_SECONDS
+    content = iam.get_credential_report()["Content"]
+    return content.decode("utf-8") if isinstance(content, bytes) else content
+
+
+def parse_credential_report(lines: Iterable[str]) -> Iterator[tuple[_IamUser, bool]]:
+    """Yield ``(user, complete)`` for each IAM user row of a credential report.
+
+    *lines* is any iterable of CSV text lines, read one row at a time.
+    ``complete`` is False when the row lacks a field the checks need (a
+    missing column, or an active key without a rotation date); such users
+    should be looked up with the API.  The root account row is skipped, as
+    ``list_users`` does not return it either.
+    """
+    for row in csv.DictReader(lines):
+        name = row.get("user")
+        if not name or name == "<root_account>":
+            continue
+        complete = row.get("mfa_active") in ("true", "false")
+        key_dates = []
+        for n in (1, 2):
+            column = f"access_key_{n}_last_rotated"
+            if column not in row:
+                complete = False
+                continue
+            rotated = _report_time(row[column])
+            if rotated is not None:
+                key_dates.append(rotated)
+            elif row.get(f"access_key_{n}_active") == "true":
+                complete = False
+        yield _IamUser(name, False, row.get("mfa_active") == "true", key_dates), complete
+
+
+def _report_time(value: Optional[str]) -> Optional[datetime]:
+    """Report timestamps are ISO 8601; "N/A" and "no_information" mean none."""
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))  # type: ignore[union-attr]
+    except (AttributeError, ValueError):
+        return None
+
+
+def _users_from_report(
+    iam: Any,
+    report: str,
+    listed: Sequence[Mapping[str, Any]],
+    workers: int,
+) -> list[_IamUser]:
+    """The *listed* users, taken from the credential *report* where possible.
+
+    The report can be up to four hours old, so ``list_users`` decides who
+    exists: rows for deleted users are dropped, and users created since the
+    report (like incomplete rows) are described with the API.  Results keep
+    the ``list_users`` order.
+    """
+    rows = {
+        user.name: user
+        for user, complete in parse_credential_report(io.StringIO(report))
+        if complete
+    }
+    missing = [user for user in listed if user["UserName"] not in rows]
+    described = {user.name: user for user in _describe_users(iam, missing, workers)}
+    return [
+        rows.get(name) or described[name]
+        for name in (user["UserName"] for user in listed)
+        if name in rows or name in described
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Security groups
+# ---------------------------------------------------------------------------
+
+def security_group_resource(group: Mapping[str, Any]) -> ResourceChange:
+    """An EC2 ``SecurityGroups[]`` entry with Terraform-style ingress blocks."""
+    ingress = [
+        {
+            "from_port": perm.get("FromPort"),
+            "to_port": perm.get("ToPort"),
+            "protocol": perm.get("IpProtocol", "tcp"),
+            "cidr_blocks": [r["CidrIp"] for r in perm.get("IpRanges", []) if "CidrIp" in r],
+            "ipv6_cidr_blocks": [
+                r["CidrIpv6"] for r in perm.get("Ipv6Ranges", []) if "CidrIpv6" in r
+            ],
+        }
+        for perm in group.get("IpPermissions", [])
+    ]
+    group_id = group["GroupId"]
+    return ResourceChange(
+        type="aws_security_group",
+        name=group_id,
+        address=f"aws_security_group.{group_id}",
+        actions=LIVE_ACTIONS,
+        after={
+            "id": group_id,
+            "name": group.get("GroupName"),
+            "vpc_id": group.get("VpcId"),
+            "ingress": ingress,
+        },
+    )
+
+
+@collector("security_groups", services=("ec2",), ttl=300)
+def collect_security_groups(ctx: CollectContext) -> list[ResourceChange]:
+    groups = _paginate(ctx.clients["ec2"], "describe_security_groups", "SecurityGroups")
+    return [security_group_resource(group) for group in groups]
+
+
+# ---------------------------------------------------------------------------
+# Fan-out
+# ---------------------------------------------------------------------------
+
+def collect(
+    role_arns: Sequence[str] = (),
+    regions: Sequence[str] = (),
+    collectors: Optional[Sequence[str]] = None,
+    session_for: Callable[[Optional[str]], Any] = open_session,
+    workers: int = DEFAULT_WORKERS,
+    config: Any = None,
+    store: Optional["SnapshotStore"] = None,
+    ttls: Optional[Mapping[str, float]] = None,
+    options: Optional[Mapping[str, Any]] = None,
+    now: Optional[datetime] = None,
+) -> Iterator[TargetResult]:
+    """Collect every account x region x collector; yield one result for each.
+
+    Each account in *role_arns* (empty: the current credentials) is opened
+    with ``session_for(role_arn)`` on the pool; account-wide collectors run
+    once per account and the others once per region in *regions* (empty:
+    the session's default region).  All jobs share one pool of *workers*
+    threads, so a slow region does not hold up the rest.  Results come out
+    by account, then collector, then region, as each becomes available.
+
+    A target that fails is yielded with its ``error`` set; the others are
+    unaffected.  With *store*, a target's snapshot younger than its TTL
+    (*ttls*, else the collector's default) is used instead of AWS, and
+    fetched inventory is saved.  The store is only touched from the thread
+    iterating this generator.
+
+    *config* is passed to every client (see :func:`client_config`) and
+    *options* to every collector (``iam_source``, ``iam_workers``).
+    """
+    selected = [COLLECTORS[name] for name in collectors] if collectors else list(COLLECTORS.values())
+    ttl = {c.name: c.ttl for c in selected}
+    ttl.update(ttls or {})
+    now = now or datetime.now(timezone.utc)
+    options = dict(options or {})
+
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        opened = [
+            (role_arn, pool.submit(
+                _open_account, role_arn, list(regions), selected, session_for, config
+            ))
+            for role_arn in (list(role_arns) or [None])
+        ]
+
+        jobs: list[tuple[LiveTarget, Optional[Future], Optional[TargetResult]]] = []
+        for role_arn, future in opened:
+            try:
+                account, contexts = future.result()
+            except Exception as exc:
+                target = LiveTarget(role_arn or "current", "*", "*")
+                jobs.append((target, None, TargetResult(target, [], error=str(exc))))
+                continue
+            for entry, region, clients in contexts:
+                target = LiveTarget(account, region, entry.name)
+                hit = store.get(target, ttl[entry.name]) if store is not None else None
+                if hit is not None:
+                    resources, fetched_at = hit
+                    jobs.append((target, None, TargetResult(
+                        target, resources, fetched_at=fetched_at, cached=True
+                    )))
+                    continue
+                ctx = CollectContext(account, region, clients, now, options)
+                jobs.append((target, pool.submit(lambda e=entry, c=ctx: list(e.fn(c))), None))
+
+        for target, future, result in jobs:
+            if result is None:
+                try:
+                    result = TargetResult(target, future.result(), fetched_at=now)
+                except Exception as exc:
+                    result = TargetResult(target, [], error=str(exc) or type(exc).__name__)
+                else:
+                    if store is not None:
+                        store.put(target, result.resources, now)
+            yield result
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def _open_account(
+    role_arn: Optional[str],
+    regions: list[str],
+    collectors: list[Collector],
+    session_for: Callable[[Optional[str]], Any],
+    config: Any,
+) -> tuple[str, list[tuple[Collector, str, dict[str, Any]]]]:
+    """Account id and, per collector and region, the clients it needs.
+
+    boto3 sessions are not thread-safe, so each account's clients are all
+    created here, on one worker thread; the clients themselves are.
+    """
+    session = session_for(role_arn)
+    if role_arn is None:
+        account = session.client("sts", config=config).get_caller_identity()["Account"]
+    else:
+        account = role_arn.split(":")[4]
+
+    contexts = []
+    for entry in collectors:
+        for region in (regions or [None]) if entry.per_region else [GLOBAL_REGION]:
+            region_name = None if region == GLOBAL_REGION else region
+            clients = {
+                service: session.client(service, region_name=region_name, config=config)
+                for service in entry.services
+            }
+            contexts.append((entry, region or session.region_name, clients))
+    return account, contexts
+
+
+# ---------------------------------------------------------------------------
+# Mock inventory
+# ---------------------------------------------------------------------------
+
+def mock_results(now: Optional[datetime] = None) -> Iterator[TargetResult]:
+    """A fixed inventory with one finding per built-in live check, for demos
+    and CI dry runs without AWS credentials."""
+    now = now or datetime.now(timezone.utc)
+    admin = _IamUser("test-admin", True, False, [now - timedelta(days=120)])
+    group = {
+        "GroupId": "sg-0123",
+        "IpPermissions": [
+            {"IpProtocol": "tcp", "FromPort": 22, "ToPort": 22,
+             "IpRanges": [{"CidrIp": "0.0.0.0/0"}]},
+        ],
+    }
+    yield TargetResult(
+        LiveTarget("mock", GLOBAL_REGION, "iam_users"),
+        [iam_user_resource(admin, now)],
+        fetched_at=now,
+    )
+    yield TargetResult(
+        LiveTarget("mock", "us-east-1", "security_groups"),
+        [security_group_resource(group)],
+        fetched_at=now,
+    )
@@ -0,0 +1,137 @@
+"""
+Network exposure engine for security-group style ingress rules.
+
+An :class:`ExposureMatcher` is built once per risky-port set.  It compiles
+the ports into a sorted array and the non-public address space into sorted
+integer intervals, so each rule is answered in one pass over its CIDRs
+instead of a literal ``"0.0.0.0/0" in cidr_blocks`` test per port.
+
+A CIDR counts as *open to the world* when it is at least as wide as
+``wide_prefixlen`` for its IP version and is not entirely inside private,
+loopback, link-local, documentation or multicast space.  By default that
+means spanning (about) the whole address space: a ``/1`` for IPv4 and a
+``/3`` for IPv6, the size of ``2000::/3``, which is all of global unicast.
+That catches ``0.0.0.0/0`` as well as equivalent spellings such as
+``0.0.0.0/1`` + ``128.0.0.0/1``, while a large public block such as
+``52.0.0.0/8`` is not "the world".  Stricter policies can opt in to a
+wider threshold, e.g. ``wide_prefixlen={4: 8, 6: 32}``.
+
+Usage::
+
+    from cloudsentry_cli.network import ExposureMatcher
+
+    ssh_rdp = ExposureMatcher(risky_ports=(22, 3389))
+    ssh_rdp.exposure({"from_port": 0, "to_port": 65535,
+                      "cidr_blocks": ["0.0.0.0/1"]})   # -> ([22, 3389], "0.0.0.0/1")
+"""
+
+from __future__ import annotations
+
+import ipaddress
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Optional
+
+# Narrowest prefix, per IP version, that still counts as "the world".
+DEFAULT_WIDE_PREFIXLEN = {4: 1, 6: 3}
+
+# Address space that is never reachable from the public internet.
+NON_PUBLIC_NETWORKS = (
+    "0.0.0.0/8", "10.0.0.0/8", "100.64.0.0/10", "127.0.0.0/8",
+    "169.254.0.0/16", "172.16.0.0/12", "192.0.2.0/24", "192.168.0.0/16",
+    "198.18.0.0/15", "198.51.100.0/24", "203.0.113.0/24", "224.0.0.0/4",
+    "240.0.0.0/4",
+    "::/128", "::1/128", "2001:db8::/32", "fc00::/7", "fe80::/10", "ff00::/8",
+)
+
+# Protocols whose rules are not port-scoped: "-1"/"all" opens every port,
+# ICMP rules use from_port/to_port for type/code and open no ports.
+_ALL_PROTOCOLS = frozenset({"-1", "all"})
+_ICMP_PROTOCOLS = frozenset({"icmp", "icmpv6", "1", "58"})
+
+_PORT_MIN = 0
+_PORT_MAX = 65535
+
+
+class ExposureMatcher:
+    """Precompiled "which risky ports does this rule open to the world?" query."""
+
+    def __init__(
+        self,
+        risky_ports: Iterable[int],
+        wide_prefixlen: Optional[Mapping[int, int]] = None,
+        non_public: Iterable[str] = NON_PUBLIC_NETWORKS,
+    ) -> None:
+        self._ports = tuple(sorted(set(risky_ports)))
+        self._wide_prefixlen = dict(wide_prefixlen or DEFAULT_WIDE_PREFIXLEN)
+        self._private: dict[int, tuple[list[int], list[int]]] = {}
+        for version in (4, 6):
+            spans = sorted(
+                (int(net.network_address), int(net.broadcast_address))
+                for net in map(ipaddress.ip_network, non_public)
+                if net.version == version
+            )
+            self._private[version] = ([s for s, _ in spans], [e for _, e in spans])
+
+    def exposed_ports(self, rule: Mapping[str, Any]) -> list[int]:
+        """Return the risky ports *rule* opens to the world, ascending."""
+        return self.exposure(rule)[0]
+
+    def exposure(self, rule: Mapping[str, Any]) -> tuple[list[int], Optional[str]]:
+        """The risky ports *rule* opens to the world and the CIDR that does so.
+
+        *rule* uses Terraform attribute names: ``from_port``, ``to_port``,
+        ``protocol``, ``cidr_blocks`` and ``ipv6_cidr_blocks``.  Returns
+        ``([], None)`` when nothing risky is exposed; otherwise the ports in
+        ascending order and the first world CIDR, as written in the rule.
+        """
+        ports = self._ports_in_range(rule)
+        if not ports:
+            return [], None
+        cidrs = list(rule.get("cidr_blocks") or ())
+        cidrs.extend(rule.get("ipv6_cidr_blocks") or ())
+        for cidr in cidrs:
+            if self.is_world(cidr):
+                return list(ports), cidr.strip()
+        return [], None
+
+    def is_world(self, cidr: str) -> bool:
+        """True if *cidr* is wide enough and public enough to mean "anyone"."""
+        parsed = _parse_cidr(cidr) if isinstance(cidr, str) else None
+        if parsed is None:
+            return False
+        version, prefixlen, first, last = parsed
+        if prefixlen > self._wide_prefixlen.get(version, -1):
+            return False
+        starts, ends = self._private[version]
+        i = bisect_right(starts, first) - 1
+        return not (i >= 0 and ends[i] >= last)
+
+    def _ports_in_range(self, rule: Mapping[str, Any]) -> tuple[int, ...]:
+        protocol = str(rule.get("protocol", "tcp")).lower()
+        if protocol in _ICMP_PROTOCOLS:
+            return ()
+        if protocol in _ALL_PROTOCOLS:
+            low, high = _PORT_MIN, _PORT_MAX
+        else:
+            try:
+                low = int(rule.get("from_port", -1))
+                high = int(rule.get("to_port", -1))
+            except (TypeError, ValueError):
+                return ()
+        return self._ports[bisect_left(self._ports, low):bisect_right(self._ports, high)]
+
+
+@lru_cache(maxsize=4096)
+def _parse_cidr(cidr: str) -> Optional[tuple[int, int, int, int]]:
+    """Normalize *cidr* to (version, prefixlen, first address, last address)."""
+    try:
+        net = ipaddress.ip_network(cidr.strip(), strict=False)
+    except ValueError:
+        return None
+    return (
+        net.version,
+        net.prefixlen,
+        int(net.network_address),
+        int(net.broadcast_address),
+    )
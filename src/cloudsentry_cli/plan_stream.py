@@ -0,0 +1,299 @@
+"""
+Streaming reader for Terraform plan JSON.
+
+``terraform show -json`` output for large monorepos runs into gigabytes, most
+of it in ``prior_state``, ``planned_values`` and ``configuration``.  The
+scanner only needs ``resource_changes[]``, so this module walks the document
+incrementally: every other top-level value is skipped without being decoded,
+and each ``resource_changes`` element is decoded on its own and projected to
+the few fields the checks use.
+
+Peak memory is bounded by the largest single resource change rather than by
+the size of the whole plan.
+
+Usage::
+
+    from cloudsentry_cli.plan_stream import iter_resource_changes
+
+    for rc in iter_resource_changes("tfplan.json"):
+        print(rc.address, rc.actions)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import re
+from pathlib import Path
+from typing import IO, Any, Iterator, Mapping, NamedTuple, Optional, Union
+
+# Size of each read from the plan file, in characters.
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRUCTURAL = re.compile(r'[{}\[\]"]')
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_SCALAR_END = re.compile(r"[,}\] \t\n\r]")
+_DECODER = json.JSONDecoder()
+
+# Anything a plan can be read from: a path, an open text or binary file, or
+# (scanner only) an already-parsed plan document.
+PlanSource = Union[str, "os.PathLike[str]", IO[str], IO[bytes], Mapping[str, Any]]
+
+
+class ResourceChange(NamedTuple):
+    """The subset of a ``resource_changes[]`` entry that checks need."""
+
+    type: str
+    name: str
+    address: str
+    actions: list[str]
+    after: Optional[dict[str, Any]]
+
+
+def project_resource_change(entry: dict[str, Any]) -> ResourceChange:
+    """Reduce a decoded ``resource_changes[]`` entry to a :class:`ResourceChange`."""
+    change = entry.get("change") or {}
+    return ResourceChange(
+        type=entry.get("type", ""),
+        name=entry.get("name", ""),
+        address=entry.get("address", ""),
+        actions=change.get("actions", []),
+        after=change.get("after"),
+    )
+
+
+def resource_address(rc: ResourceChange) -> str:
+    """The resource's plan address, or ``type.name`` when the plan omits it."""
+    return rc.address or f"{rc.type}.{rc.name}"
+
+
+def content_digest(resource_type: str, after: Optional[dict[str, Any]]) -> str:
+    """Hash of a resource's type and canonicalized ``change.after`` block.
+
+    Key order does not matter, so two plans rendering the same configuration
+    differently produce the same digest.
+    """
+    payload = json.dumps(
+        [resource_type, after],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def iter_resource_changes(
+    source: Union[str, "os.PathLike[str]", IO[str], IO[bytes]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[ResourceChange]:
+    """Yield every ``resource_changes[]`` entry of the plan in *source*.
+
+    *source* is a path or an open file (text or UTF-8 bytes, read from its
+    current position and left open).  Entries are yielded in plan order.
+    Top-level keys other than ``resource_changes`` are skipped without being
+    decoded; they are only checked for balanced brackets and terminated
+    strings.
+
+    Raises
+    ------
+    FileNotFoundError
+        If *source* is a path that does not exist.
+    ValueError
+        If the document is not a well-formed JSON object.
+    """
+    if hasattr(source, "read"):
+        yield from _iter_open_file(source, chunk_size)  # type: ignore[arg-type]
+        return
+    plan_path = Path(source)
+    if not plan_path.exists():
+        raise FileNotFoundError(f"Terraform plan file not found: {source}")
+    with plan_path.open(encoding="utf-8") as fh:
+        yield from _PlanReader(fh, chunk_size).resource_changes()
+
+
+def _iter_open_file(
+    fh: Union[IO[str], IO[bytes]],
+    chunk_size: int,
+) -> Iterator[ResourceChange]:
+    if not isinstance(fh.read(0), bytes):
+        yield from _PlanReader(fh, chunk_size).resource_changes()  # type: ignore[arg-type]
+        return
+    text = io.TextIOWrapper(fh, encoding="utf-8")  # type: ignore[arg-type]
+    try:
+        yield from _PlanReader(text, chunk_size).resource_changes()
+    finally:
+        # Detach so the caller's file is not closed along with the wrapper.
+        text.detach()
+
+
+# ---------------------------------------------------------------------------
+# Incremental reader
+# ---------------------------------------------------------------------------
+
+class _PlanReader:
+    """Pull-style tokenizer over a text stream with a sliding buffer.
+
+    ``_buf[_pos:]`` is the unconsumed input; consumed text is dropped on each
+    refill, so only the token being decoded is ever held in full.
+    """
+
+    def __init__(self, fh: IO[str], chunk_size: int) -> None:
+        self._fh = fh
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._offset = 0  # absolute offset of _buf[0] in the document
+        self._eof = False
+
+    # -- top-level walk -----------------------------------------------------
+
+    def resource_changes(self) -> Iterator[ResourceChange]:
+        self._expect("{")
+        first = True
+        while True:
+            if self._peek() == "}":
+                self._pos += 1
+                return
+            if not first:
+                self._expect(",")
+            first = False
+
+            key = self._read_key()
+            self._expect(":")
+            if key == "resource_changes" and self._peek() == "[":
+                yield from self._walk_array()
+            else:
+                self._skip_value()
+
+    def _walk_array(self) -> Iterator[ResourceChange]:
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            entry = self._read_value()
+            if isinstance(entry, dict):
+                yield project_resource_change(entry)
+            if self._peek() == "]":
+                self._pos += 1
+                return
+            self._expect(",")
+
+    def _read_key(self) -> str:
+        if self._peek() != '"':
+            self._error("expected object key")
+        return self._read_value()
+
+    def _read_value(self) -> Any:
+        """Decode the next value straight from the buffer.
+
+        A value cut off by the end of the buffer fails to decode; the buffer
+        is then extended and decoding retried from the same position.
+        """
+        self._skip_ws()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except ValueError as exc:
+                if self._fill():
+                    continue
+                self._error(f"invalid value ({exc.msg})")
+            # A number ending exactly at the buffer edge may be truncated.
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    # -- skipping -----------------------------------------------------------
+
+    def _skip_value(self) -> None:
+        ch = self._peek()
+        if ch == '"':
+            self._skip_string()
+        elif ch in "{[":
+            self._skip_container()
+        elif ch == "":
+            self._error("unexpected end of input")
+        else:
+            self._skip_scalar()
+
+    def _skip_container(self) -> None:
+        depth = 0
+        while True:
+            m = _STRUCTURAL.search(self._buf, self._pos)
+            if m is None:
+                # Nothing structural left in the buffer; none of it can be
+                # part of an unfinished token, so it is safe to consume.
+                self._pos = len(self._buf)
+                if not self._fill():
+                    self._error("unterminated object or array")
+                continue
+            ch = m.group()
+            if ch == '"':
+                self._pos = m.start()
+                self._skip_string()
+                continue
+            self._pos = m.end()
+            depth += 1 if ch in "{[" else -1
+            if depth == 0:
+                return
+
+    def _skip_string(self) -> None:
+        while True:
+            m = _STRING_TAIL.match(self._buf, self._pos + 1)
+            if m is not None:
+                self._pos = m.end()
+                return
+            if not self._fill():
+                self._error("unterminated string")
+
+    def _skip_scalar(self) -> None:
+        while True:
+            m = _SCALAR_END.search(self._buf, self._pos)
+            if m is not None:
+                self._pos = m.start()
+                return
+            if not self._fill():
+                self._pos = len(self._buf)
+                return
+
+    def _skip_ws(self) -> None:
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf) or not self._fill():
+                return
+
+    # -- buffer management --------------------------------------------------
+
+    def _fill(self) -> bool:
+        """Append another chunk to the buffer.  Returns False at EOF."""
+        if self._eof:
+            return False
+        self._offset += self._pos
+        tail = self._buf[self._pos:]
+        # Grow reads geometrically so a single huge token is not rescanned
+        # once per chunk.
+        chunk = self._fh.read(max(self._chunk_size, len(tail)))
+        if not chunk:
+            self._eof = True
+        self._buf = tail + chunk
+        self._pos = 0
+        return bool(chunk)
+
+    def _peek(self) -> str:
+        self._skip_ws()
+        return self._buf[self._pos:self._pos + 1]
+
+    def _expect(self, ch: str) -> None:
+        if self._peek() != ch:
+            self._error(f"expected {ch!r}")
+        self._pos += 1
+
+    def _error(self, message: str) -> None:
+        raise ValueError(
+            f"Malformed Terraform plan JSON at offset {self._offset + self._pos}: "
+            f"{message}"
+        )
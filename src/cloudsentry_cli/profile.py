@@ -0,0 +1,145 @@
+"""
+Scan profiling: where does the time go?
+
+A :class:`ScanProfile` records, for every check function, how often it ran,
+its cumulative and maximum wall time and the resources it was slowest on,
+plus the time spent in each scan stage:
+
+``load``
+    Reading the plan and projecting ``resource_changes`` (for streamed
+    plans, the time spent pulling each resource from the reader).
+``evaluate``
+    Running checks, summed over all checks (and worker processes).
+``report``
+    Handing findings to the report writer and writing the report (the
+    CLI fills this in; see ``cloudsentry_cli.cli``).
+
+Profiles are plain picklable objects, so each pool worker fills its own and
+the parent combines them with :meth:`ScanProfile.merge`.
+
+Usage::
+
+    from cloudsentry_cli.profile import ScanProfile
+    from cloudsentry_cli.scanner import scan_plan
+
+    profile = ScanProfile()
+    scan_plan("tfplan.json", profile=profile)
+    print(profile.to_dict()["checks"][0])
+"""
+
+from __future__ import annotations
+
+import heapq
+import time
+from typing import Any, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Slowest resources kept per check.
+SLOWEST_PER_CHECK = 5
+
+
+class CheckProfile:
+    """Timings of one check function."""
+
+    __slots__ = ("calls", "total", "max", "_slowest")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        # Min-heap of (seconds, address); the root is the first to drop out.
+        self._slowest: list[tuple[float, str]] = []
+
+    def record(self, seconds: float, address: str) -> None:
+        self.calls += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self._keep((seconds, address))
+
+    def merge(self, other: "CheckProfile") -> None:
+        self.calls += other.calls
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        for entry in other._slowest:
+            self._keep(entry)
+
+    def slowest(self) -> list[tuple[float, str]]:
+        """``(seconds, address)`` pairs, slowest first."""
+        return sorted(self._slowest, reverse=True)
+
+    def _keep(self, entry: tuple[float, str]) -> None:
+        if len(self._slowest) < SLOWEST_PER_CHECK:
+            heapq.heappush(self._slowest, entry)
+        elif entry > self._slowest[0]:
+            heapq.heapreplace(self._slowest, entry)
+
+
+class ScanProfile:
+    """Per-check and per-stage timings collected during a scan."""
+
+    def __init__(self) -> None:
+        self.checks: dict[str, CheckProfile] = {}
+        self.stages: dict[str, float] = {"load": 0.0, "evaluate": 0.0, "report": 0.0}
+
+    def record_check(self, name: str, seconds: float, address: str) -> None:
+        check = self.checks.get(name)
+        if check is None:
+            check = self.checks[name] = CheckProfile()
+        check.record(seconds, address)
+        self.stages["evaluate"] += seconds
+
+    def add_stage(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def timed(self, items: Iterable[T], stage: str) -> Iterator[T]:
+        """Yield from *items*, charging the time spent producing them to *stage*."""
+        it = iter(items)
+        clock = time.perf_counter
+        while True:
+            start = clock()
+            try:
+                item = next(it)
+            except StopIteration:
+                self.add_stage(stage, clock() - start)
+                return
+            self.add_stage(stage, clock() - start)
+            yield item
+
+    def merge(self, other: "ScanProfile") -> None:
+        for name, check in other.checks.items():
+            mine = self.checks.get(name)
+            if mine is None:
+                mine = self.checks[name] = CheckProfile()
+            mine.merge(check)
+        for stage, seconds in other.stages.items():
+            self.add_stage(stage, seconds)
+
+    def ranked_checks(self) -> list[tuple[str, CheckProfile]]:
+        """Checks by cumulative time, most expensive first."""
+        return sorted(self.checks.items(), key=lambda item: -item[1].total)
+
+    def to_dict(self) -> dict[str, Any]:
+        """The report's ``profile`` section."""
+        return {
+            "stages": {stage: round(s, 6) for stage, s in self.stages.items()},
+            "checks": [
+                {
+                    "check": name,
+                    "calls": check.calls,
+                    "total_seconds": round(check.total, 6),
+                    "max_seconds": round(check.max, 6),
+                    "slowest": [
+                        {"resource": address, "seconds": round(seconds, 6)}
+                        for seconds, address in check.slowest()
+                    ],
+                }
+                for name, check in self.ranked_checks()
+            ],
+        }
+
+
+def check_name(fn: Any) -> str:
+    """Display name of a check function, e.g. ``check_s3_public_acl``."""
+    return getattr(fn, "__qualname__", None) or repr(fn)
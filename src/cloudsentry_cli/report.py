@@ -0,0 +1,282 @@
+"""
+Report writers for ``cloudsentry-cli scan``.
+
+Findings are handed to a writer one at a time as the scanner produces them,
+and the report metadata (tool, version, summary, ...) is passed to
+``close()`` once the scan is done.  Writers turn each
+:class:`~cloudsentry_cli.findings.Finding` into its dict form only as it is
+serialized.
+
+``json``
+    Today's single-document report.  Findings are buffered, because the
+    document is written in one piece with ``indent=2``.
+``ndjson``
+    One JSON object per line, written as each finding arrives, followed by a
+    trailing ``{"record": "summary", ...}`` line holding the metadata.  Memory
+    use does not grow with the number of findings.  Lines go to a hidden
+    temporary file next to the report, which replaces it on ``close()``, so
+    an aborted scan leaves any previous report in place.  In batch mode every
+    finding line carries the ``input`` plan it came from and each plan ends
+    with a ``{"record": "plan", ...}`` line.
+``compact``
+    Like ``json``, but each rule's static text is stored once in a ``rules``
+    table and findings reference it as ``[resource, rule_id, params]``
+    arrays (``params`` is omitted when empty).  Findings that do not come
+    from a :class:`~cloudsentry_cli.checks.Rule` are kept as full dicts.
+
+:func:`read_report` loads a report in any of these formats and returns it
+in the ``json`` layout, so downstream tooling only needs to handle one
+schema.
+
+Usage::
+
+    from cloudsentry_cli.report import open_report_writer
+
+    writer = open_report_writer("ndjson", "report.ndjson")
+    for finding in findings:
+        writer.write_finding(finding)
+    writer.close({"tool": "cloudsentry-cli", "summary": {...}})
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import IO, Any, Callable, Optional, Union
+
+from cloudsentry_cli.checks import RULES, Rule
+from cloudsentry_cli.findings import Finding, Severity
+
+REPORT_FORMATS = ("json", "ndjson", "compact")
+
+
+class JsonReportWriter:
+    """Buffer findings and write the classic indented JSON report on close."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self._findings: list[Finding] = []
+        self._plans: list[dict[str, Any]] = []
+
+    def write_finding(self, finding: Finding) -> None:
+        self._findings.append(finding)
+
+    def write_plan(self, plan: dict[str, Any]) -> None:
+        """Record one batch-mode plan entry (``input``, ``summary``, ``findings``)."""
+        self._plans.append(plan)
+
+    def close(self, report: dict[str, Any]) -> None:
+        report = dict(report)
+        if self._plans:
+            report["plans"] = [
+                _map_plan_findings(plan, Finding.to_dict) for plan in self._plans
+            ]
+        else:
+            report["findings"] = [f.to_dict() for f in self._findings]
+        self.path.write_text(json.dumps(report, indent=2))
+
+    def abort(self) -> None:
+        """Discard the report; nothing has been written yet."""
+
+
+class NdjsonReportWriter:
+    """Write each finding as one line the moment it is produced."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self._tmp = self.path.with_name(f".{self.path.name}.tmp")
+        self._fh: IO[str] = self._tmp.open("w", encoding="utf-8")
+
+    def write_finding(self, finding: Finding) -> None:
+        self._write_record(finding.to_dict())
+
+    def write_plan(self, plan: dict[str, Any]) -> None:
+        """Write a batch-mode plan's findings, then its ``plan`` record."""
+        for finding in plan.get("findings", ()):
+            self._write_record({"input": plan["input"], **finding.to_dict()})
+        self._write_record({
+            "record": "plan",
+            **{k: v for k, v in plan.items() if k != "findings"},
+        })
+
+    def close(self, report: dict[str, Any]) -> None:
+        self._write_record({"record": "summary", **report})
+        self._fh.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self) -> None:
+        """Stop writing and discard the partial report."""
+        self._fh.close()
+        self._tmp.unlink(missing_ok=True)
+
+    def _write_record(self, record: dict[str, Any]) -> None:
+        self._fh.write(json.dumps(record, separators=(",", ":")))
+        self._fh.write("\n")
+
+
+class CompactReportWriter(JsonReportWriter):
+    """Buffer findings and write them against an interned rule table."""
+
+    def close(self, report: dict[str, Any]) -> None:
+        rules: dict[str, Rule] = {}
+        compact = {"format": "compact", **report}
+        if self._plans:
+            compact["plans"] = [
+                _map_plan_findings(plan, lambda f: _compact_finding(f, rules))
+                for plan in self._plans
+            ]
+        else:
+            compact["findings"] = [
+                _compact_finding(f, rules) for f in self._findings
+            ]
+        compact["rules"] = {
+            rule_id: {
+                "severity": rule.severity.name,
+                "issue": rule.issue,
+                "recommendation": rule.recommendation,
+            }
+            for rule_id, rule in sorted(rules.items())
+        }
+        self.path.write_text(json.dumps(compact, separators=(",", ":")))
+
+
+ReportWriter = Union[JsonReportWriter, NdjsonReportWriter, CompactReportWriter]
+
+
+def open_report_writer(fmt: str, path: str) -> ReportWriter:
+    """Return the writer for report format *fmt* (one of :data:`REPORT_FORMATS`)."""
+    if fmt == "ndjson":
+        return NdjsonReportWriter(path)
+    if fmt == "json":
+        return JsonReportWriter(path)
+    if fmt == "compact":
+        return CompactReportWriter(path)
+    raise ValueError(f"Unknown report format: {fmt}")
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+def read_report(path: str) -> dict[str, Any]:
+    """Load a report written in any of :data:`REPORT_FORMATS`.
+
+    The result always has the ``json`` layout: metadata keys plus either
+    ``findings`` or, for batch scans, ``plans``.
+
+    Raises
+    ------
+    FileNotFoundError
+        If *path* does not exist.
+    ValueError
+        If the file is not a cloudsentry-cli report.
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    try:
+        document = json.loads(text)
+    except ValueError:
+        # More than one JSON value: an ndjson stream.
+        return _read_ndjson(text.splitlines(), path)
+    if not isinstance(document, dict):
+        raise ValueError(f"{path}: not a cloudsentry-cli report")
+    if document.get("record") == "summary":
+        # An ndjson report of a scan that found nothing.
+        return _read_ndjson([text], path)
+    if document.get("format") == "compact":
+        return expand_compact(document)
+    return document
+
+
+def expand_compact(report: dict[str, Any]) -> dict[str, Any]:
+    """Turn a ``compact`` report back into the ``json`` layout."""
+    rules = {
+        rule_id: Rule(
+            rule_id,
+            Severity.parse(entry["severity"]),
+            entry["issue"],
+            entry["recommendation"],
+        )
+        for rule_id, entry in report.get("rules", {}).items()
+    }
+    expanded = {
+        k: v for k, v in report.items() if k not in ("format", "rules")
+    }
+    if "plans" in expanded:
+        expanded["plans"] = [
+            _map_plan_findings(plan, lambda f: _expand_finding(f, rules))
+            for plan in expanded["plans"]
+        ]
+    else:
+        expanded["findings"] = [
+            _expand_finding(f, rules) for f in expanded.get("findings", ())
+        ]
+    return expanded
+
+
+def _map_plan_findings(plan: dict[str, Any], fn: Callable[[Any], Any]) -> dict[str, Any]:
+    """Copy of a batch *plan* entry with *fn* applied to each finding.
+
+    Entries for plans that failed to load have no ``findings`` key.
+    """
+    if "findings" not in plan:
+        return plan
+    return {**plan, "findings": [fn(f) for f in plan["findings"]]}
+
+
+def _compact_finding(
+    finding: Finding,
+    rules: dict[str, Rule],
+) -> Union[list[Any], dict[str, Any]]:
+    """Reference form of *finding*, or its full dict if it has no rule.
+
+    The finding is only compacted if expanding it again reproduces it
+    exactly, so the round trip is lossless.
+    """
+    rule: Optional[Rule] = RULES.get(finding.rule_id or "")
+    if rule is None or rule.finding(finding.resource, **finding.params) != finding:
+        return finding.to_dict()
+    rules[rule.id] = rule
+    if finding.params:
+        return [finding.resource, rule.id, finding.params]
+    return [finding.resource, rule.id]
+
+
+def _expand_finding(
+    entry: Union[list[Any], dict[str, Any]],
+    rules: dict[str, Rule],
+) -> dict[str, Any]:
+    if isinstance(entry, dict):
+        return entry
+    resource, rule_id, *rest = entry
+    params = rest[0] if rest else {}
+    return rules[rule_id].finding(resource, **params).to_dict()
+
+
+def _read_ndjson(lines: list[str], path: str) -> dict[str, Any]:
+    findings: list[dict[str, Any]] = []
+    plans: list[dict[str, Any]] = []
+    pending: dict[str, list[dict[str, Any]]] = {}
+    summary: Optional[dict[str, Any]] = None
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        kind = record.pop("record", None)
+        if kind == "summary":
+            summary = record
+        elif kind == "plan":
+            if "error" not in record:
+                record["findings"] = pending.pop(record["input"], [])
+            plans.append(record)
+        elif "input" in record:
+            pending.setdefault(record.pop("input"), []).append(record)
+        else:
+            findings.append(record)
+    if summary is None:
+        raise ValueError(f"{path}: report has no summary record (scan aborted?)")
+    if plans:
+        summary["plans"] = plans
+    else:
+        summary["findings"] = findings
+    return summary
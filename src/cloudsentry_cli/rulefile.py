@@ -0,0 +1,356 @@
+"""
+Declarative attribute rules loaded from JSON or YAML files.
+
+Each rule states a requirement on one attribute of ``change.after``; a
+resource that does not meet it produces a finding::
+
+    rules:
+      - id: CS-RDS-001
+        resource_types: [aws_db_instance]
+        attribute: storage_encrypted
+        equals: true
+        severity: HIGH
+        issue: RDS instance storage is not encrypted
+        recommendation: Set storage_encrypted = true.
+
+``attribute`` is a dotted path; numeric segments index into lists, e.g.
+``server_side_encryption_configuration.0.rule.0.bucket_key_enabled``.
+Exactly one operator is required:
+
+========================  ====================================================
+``equals: V``             attribute must equal V (booleans compare strictly)
+``not_equals: V``         attribute must not equal V (missing passes)
+``one_of: [V, ...]``      attribute must be one of the values
+``not_one_of: [V, ...]``  attribute must be none of the values (missing passes)
+``present: true|false``   attribute must be set (non-null) / must be unset
+========================  ====================================================
+
+Rules are compiled into closures with the attribute path and operator baked
+in, and registered alongside :data:`cloudsentry_cli.checks.CHECKS`.
+
+Parsing and validating a large rule file (YAML especially) is the slow part
+of loading, so the validated form is cached as JSON in *cache_dir*, keyed by
+the SHA-256 of the file's bytes.  Closures themselves cannot be persisted;
+rebuilding them from the cached form is cheap.
+
+YAML files need the optional PyYAML dependency
+(``pip install cloudsentry-cli[yaml]``); JSON works out of the box.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Sequence
+
+from cloudsentry_cli import checks
+from cloudsentry_cli.checks import CheckFn, define_rule, register_checks, reset_checks
+from cloudsentry_cli.findings import Finding, Severity
+
+SEVERITIES = tuple(s.name for s in Severity)
+OPERATORS = ("equals", "not_equals", "one_of", "not_one_of", "present")
+
+# Bump when the cached (validated) representation changes.
+_CACHE_FORMAT = 1
+
+# Rule files already registered in this process, so repeated loads (and
+# pool workers that inherited the registry by forking) do not duplicate them,
+# mapped to the cache dir they were loaded with.
+_loaded_files: dict[str, Optional[Path]] = {}
+
+
+def default_cache_dir() -> Path:
+    """``$XDG_CACHE_HOME/cloudsentry/rules`` (``~/.cache/...`` by default)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "cloudsentry" / "rules"
+
+
+def load_rule_file(
+    path: str,
+    cache_dir: Optional[Path] = None,
+) -> list[CheckFn]:
+    """Load *path* and return one compiled check function per rule.
+
+    Raises
+    ------
+    FileNotFoundError
+        If *path* does not exist.
+    ValueError
+        If the file cannot be parsed or a rule is invalid.
+    """
+    rule_path = Path(path)
+    if not rule_path.exists():
+        raise FileNotFoundError(f"Rule file not found: {path}")
+    raw = rule_path.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+
+    cache_file = (cache_dir or default_cache_dir()) / f"{digest}.json"
+    specs = _read_cached(cache_file)
+    if specs is None:
+        specs = [
+            _validate(rule, path)
+            for rule in _parse(raw, rule_path.suffix.lower(), path)
+        ]
+        ids = [spec["id"] for spec in specs]
+        duplicates = sorted({i for i in ids if ids.count(i) > 1})
+        if duplicates:
+            raise ValueError(f"{path}: duplicate rule id(s) {', '.join(duplicates)}")
+        _write_cached(cache_file, specs)
+
+    return [_compile(spec) for spec in specs]
+
+
+def register_rule_files(
+    paths: Sequence[str],
+    cache_dir: Optional[Path] = None,
+) -> int:
+    """Load every file in *paths* and register its rules.  Returns the count.
+
+    Files registered earlier in this process are skipped.
+    """
+    new_checks: list[CheckFn] = []
+    for path in paths:
+        key = str(Path(path).resolve())
+        if key in _loaded_files:
+            continue
+        new_checks.extend(load_rule_file(path, cache_dir))
+        _loaded_files[key] = cache_dir
+    if new_checks:
+        register_checks(new_checks)
+    return len(new_checks)
+
+
+def loaded_rule_files() -> list[tuple[str, Optional[Path]]]:
+    """``(path, cache_dir)`` of every rule file registered so far."""
+    return list(_loaded_files.items())
+
+
+def register_loaded_rule_files(files: Sequence[tuple[str, Optional[Path]]]) -> None:
+    """Process-pool initializer: register *files*, as returned by
+    :func:`loaded_rule_files`, so spawned workers see the same rules and
+    read them from the same cache."""
+    for path, cache_dir in files:
+        register_rule_files([path], cache_dir)
+
+
+@contextmanager
+def rule_file_scope() -> Iterator[None]:
+    """Unregister, on exit, every rule file registered inside the block.
+
+    For long-lived processes (``cloudsentry-cli serve`` workers) where each
+    request brings its own ``--rules`` and must not see another's.
+    """
+    loaded = dict(_loaded_files)
+    check_fns = list(checks.CHECKS)
+    rules = dict(checks.RULES)
+    try:
+        yield
+    finally:
+        if _loaded_files != loaded:
+            _loaded_files.clear()
+            _loaded_files.update(loaded)
+            checks.RULES.clear()
+            checks.RULES.update(rules)
+            reset_checks(check_fns)
+
+
+# ---------------------------------------------------------------------------
+# Parsing and validation
+# ---------------------------------------------------------------------------
+
+def _parse(raw: bytes, suffix: str, path: str) -> list[Any]:
+    if suffix in (".yml", ".yaml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError(
+                f"{path}: PyYAML is required for YAML rule files "
+                "(pip install cloudsentry-cli[yaml])"
+            ) from None
+        try:
+            document = yaml.safe_load(raw)
+        except yaml.YAMLError as exc:
+            raise ValueError(f"{path}: invalid YAML ({exc})") from None
+    else:
+        try:
+            document = json.loads(raw)
+        except ValueError as exc:
+            raise ValueError(f"{path}: invalid JSON ({exc})") from None
+
+    rules = document.get("rules") if isinstance(document, dict) else document
+    if not isinstance(rules, list):
+        raise ValueError(f"{path}: expected a 'rules' list")
+    return rules
+
+
+def _validate(rule: Any, path: str) -> dict[str, Any]:
+    """Check one raw rule and return its normalized (cacheable) form."""
+    if not isinstance(rule, dict):
+        raise ValueError(f"{path}: every rule must be a mapping")
+    rule_id = rule.get("id")
+    where = f"{path}: rule {rule_id!r}"
+    if not isinstance(rule_id, str) or not rule_id:
+        raise ValueError(f"{path}: every rule needs a string 'id'")
+
+    types = rule.get("resource_types", rule.get("resource_type"))
+    if isinstance(types, str):
+        types = [types]
+    if (
+        not isinstance(types, list)
+        or not types
+        or not all(isinstance(t, str) for t in types)
+    ):
+        raise ValueError(f"{where}: 'resource_types' must list resource types")
+
+    attribute = rule.get("attribute")
+    if not isinstance(attribute, str) or not attribute:
+        raise ValueError(f"{where}: 'attribute' must be a dotted path")
+
+    operators = [op for op in OPERATORS if op in rule]
+    if len(operators) != 1:
+        raise ValueError(
+            f"{where}: exactly one of {', '.join(OPERATORS)} is required"
+        )
+    operator = operators[0]
+    operand = rule[operator]
+    if operator in ("one_of", "not_one_of") and not isinstance(operand, list):
+        raise ValueError(f"{where}: '{operator}' takes a list")
+    if operator == "present" and not isinstance(operand, bool):
+        raise ValueError(f"{where}: 'present' takes true or false")
+
+    severity = str(rule.get("severity", "")).upper()
+    if severity not in SEVERITIES:
+        raise ValueError(f"{where}: 'severity' must be one of {', '.join(SEVERITIES)}")
+
+    for field in ("issue", "recommendation"):
+        if not isinstance(rule.get(field), str):
+            raise ValueError(f"{where}: '{field}' text is required")
+
+    return {
+        "id": rule_id,
+        "resource_types": sorted(set(types)),
+        "path": [int(p) if p.isdigit() else p for p in attribute.split(".")],
+        "operator": operator,
+        "operand": operand,
+        "severity": severity,
+        "issue": rule["issue"],
+        "recommendation": rule["recommendation"],
+    }
+
+
+def _read_cached(cache_file: Path) -> Optional[list[dict[str, Any]]]:
+    try:
+        cached = json.loads(cache_file.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("format") != _CACHE_FORMAT:
+        return None
+    return cached.get("rules")
+
+
+def _write_cached(cache_file: Path, specs: list[dict[str, Any]]) -> None:
+    """Best effort: an unwritable cache directory only costs a re-parse."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"format": _CACHE_FORMAT, "rules": specs}))
+        tmp.replace(cache_file)
+    except OSError:
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Compilation
+# ---------------------------------------------------------------------------
+
+_MISSING = object()
+
+
+def _compile(spec: dict[str, Any]) -> CheckFn:
+    """Build a check function specialized for one normalized rule."""
+    get = _compile_getter(spec["path"])
+    passes = _compile_predicate(spec["operator"], spec["operand"])
+    rule = define_rule(
+        spec["id"],
+        severity=spec["severity"],
+        issue=spec["issue"],
+        recommendation=spec["recommendation"],
+    )
+
+    def check(
+        resource_type: str,
+        resource_name: str,
+        after: dict[str, Any],
+    ) -> list[Finding]:
+        if passes(get(after)):
+            return []
+        return [rule.finding(f"{resource_type}.{resource_name}")]
+
+    check.__name__ = check.__qualname__ = f"rule[{spec['id']}]"
+    check.resource_types = frozenset(spec["resource_types"])  # type: ignore[attr-defined]
+    check.rule_id = spec["id"]  # type: ignore[attr-defined]
+    check.rules = (rule,)  # type: ignore[attr-defined]
+    # Cache identity: changes whenever the rule's definition changes.
+    check.version = hashlib.sha256(  # type: ignore[attr-defined]
+        json.dumps(spec, sort_keys=True).encode()
+    ).hexdigest()[:16]
+    return check
+
+
+def _compile_getter(path: Sequence[Any]) -> Callable[[Any], Any]:
+    """Return a function that walks *path*, yielding _MISSING when absent."""
+    if len(path) == 1 and isinstance(path[0], str):
+        key = path[0]
+
+        def get_one(after: Any) -> Any:
+            value = after.get(key, _MISSING)
+            return _MISSING if value is None else value
+        return get_one
+
+    steps = tuple(path)
+
+    def get_path(after: Any) -> Any:
+        node = after
+        for step in steps:
+            if isinstance(step, int):
+                if not isinstance(node, list) or step >= len(node):
+                    return _MISSING
+                node = node[step]
+            else:
+                if not isinstance(node, dict):
+                    return _MISSING
+                node = node.get(step)
+            if node is None:
+                return _MISSING
+        return node
+    return get_path
+
+
+def _compile_predicate(operator: str, operand: Any) -> Callable[[Any], bool]:
+    if operator == "present":
+        if operand:
+            return lambda value: value is not _MISSING
+        return lambda value: value is _MISSING
+
+    if operator in ("equals", "not_equals"):
+        if isinstance(operand, bool):
+            matches: Callable[[Any], bool] = lambda value: value is operand
+        else:
+            matches = lambda value: value == operand and not isinstance(value, bool)
+    else:
+        options = list(operand)
+        matches = lambda value: any(_same(value, o) for o in options)
+
+    if operator in ("equals", "one_of"):
+        return matches
+    return lambda value: value is _MISSING or not matches(value)
+
+
+def _same(value: Any, expected: Any) -> bool:
+    if isinstance(expected, bool) or isinstance(value, bool):
+        return value is expected
+    return value == expected
+
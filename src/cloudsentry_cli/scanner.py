@@ -1,72 +1,789 @@
 """
 Terraform plan JSON scanner.
 
-Reads the JSON produced by ``terraform show -json plan.out`` and runs all
-registered security checks against every resource's ``change.after`` block.
+Reads the JSON produced by ``terraform show -json plan.out`` and runs the
+registered security checks that apply to each resource's type against its
+``change.after`` block.
 
 Usage::
 
     from cloudsentry_cli.scanner import scan_plan
 
     findings = scan_plan("tfplan.json")
+
+    # Large plans: walk resource_changes[] incrementally instead of loading
+    # the whole document into memory.
+    findings = scan_plan("tfplan.json", stream=True)
+
+    # Force a JSON backend (default: the fastest installed one).
+    findings = scan_plan("tfplan.json", decoder="json")
+
+    # Only resources added or changed since a previous plan.
+    findings = scan_plan("new.json", baseline=load_baseline("old.json"))
+
+    # Pre-merge gate: stop at the first HIGH or CRITICAL finding.
+    findings = scan_plan("tfplan.json", fail_at=Severity.HIGH)
+
+    # Lazily, from an open file or an already-parsed plan; only the
+    # resources needed for the first ten findings are evaluated.
+    with open("tfplan.json", "rb") as fh:
+        first_ten = list(islice(iter_findings(fh, stream=True), 10))
+    for finding in iter_findings(parsed_plan):
+        queue.put(finding)
+
+    # count/for_each instances with identical change.after blocks are
+    # evaluated once and their findings shared (see ScanStats.deduplicated).
+
+    # Many plans at once, spread over a process pool.
+    for result in scan_plans(["a/tfplan.json", "b/tfplan.json"]):
+        print(result.input, len(result.findings), result.error)
 """
 
 from __future__ import annotations
 
-import json
+import marshal
+import math
+import os
+import sqlite3
+import time
+from collections import deque
+from dataclasses import dataclass
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+from cloudsentry_cli.cache import (
+    DEFAULT_MAX_BYTES,
+    FindingsCache,
+    cache_key,
+    checks_fingerprint,
+)
+from cloudsentry_cli.checks import checks_for
+from cloudsentry_cli.decoders import AUTO, get_decoder, load_json
+from cloudsentry_cli.findings import Finding, Severity
+from cloudsentry_cli.plan_stream import (
+    PlanSource,
+    ResourceChange,
+    content_digest,
+    iter_resource_changes,
+    project_resource_change,
+    resource_address,
+)
+from cloudsentry_cli.profile import ScanProfile, check_name
+from cloudsentry_cli.rulefile import loaded_rule_files, register_loaded_rule_files
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+# Resources per work unit when evaluating one plan across processes.
+PARALLEL_CHUNK_SIZE = 500
+
+# Distinct count/for_each instance contents remembered per plan; instances
+# beyond this many distinct groups are evaluated individually.
+DEDUP_MAX_GROUPS = 10_000
+
+# cgroup v2 CPU quota of this process's cgroup: "<quota> <period>" or "max <period>".
+CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+
 
-from cloudsentry_cli.checks import CHECKS
+@dataclass
+class ScanStats:
+    """Counters collected while scanning one plan."""
 
+    resources: int = 0
+    unchanged: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    # Set when a fail-fast scan stopped at a blocking finding.
+    stopped_early: bool = False
+    # JSON backend that decoded the plan; None for streamed or parsed input.
+    decoder: Optional[str] = None
+    # Resources whose checks ran (or whose findings came from the cache) ...
+    evaluated: int = 0
+    # ... and count/for_each instances that reused the findings of an
+    # identical instance evaluated earlier in the same plan.
+    deduplicated: int = 0
 
-def scan_plan(input_path: str) -> list[dict[str, Any]]:
-    """Parse *input_path* (Terraform plan JSON) and return all findings.
+
+def scan_plan(
+    source: PlanSource,
+    stream: bool = False,
+    jobs: int = 1,
+    cache: Optional[FindingsCache] = None,
+    baseline: Optional[Mapping[str, str]] = None,
+    stats: Optional[ScanStats] = None,
+    fail_at: Optional[Severity] = None,
+    profile: Optional[ScanProfile] = None,
+    decoder: str = AUTO,
+) -> list[Finding]:
+    """Parse *source* (Terraform plan JSON) and return all findings.
+
+    A thin ``list()`` over :func:`iter_findings`.
 
     Parameters
     ----------
-    input_path:
-        Path to a Terraform plan JSON file generated by
-        ``terraform show -json plan.out``.
+    source:
+        The plan generated by ``terraform show -json plan.out``: a path, an
+        open text or binary file, or the already-parsed document.
+    stream:
+        When True, parse the plan incrementally so memory is bounded by the
+        largest single resource change instead of the whole document.  Slower
+        than the default on small plans.
+    jobs:
+        Number of worker processes.  Above 1, active resource changes are
+        split into chunks of :data:`PARALLEL_CHUNK_SIZE` that are evaluated in
+        a process pool; findings are merged back in plan order, so the result
+        is identical to a serial scan.
+    cache:
+        Optional :class:`~cloudsentry_cli.cache.FindingsCache`.  Resources
+        whose content and applicable checks are unchanged since they were
+        cached are not re-evaluated.
+    baseline:
+        Optional address → content-digest index of a previous plan, as built
+        by :func:`load_baseline`.  Only resources that are new or whose
+        ``change.after`` differs from the baseline are evaluated.
+    stats:
+        Optional :class:`ScanStats` that is filled in during the scan.
+    fail_at:
+        Fail-fast threshold.  Only checks that can produce a finding of this
+        severity or above are run, most severe first, and the scan stops
+        right after the first such finding (``stats.stopped_early`` is set).
+        The result is therefore partial.  Findings served from *cache* are
+        not filtered; fresh results are not written back to it.
+    profile:
+        Optional :class:`~cloudsentry_cli.profile.ScanProfile` that receives
+        per-check timings (also from pool workers) and the load stage time.
+    decoder:
+        JSON backend for non-streamed loads, one of
+        :data:`~cloudsentry_cli.decoders.DECODER_CHOICES`.  ``auto`` uses the
+        fastest installed one; ``stats.decoder`` records which.
+
+    Instances of a ``count``/``for_each`` resource whose type and
+    ``change.after`` are identical are evaluated once; the others get the
+    same findings (``stats.evaluated`` vs ``stats.deduplicated``).
 
     Returns
     -------
-    list[dict]
+    list[Finding]
         Every finding produced by all registered checks.  An empty list means
         no issues were detected.
     """
-    plan = _load_plan(input_path)
-    findings: list[dict[str, Any]] = []
+    return list(iter_findings(
+        source,
+        stream=stream,
+        jobs=jobs,
+        cache=cache,
+        baseline=baseline,
+        stats=stats,
+        fail_at=fail_at,
+        profile=profile,
+        decoder=decoder,
+    ))
 
-    for change_entry in plan.get("resource_changes", []):
-        resource_type: str = change_entry.get("type", "")
-        resource_name: str = change_entry.get("name", "")
-        change: dict[str, Any] = change_entry.get("change", {})
-        actions: list[str] = change.get("actions", [])
 
-        # Only evaluate resources being created or updated (not deleted/no-ops)
-        if not _is_active_change(actions):
-            continue
+def iter_findings(
+    source: PlanSource,
+    stream: bool = False,
+    jobs: int = 1,
+    cache: Optional[FindingsCache] = None,
+    baseline: Optional[Mapping[str, str]] = None,
+    stats: Optional[ScanStats] = None,
+    fail_at: Optional[Severity] = None,
+    profile: Optional[ScanProfile] = None,
+    decoder: str = AUTO,
+) -> Iterator[Finding]:
+    """Yield the findings for *source* lazily, in plan order.
 
-        after: dict[str, Any] = change.get("after") or {}
+    Takes the same arguments as :func:`scan_plan`.  Resources are evaluated
+    only as findings are consumed (a chunk at a time), so taking the first
+    few findings or feeding a queue does not scan the whole plan.  The plan
+    is only opened once iteration starts, so load errors surface from the
+    first ``next()``.
+    """
+    if stats is None:
+        stats = ScanStats()
+    if not stream and not isinstance(source, Mapping):
+        stats.decoder = get_decoder(decoder).name
+    if profile is None:
+        changes = _resource_changes(source, stream, decoder)
+    else:
+        start = time.perf_counter()
+        changes = _resource_changes(source, stream, decoder)
+        profile.add_stage("load", time.perf_counter() - start)
+        changes = profile.timed(changes, "load")
+    active = _active_changes(changes, stats)
+    if baseline is not None:
+        active = _changed_since(active, baseline, stats)
+    evaluate = partial(_parallel_map, jobs=jobs) if jobs > 1 else map
+    if profile is not None:
+        evaluate = partial(_evaluate_profiled, evaluate, profile=profile)
 
-        for check_fn in CHECKS:
-            findings.extend(check_fn(resource_type, resource_name, after))
+    if cache is None:
+        evaluate_each = partial(_evaluate_uncached, evaluate=evaluate, fail_at=fail_at)
+    else:
+        evaluate_each = partial(
+            _evaluate_cached, cache=cache, evaluate=evaluate, stats=stats, fail_at=fail_at
+        )
+    batches = _evaluate_unique(active, evaluate_each, stats)
+    try:
+        for batch in batches:
+            for finding in batch:
+                yield finding
+                if fail_at is not None and finding.severity >= fail_at:
+                    stats.stopped_early = True
+                    return
+    finally:
+        # Stops (and, with jobs > 1, cancels) the remaining evaluation.
+        _close(batches)
+
+
+def evaluate_resources(
+    resources: Iterable[ResourceChange],
+    fail_at: Optional[Severity] = None,
+    profile: Optional[ScanProfile] = None,
+) -> Iterator[Finding]:
+    """Yield the findings of every resource in *resources*, in order.
+
+    For resources that do not come from a plan, such as the live inventory
+    of :mod:`cloudsentry_cli.live`: every resource is evaluated, whatever
+    its ``actions``.  *fail_at* and *profile* work as in :func:`scan_plan`.
+    """
+    for rc in resources:
+        for finding in _evaluate_resource(rc, fail_at, profile):
+            yield finding
+            if fail_at is not None and finding.severity >= fail_at:
+                return
+
+
+def active_resource_changes(
+    source: PlanSource,
+    stream: bool = False,
+    decoder: str = AUTO,
+    use_mmap: bool = True,
+) -> Iterator[ResourceChange]:
+    """Yield the resource changes of *source* that a scan evaluates.
+
+    Those being created or updated, in plan order; see :func:`scan_plan`
+    for the arguments.  With ``use_mmap=False`` a plan file is read rather
+    than memory-mapped (see :func:`~cloudsentry_cli.decoders.load_json`).
+    """
+    return _active_changes(
+        _resource_changes(source, stream, decoder, use_mmap), ScanStats()
+    )
 
-    return findings
+
+def load_baseline(
+    source: PlanSource,
+    stream: bool = False,
+    decoder: str = AUTO,
+) -> dict[str, str]:
+    """Index a baseline plan as resource address → content digest.
+
+    Only digests are kept, so the index stays small even for a huge baseline
+    plan (combine with ``stream=True`` to also bound the memory used while
+    reading it).
+    """
+    return {
+        resource_address(rc): content_digest(rc.type, rc.after)
+        for rc in _resource_changes(source, stream, decoder)
+    }
+
+
+class PlanResult(NamedTuple):
+    """Outcome of scanning one plan in a batch."""
+
+    input: str
+    findings: list[Finding]
+    error: Optional[str] = None
+    stats: Optional[ScanStats] = None
+    profile: Optional[ScanProfile] = None
+
+
+def scan_plans(
+    input_paths: Sequence[str],
+    workers: Optional[int] = None,
+    stream: bool = False,
+    cache_path: Optional[str] = None,
+    cache_max_bytes: int = DEFAULT_MAX_BYTES,
+    fail_at: Optional[Severity] = None,
+    profile: bool = False,
+    decoder: str = AUTO,
+) -> Iterator[PlanResult]:
+    """Scan many plans in a process pool, yielding results in input order.
+
+    A plan that cannot be read or parsed produces a :class:`PlanResult` with
+    ``error`` set instead of aborting the batch.
+
+    Parameters
+    ----------
+    input_paths:
+        Terraform plan JSON files to scan.
+    workers:
+        Pool size.  Defaults to the number of CPUs available to this process.
+        With one worker (or one plan) everything runs in-process.
+    stream:
+        Passed through to :func:`scan_plan` for every plan.
+    cache_path, cache_max_bytes:
+        Optional findings cache file shared by all workers.
+    fail_at:
+        Passed through to :func:`scan_plan` for every plan.  Closing the
+        generator early cancels plans that have not started yet.
+    profile:
+        When True, every :class:`PlanResult` carries a
+        :class:`~cloudsentry_cli.profile.ScanProfile`.
+    decoder:
+        Passed through to :func:`scan_plan` for every plan.
+    """
+    scan_one = partial(
+        _scan_one,
+        stream=stream,
+        cache_path=cache_path,
+        cache_max_bytes=cache_max_bytes,
+        fail_at=fail_at,
+        profile=profile,
+        decoder=decoder,
+    )
+    workers = min(workers or default_workers(), len(input_paths))
+    if workers <= 1:
+        yield from map(scan_one, input_paths)
+        return
+    with _process_pool(workers) as pool:
+        try:
+            yield from pool.map(scan_one, input_paths)
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+
+def default_workers() -> int:
+    """Number of CPUs this process may use.
+
+    Its CPU affinity, capped by the cgroup v2 CPU quota (e.g. a container's
+    ``--cpus``) when one is set.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS / Windows
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota(CGROUP_CPU_MAX)
+    return min(cpus, quota) if quota is not None else cpus
+
+
+def _cgroup_cpu_quota(path: str) -> Optional[int]:
+    """CPUs allowed by the ``cpu.max`` quota at *path*, rounded up.
+
+    None when there is no quota ("max") or no cgroup v2 file to read.
+    """
+    try:
+        quota, period = Path(path).read_text().split()
+        return max(1, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError, ZeroDivisionError):
+        return None
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _load_plan(path: str) -> dict[str, Any]:
+def _active_changes(
+    changes: Iterable[ResourceChange],
+    stats: ScanStats,
+) -> Iterator[ResourceChange]:
+    """Only evaluate resources being created or updated (not deleted/no-ops)."""
+    for rc in changes:
+        if _is_active_change(rc.actions):
+            stats.resources += 1
+            yield rc
+
+
+def _changed_since(
+    changes: Iterable[ResourceChange],
+    baseline: Mapping[str, str],
+    stats: ScanStats,
+) -> Iterator[ResourceChange]:
+    """Drop resources whose content is identical in the *baseline* plan."""
+    for rc in changes:
+        if baseline.get(resource_address(rc)) == content_digest(rc.type, rc.after):
+            stats.unchanged += 1
+            continue
+        yield rc
+
+
+def _evaluate_resource(
+    rc: ResourceChange,
+    fail_at: Optional[Severity] = None,
+    profile: Optional[ScanProfile] = None,
+) -> list[Finding]:
+    """Run every check that applies to *rc* and return its findings.
+
+    With *fail_at*, runs the fail-fast subset of checks (see
+    :func:`~cloudsentry_cli.checks.checks_for`) and stops after the first
+    check that reports a finding at or above it.  With *profile*, each check
+    call is timed.
+    """
+    findings: list[Finding] = []
+    after: dict[str, Any] = rc.after or {}
+    for check_fn in checks_for(rc.type, fail_at):
+        if profile is None:
+            found = check_fn(rc.type, rc.name, after)
+        else:
+            start = time.perf_counter()
+            found = check_fn(rc.type, rc.name, after)
+            profile.record_check(
+                check_name(check_fn), time.perf_counter() - start, resource_address(rc)
+            )
+        blocking = False
+        for finding in found:
+            # Checks written against the old interface return dicts.
+            if not isinstance(finding, Finding):
+                finding = Finding.from_dict(finding)
+            findings.append(finding)
+            blocking = blocking or (fail_at is not None and finding.severity >= fail_at)
+        if blocking:
+            break
+    return findings
+
+
+# The functions below are also the process-pool workers for jobs > 1.
+# Workers see the built-in checks, the rule files loaded before the pool
+# started (see _process_pool) and, on platforms that fork, any other check
+# registered at runtime.
+
+def _evaluate_each(
+    changes: Iterable[ResourceChange],
+    fail_at: Optional[Severity] = None,
+    profile: Optional[ScanProfile] = None,
+) -> list[list[Finding]]:
+    """Evaluate *changes* in order and return one findings list per resource."""
+    return [_evaluate_resource(rc, fail_at, profile) for rc in changes]
+
+
+def _profiled(
+    fn: Callable[..., R],
+    changes: Iterable[ResourceChange],
+) -> tuple[R, ScanProfile]:
+    """Run *fn* on *changes* with a fresh profile and return both."""
+    profile = ScanProfile()
+    return fn(changes, profile=profile), profile
+
+
+def _evaluate_profiled(
+    evaluate: Callable[..., Iterator[tuple[R, ScanProfile]]],
+    fn: Callable[..., R],
+    items: Iterable[Iterable[ResourceChange]],
+    profile: ScanProfile,
+) -> Iterator[R]:
+    """*evaluate* (``map`` or :func:`_parallel_map`) with *fn* profiled.
+
+    Each work unit returns its own profile, merged into *profile* here in the
+    calling process.
+    """
+    results = evaluate(partial(_profiled, fn), items)
+    try:
+        for result, part in results:
+            profile.merge(part)
+            yield result
+    finally:
+        _close(results)
+
+
+def _evaluate_uncached(
+    changes: Iterable[ResourceChange],
+    evaluate: Callable[..., Iterator[list[list[Finding]]]],
+    fail_at: Optional[Severity] = None,
+) -> Iterator[list[Finding]]:
+    """Yield each resource's findings, evaluated a chunk at a time by *evaluate*."""
+    chunks = _chunked(changes, PARALLEL_CHUNK_SIZE)
+    batches = evaluate(partial(_evaluate_each, fail_at=fail_at), chunks)
+    try:
+        for batch in batches:
+            yield from batch
+    finally:
+        _close(batches)
+
+
+def _evaluate_unique(
+    changes: Iterable[ResourceChange],
+    evaluate_each: Callable[[Iterable[ResourceChange]], Iterator[list[Finding]]],
+    stats: ScanStats,
+) -> Iterator[list[Finding]]:
+    """Yield each resource's findings, evaluating identical instances once.
+
+    Only the first ``count``/``for_each`` instance of each (type, content)
+    group is passed on to *evaluate_each*; later members are answered here,
+    in plan order, with that instance's findings.  Members share the
+    :class:`Finding` objects when their label is the same (instances of one
+    resource block always are) and get relabelled copies otherwise.
+    """
+    groups: dict[tuple[str, bytes], tuple[str, list[Finding]]] = {}
+    pending: set[tuple[str, bytes]] = set()
+    # (label, group key, evaluated?) for every resource, in plan order.
+    order: deque[tuple[str, Optional[tuple[str, bytes]], bool]] = deque()
+
+    def representatives() -> Iterator[ResourceChange]:
+        for rc in changes:
+            key = _instance_key(rc)
+            if key is not None and (key in groups or key in pending):
+                order.append((_resource_label(rc), key, False))
+                continue
+            if key is not None and len(groups) + len(pending) < DEDUP_MAX_GROUPS:
+                pending.add(key)
+            else:
+                key = None
+            order.append((_resource_label(rc), key, True))
+            yield rc
+
+    def members() -> Iterator[list[Finding]]:
+        # Duplicates queued ahead of the next evaluated resource.
+        while order and not order[0][2]:
+            label, key, _ = order.popleft()
+            stats.deduplicated += 1
+            yield _relabelled(groups[key], label)  # type: ignore[index]
+
+    results = evaluate_each(representatives())
+    try:
+        for found in results:
+            yield from members()
+            label, key, _ = order.popleft()
+            stats.evaluated += 1
+            if key is not None:
+                groups[key] = (label, found)
+                pending.discard(key)
+            yield found
+        yield from members()
+    finally:
+        _close(results)
+
+
+def _instance_key(rc: ResourceChange) -> Optional[tuple[str, bytes]]:
+    """Grouping key of a count/for_each instance; None for other resources.
+
+    The ``after`` block is marshalled as decoded.  Terraform renders object
+    attributes in sorted order, so identical configurations produce identical
+    keys; this is several times cheaper than :func:`content_digest`, which
+    would cost more than the checks it saves.
+    """
+    if not rc.address.endswith("]") or rc.after is None:
+        return None
+    try:
+        return rc.type, marshal.dumps(rc.after)
+    except ValueError:  # a parsed plan holding non-JSON values
+        return None
+
+
+def _relabelled(group: tuple[str, list[Finding]], label: str) -> list[Finding]:
+    """The findings of *group*, moved to *label* where they name the group's resource."""
+    group_label, findings = group
+    if label == group_label:
+        return findings
+    return [
+        Finding(label, f.severity, f.issue, f.recommendation, f.rule_id, f.params)
+        if f.resource == group_label else f
+        for f in findings
+    ]
+
+
+def _evaluate_cached(
+    changes: Iterable[ResourceChange],
+    cache: FindingsCache,
+    evaluate: Callable[..., Iterator[list[list[Finding]]]],
+    stats: ScanStats,
+    fail_at: Optional[Severity] = None,
+) -> Iterator[list[Finding]]:
+    """Yield each resource's findings, evaluating only cache misses.
+
+    Lookups happen here in the calling process; the misses of each chunk are
+    handed to *evaluate* (``map`` or :func:`_parallel_map`) and the results
+    are stitched back in plan order.  Resource types with no applicable
+    checks bypass the cache entirely.  Fail-fast results (*fail_at* set)
+    only cover some checks, so they are not stored.
+    """
+    digests: dict[str, str] = {}
+    lookups: deque[list[tuple[ResourceChange, Optional[str], Any]]] = deque()
+
+    def misses() -> Iterator[list[ResourceChange]]:
+        for chunk in _chunked(changes, PARALLEL_CHUNK_SIZE):
+            looked_up = []
+            to_evaluate = []
+            for rc in chunk:
+                if not checks_for(rc.type):
+                    looked_up.append((rc, None, []))
+                    continue
+                digest = digests.get(rc.type)
+                if digest is None:
+                    digest = digests[rc.type] = checks_fingerprint(checks_for(rc.type))
+                key = cache_key(content_digest(rc.type, rc.after), digest)
+                cached = cache.get(key)
+                if cached is None:
+                    to_evaluate.append(rc)
+                looked_up.append((rc, key, cached))
+            lookups.append(looked_up)
+            yield to_evaluate
+
+    evaluated_chunks = evaluate(partial(_evaluate_each, fail_at=fail_at), misses())
+    try:
+        for evaluated in evaluated_chunks:
+            fresh = iter(evaluated)
+            for rc, key, cached in lookups.popleft():
+                label = _resource_label(rc)
+                if key is None:
+                    yield []
+                elif cached is None:
+                    stats.cache_misses += 1
+                    found = next(fresh)
+                    if fail_at is None:
+                        cache.put(key, [_unlabel(f, label) for f in found])
+                    yield found
+                else:
+                    stats.cache_hits += 1
+                    yield [Finding.from_dict(f, resource=label) for f in cached]
+    finally:
+        _close(evaluated_chunks)
+
+
+def _chunked(
+    changes: Iterable[ResourceChange],
+    size: int,
+) -> Iterator[list[ResourceChange]]:
+    """Group *changes* into lists of at most *size* items."""
+    it = iter(changes)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _parallel_map(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    jobs: int,
+) -> Iterator[R]:
+    """Ordered ``map`` over a process pool with a bounded submission window.
+
+    Unlike ``Executor.map`` this does not drain *items* up front, so a
+    streamed plan is never held in memory as a queue of pending chunks.
+    """
+    with _process_pool(jobs) as pool:
+        pending: deque[Future[R]] = deque()
+        try:
+            for item in items:
+                pending.append(pool.submit(fn, item))
+                if len(pending) >= jobs * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Only non-empty if the consumer stopped early.
+            for future in pending:
+                future.cancel()
+
+
+def _close(iterator: Iterator[Any]) -> None:
+    """Close *iterator* if it is a generator (``map`` objects need nothing)."""
+    close = getattr(iterator, "close", None)
+    if close is not None:
+        close()
+
+
+def _process_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool whose workers re-register this process's rule files."""
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=register_loaded_rule_files,
+        initargs=(loaded_rule_files(),),
+    )
+
+
+def _resource_label(rc: ResourceChange) -> str:
+    return f"{rc.type}.{rc.name}"
+
+
+def _unlabel(finding: Finding, label: str) -> dict[str, Any]:
+    """Cacheable dict form of *finding*, without ``resource`` if it is *label*.
+
+    :meth:`Finding.from_dict` with ``resource=label`` reverses it.
+    """
+    return finding.to_dict(resource=finding.resource != label)
+
+
+def _scan_one(
+    input_path: str,
+    stream: bool,
+    cache_path: Optional[str],
+    cache_max_bytes: int,
+    fail_at: Optional[Severity] = None,
+    profile: bool = False,
+    decoder: str = AUTO,
+) -> PlanResult:
+    """Process-pool worker: scan one plan, capturing load errors."""
+    stats = ScanStats()
+    plan_profile = ScanProfile() if profile else None
+    cache = None
+    try:
+        if cache_path:
+            cache = FindingsCache(cache_path, cache_max_bytes)
+        findings = scan_plan(
+            input_path,
+            stream=stream,
+            cache=cache,
+            stats=stats,
+            fail_at=fail_at,
+            profile=plan_profile,
+            decoder=decoder,
+        )
+        return PlanResult(input_path, findings, stats=stats, profile=plan_profile)
+    except (OSError, ValueError, sqlite3.Error) as exc:
+        return PlanResult(input_path, [], str(exc), stats, plan_profile)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def _resource_changes(
+    source: PlanSource,
+    stream: bool,
+    decoder: str = AUTO,
+    use_mmap: bool = True,
+) -> Iterator[ResourceChange]:
+    """Yield the plan's resource changes, streamed or from a full load."""
+    if isinstance(source, Mapping):
+        plan: Mapping[str, Any] = source
+    elif stream:
+        return iter_resource_changes(source)
+    else:
+        plan = _load_plan(source, decoder, use_mmap)
+    return (
+        project_resource_change(entry)
+        for entry in plan.get("resource_changes", [])
+    )
+
+
+def _load_plan(
+    source: PlanSource,
+    decoder: str = AUTO,
+    use_mmap: bool = True,
+) -> dict[str, Any]:
     """Load and return the parsed Terraform plan JSON."""
-    plan_path = Path(path)
+    backend = get_decoder(decoder)
+    if hasattr(source, "read"):
+        return load_json(source, backend, use_mmap)  # type: ignore[arg-type]
+    plan_path = Path(source)  # type: ignore[arg-type]
     if not plan_path.exists():
-        raise FileNotFoundError(f"Terraform plan file not found: {path}")
-    with plan_path.open() as fh:
-        return json.load(fh)
+        raise FileNotFoundError(f"Terraform plan file not found: {source}")
+    return load_json(plan_path, backend, use_mmap)
 
 
 def _is_active_change(actions: list[str]) -> bool:
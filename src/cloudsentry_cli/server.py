@@ -0,0 +1,497 @@
+"""
+Scan daemon for ``cloudsentry-cli serve``.
+
+Each ``cloudsentry-cli scan`` invocation pays for interpreter start-up,
+imports and building the check registry before it reads a single plan.  A
+CI runner that gates many plans back to back can instead start one daemon
+and forward every scan to it with the thin client
+(:mod:`cloudsentry_cli.client`).
+
+The daemon speaks a minimal JSON-over-HTTP protocol on a Unix socket or,
+opt-in, a localhost TCP port::
+
+    GET  /health  -> {"status": "ok", "workers": N, "running": R, "queued": Q}
+    POST /scan    {"argv": ["--input", "tfplan.json"], "cwd": "/repo"}
+                  -> {"exit_code": 1, "stdout": "...", "stderr": "..."}
+
+Scans run as the daemon's user and write the reports and caches they name,
+so the daemon only serves that user.  The default socket lives in
+``$XDG_RUNTIME_DIR`` (or a private per-user directory under the temp dir)
+and is created with mode 0600; on Linux the peer's uid is checked as well.
+Any local user can connect to a TCP port, so listening on one requires a
+shared token (``$CLOUDSENTRY_TOKEN``) that every request must present as
+``Authorization: Bearer <token>``.  The requested ``cwd`` must be an
+absolute path to a directory owned by the daemon's user.
+
+Scans run in a pool of pre-started worker processes that keep the check
+registry imported and warm.  A worker runs ``scan`` exactly as the CLI
+would, in the client's working directory, with stdout and stderr captured
+for the reply; reports named by ``--output`` are written by the worker, so
+client and daemon must share a filesystem.  Rule files loaded for one
+request are unregistered afterwards.
+
+Concurrency is bounded: at most *workers* scans run at once and at most
+*queue_size* more wait for a worker.  Requests beyond that are refused with
+``503`` so callers can back off instead of piling up.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hmac
+import io
+import json
+import os
+import signal
+import socket
+import stat
+import struct
+import sys
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Any, Callable, Optional, Union
+
+from cloudsentry_cli.client import TOKEN_ENV, UNIX_PREFIX, default_server
+
+DEFAULT_QUEUE = 32
+
+# Requests larger than this are refused; a scan request is a short argv.
+MAX_REQUEST_BYTES = 1 << 20
+
+_LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+Address = Union[str, tuple[str, int]]
+
+
+def parse_listen(spec: str) -> Address:
+    """Parse ``HOST:PORT`` or ``unix:PATH`` into a socket address.
+
+    Raises
+    ------
+    ValueError
+        If *spec* is malformed or names a host other than loopback; the
+        daemon runs scans as its own user and must not be reachable from
+        other machines.
+    """
+    if spec.startswith(UNIX_PREFIX):
+        path = spec[len(UNIX_PREFIX):]
+        if not path:
+            raise ValueError(f"Missing socket path in {spec!r}")
+        return path
+    host, sep, port = spec.rpartition(":")
+    host = host.strip("[]")
+    if not sep or not port.isdigit():
+        raise ValueError(f"Expected HOST:PORT or unix:PATH, got {spec!r}")
+    if host not in _LOOPBACK_HOSTS:
+        raise ValueError(f"Refusing to listen on non-loopback host {host!r}")
+    return host, int(port)
+
+
+def check_cwd(cwd: Any) -> str:
+    """Validate a requested working directory; returns it unchanged.
+
+    Raises
+    ------
+    ValueError
+        If *cwd* is not an absolute path to an existing directory.
+    PermissionError
+        If the directory is not owned by the daemon's user.
+    """
+    if not isinstance(cwd, str) or not os.path.isabs(cwd):
+        raise ValueError("'cwd' must be an absolute path")
+    try:
+        st = os.stat(cwd)
+    except OSError as exc:
+        raise ValueError(f"Cannot use 'cwd' {cwd!r}: {exc.strerror}") from None
+    if not stat.S_ISDIR(st.st_mode):
+        raise ValueError(f"'cwd' {cwd!r} is not a directory")
+    if st.st_uid != os.getuid():
+        raise PermissionError(f"'cwd' {cwd!r} is not owned by the daemon's user")
+    return cwd
+
+
+# ---------------------------------------------------------------------------
+# Scan execution (runs in worker processes)
+# ---------------------------------------------------------------------------
+
+_parser = None
+
+
+def _warm_worker() -> None:
+    """Pool initializer: import the CLI and build its parser once."""
+    global _parser
+    from cloudsentry_cli.cli import build_parser
+
+    _parser = build_parser()
+
+
+def _process_pool(workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(workers, initializer=_warm_worker)
+
+
+def run_scan(argv: list[str], cwd: Optional[str] = None) -> dict[str, Any]:
+    """Run ``cloudsentry-cli scan *argv*`` in *cwd* and capture its output."""
+    from cloudsentry_cli.cli import build_parser, cmd_scan
+    from cloudsentry_cli.rulefile import rule_file_scope
+
+    parser = _parser or build_parser()
+    stdout, stderr = io.StringIO(), io.StringIO()
+    previous_cwd = os.getcwd()
+    exit_code: Any = 0
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                if cwd:
+                    os.chdir(cwd)
+                args = parser.parse_args(["scan", *argv])
+                with rule_file_scope():
+                    exit_code = cmd_scan(args)
+            except SystemExit as exc:  # argparse errors, --help
+                exit_code = exc.code
+            except Exception as exc:
+                print(f"ERROR: {type(exc).__name__}: {exc}", file=sys.stderr)
+                exit_code = 1
+    finally:
+        os.chdir(previous_cwd)
+    if exit_code is None:
+        exit_code = 0
+    elif not isinstance(exit_code, int):
+        exit_code = 1
+    return {"exit_code": exit_code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+# ---------------------------------------------------------------------------
+# Bounded scan service
+# ---------------------------------------------------------------------------
+
+class ScanService:
+    """Runs scans on *workers* processes with room for *queue_size* waiting.
+
+    *pool_factory* and *run* exist for tests; by default scans run
+    :func:`run_scan` in a :class:`~concurrent.futures.ProcessPoolExecutor`
+    whose workers are started and warmed up front.  A worker that dies (OOM,
+    a crash in an extension) breaks the whole pool: the scans it held fail,
+    and the pool is replaced by a fresh, warmed one so later scans run.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int = DEFAULT_QUEUE,
+        pool_factory: Optional[Callable[[int], Executor]] = None,
+        run: Callable[..., dict[str, Any]] = run_scan,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if queue_size < 0:
+            raise ValueError("queue size must not be negative")
+        self.workers = workers
+        self.queue_size = queue_size
+        self._run = run
+        self._pool_factory = pool_factory or _process_pool
+        self._lock = threading.Lock()
+        self._restart_lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._restarts = 0
+        self._healthy = True
+        # Start the workers now, before the server spawns any threads.
+        self._pool = self._new_pool()
+
+    def submit(self, argv: list[str], cwd: Optional[str] = None) -> Optional[Future]:
+        """Queue a scan; None if every worker is busy and the queue is full."""
+        with self._lock:
+            if self._pending >= self.workers + self.queue_size:
+                self._rejected += 1
+                return None
+            self._pending += 1
+        try:
+            pool = self._pool
+            try:
+                future = pool.submit(self._run, argv, cwd)
+            except BrokenProcessPool:
+                self._restart(pool)
+                pool = self._pool
+                future = pool.submit(self._run, argv, cwd)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(partial(self._done, pool))
+        return future
+
+    def _done(self, pool: Executor, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            # Called from the pool's own management thread, which must not
+            # wait for the pool to shut down; restart from another thread.
+            threading.Thread(target=self._restart, args=(pool,), daemon=True).start()
+
+    def _new_pool(self) -> Executor:
+        pool = self._pool_factory(self.workers)
+        pool.submit(int).result()
+        return pool
+
+    def _restart(self, broken: Executor) -> None:
+        """Replace *broken* with a new pool, unless that already happened."""
+        with self._restart_lock:
+            if self._pool is not broken:
+                return
+            self._healthy = False
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._pool = self._new_pool()
+            with self._lock:
+                self._restarts += 1
+            self._healthy = True
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            pending = self._pending
+            return {
+                # "restarting" while a broken worker pool is being replaced.
+                "status": "ok" if self._healthy else "restarting",
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "running": min(pending, self.workers),
+                "queued": max(pending - self.workers, 0),
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "restarts": self._restarts,
+            }
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+# ---------------------------------------------------------------------------
+# HTTP front end
+# ---------------------------------------------------------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "cloudsentry-serve"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if not self._authorized():
+            return
+        if self.path == "/health":
+            self._reply(HTTPStatus.OK, self.server.service.status())
+        else:
+            self._reply(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        if not self._authorized():
+            return
+        if self.path != "/scan":
+            self._reply(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            request = self._read_json()
+            argv = request.get("argv")
+            if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+                raise ValueError("'argv' must be a list of strings")
+            cwd = check_cwd(request.get("cwd"))
+        except PermissionError as exc:
+            self._reply(HTTPStatus.FORBIDDEN, {"error": str(exc)})
+            return
+        except ValueError as exc:
+            self._reply(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+            return
+
+        future = self.server.service.submit(argv, cwd)
+        if future is None:
+            self._reply(HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Scan queue is full"})
+            return
+        try:
+            result = future.result()
+        except Exception as exc:  # worker died
+            self._reply(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Scan failed: {exc}"})
+            return
+        self._reply(HTTPStatus.OK, result)
+
+    def _authorized(self) -> bool:
+        """Check the peer (Unix sockets) or bearer token; reply 401/403 if refused."""
+        if isinstance(self.server, _UnixServer) and _peer_uid(self.request) not in (
+            None, os.getuid()
+        ):
+            self._reply(HTTPStatus.FORBIDDEN, {"error": "Peer is not the daemon's user"})
+            return False
+        token = self.server.token
+        if token is None:
+            return True
+        scheme, _, presented = self.headers.get("Authorization", "").partition(" ")
+        if scheme == "Bearer" and hmac.compare_digest(presented.encode(), token.encode()):
+            return True
+        self._reply(HTTPStatus.UNAUTHORIZED, {"error": f"Missing or wrong token (${TOKEN_ENV})"})
+        return False
+
+    def _read_json(self) -> dict[str, Any]:
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            raise ValueError("Missing Content-Length") from None
+        if not 0 <= length <= MAX_REQUEST_BYTES:
+            raise ValueError("Request body too large")
+        try:
+            body = json.loads(self.rfile.read(length))
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid JSON: {exc}") from None
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        return body
+
+    def _reply(self, status: HTTPStatus, body: dict[str, Any]) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address.
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class _TCPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class _TCP6Server(_TCPServer):
+    address_family = socket.AF_INET6
+
+
+class _UnixServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.server_address))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        with contextlib.suppress(FileNotFoundError):
+            # A socket file left behind by a daemon that did not exit
+            # cleanly; anything else at the path is not ours to remove.
+            if stat.S_ISSOCK(os.lstat(self.server_address).st_mode):
+                os.unlink(self.server_address)
+        # Owner-only from the moment it exists, not chmod-ed after the fact.
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def server_close(self) -> None:
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.server_address)
+
+
+def _check_private_dir(directory: str) -> None:
+    """Create *directory* (mode 0700) or check that only we can write to it.
+
+    Under the shared temp dir another user could have created it first and
+    swapped the socket for one of their own.
+    """
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o022:
+        raise ValueError(
+            f"Refusing to use socket directory {directory!r}: it must be a "
+            f"directory owned by this user and writable by no one else"
+        )
+
+
+def _peer_uid(sock: socket.socket) -> Optional[int]:
+    """The uid of a Unix socket peer, or None where the platform cannot tell."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)[1]
+
+
+def make_server(
+    address: Address,
+    service: ScanService,
+    quiet: bool = False,
+    token: Optional[str] = None,
+):
+    """An HTTP server for *service* bound to *address* (not yet serving).
+
+    Raises
+    ------
+    ValueError
+        If *address* is a TCP address and no *token* is given.
+    """
+    if isinstance(address, str):
+        server = _UnixServer(address, _Handler)
+    elif not token:
+        raise ValueError(f"Listening on TCP requires a shared token (${TOKEN_ENV})")
+    elif ":" in address[0]:
+        server = _TCP6Server(address, _Handler)
+    else:
+        server = _TCPServer(address, _Handler)
+    server.service = service
+    server.quiet = quiet
+    server.token = token or None
+    return server
+
+
+def serve(
+    listen: Optional[str],
+    workers: int,
+    queue_size: int = DEFAULT_QUEUE,
+    token: Optional[str] = None,
+) -> int:
+    """Run the daemon until interrupted.  Returns an exit code.
+
+    *listen* defaults to the per-user socket of
+    :func:`cloudsentry_cli.client.default_server`.
+    """
+    try:
+        if listen is None:
+            listen = default_server()
+            _check_private_dir(os.path.dirname(parse_listen(listen)))
+        address = parse_listen(listen)
+        if not isinstance(address, str) and not token:
+            raise ValueError(
+                f"Listening on TCP requires a shared token; set ${TOKEN_ENV}"
+            )
+    except ValueError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    service = ScanService(workers, queue_size)
+    try:
+        server = make_server(address, service, token=token)
+    except OSError as exc:
+        service.close()
+        print(f"ERROR: Cannot listen on {listen}: {exc}", file=sys.stderr)
+        return 1
+
+    where = (
+        f"{UNIX_PREFIX}{address}" if isinstance(address, str)
+        else f"{server.server_address[0]}:{server.server_address[1]}"
+    )
+    print(f"cloudsentry-cli serve: listening on {where} "
+          f"({workers} workers, queue {queue_size})", file=sys.stderr)
+    # Stop cleanly (removing the socket file) on SIGTERM as well as Ctrl-C.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
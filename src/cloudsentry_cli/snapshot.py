@@ -0,0 +1,141 @@
+"""
+Live inventory snapshots.
+
+Running several live gates within minutes would fetch the same IAM users
+and security groups each time.  A :class:`SnapshotStore` keeps the
+normalized resources every live collector returned, per (account, region,
+collector), in one SQLite file together with when they were fetched.
+:func:`cloudsentry_cli.live.collect` reuses entries younger than the
+collector's TTL and re-fetches only the expired ones.
+
+Because resources are stored in their normalized form (ages already
+computed at fetch time), replaying a snapshot with :func:`replay_snapshot`
+gives the same findings on every run, fully offline.
+
+Usage::
+
+    from cloudsentry_cli.live import collect
+    from cloudsentry_cli.snapshot import SnapshotStore, replay_snapshot
+
+    with SnapshotStore(".cloudsentry-inventory.sqlite") as store:
+        results = list(collect(regions=["eu-west-1"], store=store))
+
+    results = list(replay_snapshot(".cloudsentry-inventory.sqlite"))
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+from cloudsentry_cli.live import GLOBAL_REGION, LiveTarget, TargetResult
+from cloudsentry_cli.plan_stream import ResourceChange
+
+# Bump when the stored resource layout changes.
+_SNAPSHOT_FORMAT = 1
+
+
+class SnapshotStore:
+    """SQLite store of live inventory keyed by :class:`~cloudsentry_cli.live.LiveTarget`.
+
+    Like any sqlite3 connection, a store must only be used from the thread
+    that opened it.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=30)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS inventory ("
+            " account TEXT NOT NULL,"
+            " region TEXT NOT NULL,"
+            " collector TEXT NOT NULL,"
+            " format INTEGER NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " resources TEXT NOT NULL,"
+            " PRIMARY KEY (account, region, collector))"
+        )
+
+    def get(
+        self,
+        target: LiveTarget,
+        ttl: Optional[float] = None,
+    ) -> Optional[tuple[list[ResourceChange], datetime]]:
+        """``(resources, fetched_at)`` for *target*, or None if it is missing
+        or older than *ttl* seconds."""
+        row = self._db.execute(
+            "SELECT resources, fetched_at FROM inventory"
+            " WHERE account = ? AND region = ? AND collector = ? AND format = ?",
+            (*target, _SNAPSHOT_FORMAT),
+        ).fetchone()
+        if row is None or (ttl is not None and time.time() - row[1] > ttl):
+            return None
+        return _decode(row[0]), _from_timestamp(row[1])
+
+    def put(
+        self,
+        target: LiveTarget,
+        resources: list[ResourceChange],
+        fetched_at: Optional[datetime] = None,
+    ) -> None:
+        stamp = fetched_at.timestamp() if fetched_at is not None else time.time()
+        encoded = json.dumps([list(rc) for rc in resources], separators=(",", ":"))
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO inventory VALUES (?, ?, ?, ?, ?, ?)",
+                (*target, _SNAPSHOT_FORMAT, stamp, encoded),
+            )
+
+    def entries(self) -> Iterator[TargetResult]:
+        """Every stored target, by account with account-wide collectors first."""
+        rows = self._db.execute(
+            "SELECT account, region, collector, fetched_at, resources FROM inventory"
+            " WHERE format = ? ORDER BY account, region != ?, collector, region",
+            (_SNAPSHOT_FORMAT, GLOBAL_REGION),
+        ).fetchall()
+        for account, region, collector, fetched_at, resources in rows:
+            yield TargetResult(
+                LiveTarget(account, region, collector),
+                _decode(resources),
+                fetched_at=_from_timestamp(fetched_at),
+                cached=True,
+            )
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "SnapshotStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def replay_snapshot(path: str) -> Iterator[TargetResult]:
+    """Iterate over every target stored in the snapshot at *path*, whatever its age.
+
+    Raises
+    ------
+    FileNotFoundError
+        If *path* does not exist; raised by this call, not on first iteration.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Snapshot not found: {path}")
+    return _replay(path)
+
+
+def _replay(path: str) -> Iterator[TargetResult]:
+    with SnapshotStore(path) as store:
+        yield from store.entries()
+
+
+def _decode(resources: str) -> list[ResourceChange]:
+    return [ResourceChange(*fields) for fields in json.loads(resources)]
+
+
+def _from_timestamp(stamp: float) -> datetime:
+    return datetime.fromtimestamp(stamp, timezone.utc)
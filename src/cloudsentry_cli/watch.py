@@ -0,0 +1,155 @@
+"""
+Incremental rescans for ``cloudsentry-cli watch``.
+
+While iterating on Terraform locally the same plan is re-rendered with
+``terraform show -json`` over and over, and usually only a handful of its
+resources changed.  An :class:`IncrementalScan` keeps every resource's
+content digest and findings from the previous pass in memory; on the next
+pass it re-evaluates only resources whose ``change.after`` digest differs
+(or that are new) and reports what changed as a :class:`FindingsDelta`.
+
+Usage::
+
+    from cloudsentry_cli.watch import IncrementalScan, file_changes
+
+    scan = IncrementalScan()
+    for _ in file_changes("tfplan.json"):
+        delta = scan.update("tfplan.json")
+        for finding in delta.new:
+            print("+", finding.resource, finding.issue)
+        for finding in delta.resolved:
+            print("-", finding.resource, finding.issue)
+
+File changes are detected by polling size and modification time, so no
+platform-specific notification API (or dependency) is needed.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import Counter
+from typing import Callable, Hashable, Iterable, Iterator, NamedTuple, Optional
+
+from cloudsentry_cli.decoders import AUTO
+from cloudsentry_cli.findings import Finding
+from cloudsentry_cli.plan_stream import PlanSource, content_digest, resource_address
+from cloudsentry_cli.scanner import active_resource_changes, evaluate_resources
+
+# Seconds between checks of the watched file.
+DEFAULT_INTERVAL = 1.0
+
+
+class FindingsDelta(NamedTuple):
+    """What changed between two passes of an :class:`IncrementalScan`."""
+
+    # Findings not present in the previous pass, in plan order.
+    new: list[Finding]
+    # Findings of the previous pass that are gone, including those of
+    # resources no longer in the plan.
+    resolved: list[Finding]
+    # Resources evaluated in this pass (new or changed content).
+    evaluated: int
+    # Resources whose findings were reused.
+    unchanged: int
+    # Resources of the previous pass missing from this one.
+    removed: int
+
+
+class IncrementalScan:
+    """Scan successive versions of one plan, re-evaluating only what changed.
+
+    Results are keyed by resource address.  The check registry is assumed
+    not to change between passes.
+    """
+
+    def __init__(self, stream: bool = False, decoder: str = AUTO) -> None:
+        self.stream = stream
+        self.decoder = decoder
+        self._results: dict[str, tuple[str, list[Finding]]] = {}
+
+    def update(self, source: PlanSource) -> FindingsDelta:
+        """Scan *source* and return the difference from the previous pass.
+
+        The first pass reports every finding as new.  If *source* cannot be
+        read or parsed the error propagates and the previous results are
+        kept, so a plan caught half-written is simply retried.
+        """
+        results: dict[str, tuple[str, list[Finding]]] = {}
+        new: list[Finding] = []
+        resolved: list[Finding] = []
+        evaluated = unchanged = 0
+        # The watched plan is rewritten in place, often while we read it;
+        # a mapping of a file truncated under us would raise SIGBUS.
+        changes = active_resource_changes(source, self.stream, self.decoder, use_mmap=False)
+        for rc in changes:
+            address = resource_address(rc)
+            digest = content_digest(rc.type, rc.after)
+            previous = self._results.get(address)
+            if previous is not None and previous[0] == digest:
+                results[address] = previous
+                unchanged += 1
+                continue
+            found = list(evaluate_resources([rc]))
+            evaluated += 1
+            results[address] = (digest, found)
+            before = previous[1] if previous is not None else []
+            new.extend(_difference(found, before))
+            resolved.extend(_difference(before, found))
+
+        removed = 0
+        for address, (_, found) in self._results.items():
+            if address not in results:
+                removed += 1
+                resolved.extend(found)
+        self._results = results
+        return FindingsDelta(new, resolved, evaluated, unchanged, removed)
+
+    def findings(self) -> list[Finding]:
+        """Every finding of the latest pass, in plan order."""
+        return [f for _, found in self._results.values() for f in found]
+
+
+def file_changes(
+    path: str,
+    interval: float = DEFAULT_INTERVAL,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Iterator[None]:
+    """Yield once for the current contents of *path* and again on every change.
+
+    Polls size and modification time every *interval* seconds.  While the
+    file is missing (e.g. between an editor's delete and rewrite) nothing is
+    yielded.  Runs until the consumer stops iterating.
+    """
+    last: Optional[tuple[int, int]] = None
+    while True:
+        signature = _signature(path)
+        if signature is not None and signature != last:
+            last = signature
+            yield
+        sleep(interval)
+
+
+def _signature(path: str) -> Optional[tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _identity(f: Finding) -> Hashable:
+    return (f.resource, f.rule_id, f.severity, f.issue)
+
+
+def _difference(findings: Iterable[Finding], other: Iterable[Finding]) -> list[Finding]:
+    """*findings* not matched by one in *other* (duplicates counted)."""
+    remaining = Counter(_identity(f) for f in other)
+    out = []
+    for f in findings:
+        key = _identity(f)
+        if remaining[key]:
+            remaining[key] -= 1
+        else:
+            out.append(f)
+    return out
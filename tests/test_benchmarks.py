@@ -0,0 +1,72 @@
+"""Tests for the benchmark plan generator and regression check."""
+
+from __future__ import annotations
+
+from benchmarks.generate import PlanSpec, generate_plan
+from benchmarks.run import compare, measure
+from cloudsentry_cli.scanner import scan_plan
+
+
+class TestGeneratePlan:
+    def test_same_seed_same_plan(self):
+        spec = PlanSpec(resources=200, seed=7)
+        assert generate_plan(spec) == generate_plan(PlanSpec(resources=200, seed=7))
+        assert generate_plan(spec) != generate_plan(PlanSpec(resources=200, seed=8))
+
+    def test_shape_and_knobs(self):
+        plan = generate_plan(PlanSpec(
+            resources=300, sg_rules=6, module_depth=3, prior_state_bloat=100,
+            type_mix={"aws_security_group": 1},
+        ))
+        changes = plan["resource_changes"]
+        assert len(changes) == 300
+        live = [rc for rc in changes if rc["change"]["after"] is not None]
+        assert all(len(rc["change"]["after"]["ingress"]) == 6 for rc in live)
+        assert max(rc["address"].count("module.") for rc in changes) == 3
+        prior = plan["prior_state"]["values"]["root_module"]["resources"]
+        assert all(len(r["values"]["bloat"]) == 100 for r in prior)
+
+    def test_violations_produce_findings(self):
+        plan = generate_plan(PlanSpec(resources=500, violation_rate=0.5))
+        assert len(scan_plan(plan)) > 50
+        assert scan_plan(generate_plan(PlanSpec(resources=500, violation_rate=0))) == []
+
+
+class TestRunner:
+    def test_measure_scan_plan_stages(self, tmp_path):
+        from benchmarks.generate import write_plan
+
+        path = str(tmp_path / "plan.json")
+        write_plan(path, PlanSpec(resources=100))
+        result = measure("scan_plan", path)
+        # Only created and updated resources are scanned, as in cmd_scan.
+        active = [
+            rc for rc in generate_plan(PlanSpec(resources=100))["resource_changes"]
+            if rc["change"]["actions"] in (["create"], ["update"])
+        ]
+        assert result["resources"] == len(active) == measure("cmd_scan", path)["resources"]
+        assert set(result["stages"]) == {"load", "evaluate", "report"}
+
+    def test_measure_scan_plan_matches_the_public_api(self, tmp_path):
+        from benchmarks.generate import write_plan
+
+        path = str(tmp_path / "plan.json")
+        write_plan(path, PlanSpec(resources=300, violation_rate=0.5))
+        assert measure("scan_plan", path)["findings"] == len(scan_plan(path))
+
+    def test_measure_with_a_decoder(self, tmp_path):
+        from benchmarks.generate import write_plan
+
+        path = str(tmp_path / "plan.json")
+        write_plan(path, PlanSpec(resources=50))
+        assert measure("cmd_scan", path, decoder="json")["decoder"] == "json"
+        assert measure("scan_plan", path, stream=True)["decoder"] == "stream"
+
+    def test_compare_flags_throughput_and_memory(self):
+        baseline = {"a": {"resources_per_sec": 1000, "peak_rss_mb": 100}}
+        assert compare({"a": {"resources_per_sec": 900, "peak_rss_mb": 110}}, baseline) == []
+        regressions = compare(
+            {"a": {"resources_per_sec": 500, "peak_rss_mb": 200}, "b": {}},
+            baseline,
+        )
+        assert len(regressions) == 2
@@ -0,0 +1,111 @@
+"""Tests for the persistent findings cache."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from cloudsentry_cli.cache import FindingsCache, cache_key, check_identity
+from cloudsentry_cli.checks import check_s3_public_acl
+from cloudsentry_cli.plan_stream import content_digest
+from cloudsentry_cli.scanner import ScanStats, scan_plan
+
+
+def _bucket(name: str, acl: str) -> dict:
+    return {
+        "type": "aws_s3_bucket",
+        "name": name,
+        "change": {"actions": ["create"], "after": {"acl": acl}},
+    }
+
+
+def _write_plan(tmp_path: Path, resource_changes: list) -> str:
+    plan_file = tmp_path / "tfplan.json"
+    plan_file.write_text(json.dumps({"resource_changes": resource_changes}))
+    return str(plan_file)
+
+
+class TestScanPlanWithCache:
+    def test_second_run_hits_and_matches_uncached(self, tmp_path):
+        plan = _write_plan(tmp_path, [
+            _bucket("a", "public-read"),
+            _bucket("b", "private"),
+            {"type": "aws_instance", "name": "web",
+             "change": {"actions": ["create"], "after": {}}},
+        ])
+        cache_file = str(tmp_path / "cache.sqlite")
+
+        first = ScanStats()
+        with FindingsCache(cache_file) as cache:
+            findings = scan_plan(plan, cache=cache, stats=first)
+        assert findings == scan_plan(plan)
+        assert (first.cache_hits, first.cache_misses) == (0, 2)
+
+        second = ScanStats()
+        with FindingsCache(cache_file) as cache:
+            assert scan_plan(plan, cache=cache, stats=second) == findings
+        assert (second.cache_hits, second.cache_misses) == (2, 0)
+
+    def test_hit_is_relabelled_for_renamed_resource(self, tmp_path):
+        cache_file = str(tmp_path / "cache.sqlite")
+        with FindingsCache(cache_file) as cache:
+            scan_plan(_write_plan(tmp_path, [_bucket("old", "public-read")]), cache=cache)
+
+        stats = ScanStats()
+        with FindingsCache(cache_file) as cache:
+            findings = scan_plan(
+                _write_plan(tmp_path, [_bucket("new", "public-read")]),
+                cache=cache,
+                stats=stats,
+            )
+        assert stats.cache_hits == 1
+        assert findings[0]["resource"] == "aws_s3_bucket.new"
+        assert list(findings[0]) == [
+            "resource", "issue", "severity", "recommendation", "rule_id", "params",
+        ]
+
+    def test_key_tracks_content_and_checks(self):
+        private = content_digest("aws_s3_bucket", {"acl": "private"})
+        public = content_digest("aws_s3_bucket", {"acl": "public-read"})
+        assert cache_key(private, "v1") != cache_key(public, "v1")
+        assert cache_key(private, "v1") != cache_key(private, "v2")
+
+
+class TestFindingsCache:
+    def test_eviction_keeps_size_under_budget(self, tmp_path):
+        cache_file = str(tmp_path / "cache.sqlite")
+        payload = [{"issue": "x" * 100}]
+        with FindingsCache(cache_file, max_bytes=1000) as cache:
+            for i in range(50):
+                cache.put(f"k{i}", payload)
+            assert cache.get("k49") == payload
+            assert cache.get("k0") is None
+
+    def test_check_identity_honours_explicit_version(self):
+        def check(resource_type, resource_name, after):
+            return []
+
+        unversioned = check_identity(check)
+        check.version = "2"
+        assert check_identity(check).endswith("@2")
+        assert unversioned != check_identity(check)
+        assert check_identity(check_s3_public_acl) == check_identity(check_s3_public_acl)
+
+
+class TestCacheOption:
+    @pytest.mark.parametrize("batch", [False, True])
+    def test_unopenable_cache_is_an_error(self, tmp_path, capsys, batch):
+        from cloudsentry_cli.cli import build_parser, cmd_scan
+
+        plan = _write_plan(tmp_path, [_bucket("a", "public-read")])
+        args = build_parser().parse_args([
+            "scan", "--input", str(tmp_path / "*.json") if batch else plan,
+            "--output", str(tmp_path / "report.json"), "--cache", str(tmp_path),
+        ])
+
+        assert cmd_scan(args) == 1
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert captured.err.startswith(f"ERROR: cannot open cache {tmp_path}: ")
@@ -0,0 +1,100 @@
+"""Tests for console rendering."""
+
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from cloudsentry_cli.checks import S3_PUBLIC_ACL, SG_OPEN_INGRESS
+from cloudsentry_cli.cli import build_parser, cmd_scan
+from cloudsentry_cli.console import ConsoleMode, ConsoleRenderer, parse_console_mode
+from cloudsentry_cli.findings import Finding, Severity
+
+
+def _findings() -> list[Finding]:
+    return [
+        Finding("aws_instance.a", Severity.LOW, "low a", "fix"),
+        S3_PUBLIC_ACL.finding("aws_s3_bucket.b", acl="public-read"),
+        Finding("aws_instance.c", Severity.CRITICAL, "critical c", "fix"),
+        S3_PUBLIC_ACL.finding("aws_s3_bucket.d", acl="public-read-write"),
+        SG_OPEN_INGRESS.finding("aws_security_group.e", port=22, cidr="0.0.0.0/0"),
+    ]
+
+
+def _render(mode: ConsoleMode, **kwargs) -> list[str]:
+    out = io.StringIO()
+    renderer = ConsoleRenderer(mode, out=out, **kwargs)
+    for finding in _findings():
+        renderer.add(finding, failing=finding.severity >= Severity.HIGH)
+    renderer.finish()
+    return out.getvalue().splitlines()
+
+
+class TestParseConsoleMode:
+    def test_valid_modes(self):
+        assert parse_console_mode("full") == ConsoleMode("full")
+        assert parse_console_mode("summary") == ConsoleMode("summary")
+        assert parse_console_mode("top-25") == ConsoleMode("top", 25)
+
+    @pytest.mark.parametrize("spec", ["top", "top-0", "top-x", "brief"])
+    def test_invalid_modes(self, spec):
+        with pytest.raises(ValueError):
+            parse_console_mode(spec)
+
+
+class TestConsoleRenderer:
+    def test_full_writes_every_finding_in_order(self):
+        lines = _render(ConsoleMode("full"), buffer_lines=2)
+        assert len(lines) == 5
+        assert lines[0] == "  · [LOW     ] aws_instance.a – low a"
+        assert lines[2] == "  ✖ [CRITICAL] aws_instance.c – critical c"
+
+    def test_summary_groups_by_type_and_check(self):
+        lines = _render(ConsoleMode("summary"))
+        rows = [line.split() for line in lines[2:]]
+        assert [(r[0], r[2], r[3], r[4]) for r in rows] == [
+            ("1", "CRITICAL", "aws_instance", "critical"),
+            ("2", "HIGH", "aws_s3_bucket", "CS-S3-001"),
+            ("1", "HIGH", "aws_security_group", "CS-SG-001"),
+            ("1", "LOW", "aws_instance", "low"),
+        ]
+
+    def test_top_n_keeps_most_severe_in_plan_order(self):
+        lines = _render(ConsoleMode("top", 3))
+        top = lines[lines.index("Top 3 of 5 finding(s), most severe first:") + 1:]
+        assert [line.split(" – ")[0].split()[-1] for line in top[:3]] == [
+            "aws_instance.c", "aws_s3_bucket.b", "aws_s3_bucket.d",
+        ]
+        assert top[3] == "  … 2 more in the report"
+
+
+class TestConsoleOption:
+    def test_summary_mode_report_keeps_every_finding(self, tmp_path, capsys):
+        plan_file = tmp_path / "tfplan.json"
+        plan_file.write_text(json.dumps({"resource_changes": [
+            {
+                "type": "aws_s3_bucket",
+                "name": f"b{i}",
+                "change": {"actions": ["create"], "after": {"acl": "public-read"}},
+            }
+            for i in range(30)
+        ]}))
+        out_file = tmp_path / "report.json"
+        args = build_parser().parse_args([
+            "scan", "--input", str(plan_file), "--output", str(out_file),
+            "--console", "summary",
+        ])
+        assert cmd_scan(args) == 1
+
+        stdout = capsys.readouterr().out
+        assert "aws_s3_bucket.b0" not in stdout
+        assert "CS-S3-001" in stdout
+        assert len(json.loads(Path(out_file).read_text())["findings"]) == 30
+
+    def test_rejects_unknown_mode(self, capsys):
+        with pytest.raises(SystemExit):
+            build_parser().parse_args(["scan", "--input", "x", "--console", "all"])
+        assert "expected full, summary or top-N" in capsys.readouterr().err
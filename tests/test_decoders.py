@@ -0,0 +1,101 @@
+"""Tests for pluggable plan JSON decoding."""
+
+from __future__ import annotations
+
+import gc
+import io
+import json
+
+import pytest
+
+from cloudsentry_cli.decoders import available_decoders, get_decoder, load_json
+from cloudsentry_cli.scanner import ScanStats, scan_plan
+
+from tests.test_scanner import _OPEN_SSH_SG, _write_plan
+
+DOCUMENT = {"resource_changes": [{"type": "aws_s3_bucket", "name": "é"}], "n": [1, 2.5, None]}
+
+
+@pytest.fixture(params=available_decoders())
+def decoder(request):
+    return get_decoder(request.param)
+
+
+class TestGetDecoder:
+    def test_auto_is_the_fastest_installed(self):
+        assert get_decoder("auto").name == available_decoders()[0]
+        assert "json" in available_decoders()
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unknown JSON decoder"):
+            get_decoder("simdjson")
+
+
+class TestLoadJson:
+    def test_sources_decode_alike(self, tmp_path, decoder):
+        path = tmp_path / "plan.json"
+        path.write_text(json.dumps(DOCUMENT), encoding="utf-8")
+
+        assert load_json(str(path), decoder) == DOCUMENT
+        with open(path, "rb") as fh:
+            assert load_json(fh, decoder) == DOCUMENT
+        with open(path, encoding="utf-8") as fh:
+            assert load_json(fh, decoder) == DOCUMENT
+        assert load_json(io.BytesIO(path.read_bytes()), decoder) == DOCUMENT
+
+    def test_errors_are_value_errors(self, tmp_path, decoder):
+        empty = tmp_path / "empty.json"
+        empty.touch()
+        truncated = tmp_path / "truncated.json"
+        truncated.write_text('{"resource_changes": [')
+
+        for path in (empty, truncated):
+            with pytest.raises(ValueError):
+                load_json(str(path), decoder)
+        assert gc.isenabled()
+
+
+class TestScanWithDecoder:
+    def test_same_findings_and_backend_recorded(self, tmp_path, decoder):
+        path = _write_plan(tmp_path, [_OPEN_SSH_SG])
+        stats = ScanStats()
+
+        findings = scan_plan(path, stats=stats, decoder=decoder.name)
+
+        expected = scan_plan(path, decoder="json")
+        assert [f.to_dict() for f in findings] == [f.to_dict() for f in expected]
+        assert stats.decoder == decoder.name
+
+    def test_streamed_and_parsed_input_have_no_decoder(self, tmp_path):
+        path = _write_plan(tmp_path, [_OPEN_SSH_SG])
+        for source, stream in ((path, True), (json.loads(open(path).read()), False)):
+            stats = ScanStats()
+            scan_plan(source, stream=stream, stats=stats)
+            assert stats.decoder is None
+
+    def test_backend_in_cli_summary_and_report(self, tmp_path, capsys):
+        from cloudsentry_cli.cli import build_parser, cmd_scan
+
+        path = _write_plan(tmp_path, [])
+        out = tmp_path / "report.json"
+        args = build_parser().parse_args(
+            ["scan", "--input", path, "--decoder", "json", "--output", str(out)]
+        )
+
+        assert cmd_scan(args) == 0
+        assert "Decoder        : json" in capsys.readouterr().out
+        assert json.loads(out.read_text())["decoder"] == "json"
+
+    def test_missing_backend_is_an_error(self, tmp_path, capsys, monkeypatch):
+        from cloudsentry_cli import cli
+
+        def missing(name="auto"):
+            raise ImportError(f"JSON decoder {name!r} is not installed")
+
+        monkeypatch.setattr(cli, "get_decoder", missing)
+        args = cli.build_parser().parse_args(
+            ["scan", "--input", _write_plan(tmp_path, []), "--decoder", "orjson"]
+        )
+
+        assert cli.cmd_scan(args) == 1
+        assert "not installed" in capsys.readouterr().err
@@ -0,0 +1,60 @@
+"""Tests for the Finding and Severity types."""
+
+from __future__ import annotations
+
+import pickle
+
+import pytest
+
+from cloudsentry_cli.checks import S3_PUBLIC_ACL
+from cloudsentry_cli.findings import Finding, Severity
+
+
+class TestSeverity:
+    def test_ranks_order_by_severity(self):
+        assert Severity.LOW < Severity.MEDIUM < Severity.HIGH < Severity.CRITICAL
+
+    def test_parse_is_case_insensitive(self):
+        assert Severity.parse("high") is Severity.HIGH
+        assert Severity.parse(Severity.LOW) is Severity.LOW
+
+    def test_parse_rejects_unknown(self):
+        with pytest.raises(ValueError, match="Unknown severity"):
+            Severity.parse("SEVERE")
+
+
+class TestFinding:
+    def test_dict_style_access(self):
+        finding = S3_PUBLIC_ACL.finding("aws_s3_bucket.logs", acl="public-read")
+        assert finding["severity"] == "HIGH"
+        assert finding.get("rule_id") == "CS-S3-001"
+        assert finding.get("missing") is None
+        assert list(finding) == list(finding.to_dict())
+
+    def test_has_no_instance_dict(self):
+        finding = S3_PUBLIC_ACL.finding("aws_s3_bucket.logs", acl="public-read")
+        assert not hasattr(finding, "__dict__")
+
+    def test_dict_round_trip(self):
+        finding = S3_PUBLIC_ACL.finding("aws_s3_bucket.logs", acl="public-read")
+        assert Finding.from_dict(finding.to_dict()) == finding
+        assert finding == finding.to_dict()
+
+    def test_without_rule_has_classic_keys(self):
+        finding = Finding("x.y", Severity.LOW, "issue", "fix")
+        assert finding.to_dict() == {
+            "resource": "x.y", "issue": "issue",
+            "severity": "LOW", "recommendation": "fix",
+        }
+        with pytest.raises(KeyError):
+            finding["rule_id"]
+
+    def test_unlabelled_form_takes_resource(self):
+        finding = Finding("x.y", Severity.LOW, "issue", "fix")
+        stored = finding.to_dict(resource=False)
+        assert "resource" not in stored
+        assert Finding.from_dict(stored, resource="x.y") == finding
+
+    def test_picklable_for_process_pools(self):
+        finding = S3_PUBLIC_ACL.finding("aws_s3_bucket.logs", acl="public-read")
+        assert pickle.loads(pickle.dumps(finding)) == finding
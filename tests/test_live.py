@@ -0,0 +1,491 @@
+"""Tests for the live AWS collectors and the ``live`` sub-command."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+import cloudsentry
+from cloudsentry_cli import live
+from cloudsentry_cli.checks import check_iam_user_credentials, check_sg_open_ingress
+from cloudsentry_cli.live import (
+    CollectContext,
+    collect,
+    collect_iam_users,
+    parse_credential_report,
+    security_group_resource,
+)
+from cloudsentry_cli.scanner import evaluate_resources
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+CREDENTIAL_REPORT = Path(__file__).parent / "fixtures" / "credential_report.csv"
+
+
+# ---------------------------------------------------------------------------
+# Fake AWS clients
+# ---------------------------------------------------------------------------
+
+class _Paginator:
+    def __init__(self, pages):
+        self._pages = pages
+
+    def paginate(self, **kwargs):
+        return iter(self._pages(**kwargs))
+
+
+class _FakeIam:
+    """IAM client with two pages of users and (optionally slow) per-user calls."""
+
+    def __init__(self, users, delay=0.0, fetched=None, errors=None):
+        self.users = users
+        self.delay = delay
+        self.errors = errors or {}
+        self.fetched = fetched if fetched is not None else []
+        self.described = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get_paginator(self, operation):
+        return _Paginator(getattr(self, "_" + operation))
+
+    def generate_credential_report(self):
+        raise TimeoutError("no credential report in this fake")
+
+    def _list_users(self):
+        self.fetched.append("iam")
+        half = len(self.users) // 2
+        yield {"Users": [{"UserName": u} for u in self.users[:half]]}
+        yield {"Users": [{"UserName": u} for u in self.users[half:]]}
+
+    def _list_mfa_devices(self, UserName):
+        with self._lock:
+            self.described.append(UserName)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if UserName in self.errors:
+            raise live.ClientError(
+                {"Error": {"Code": self.errors[UserName], "Message": UserName}},
+                "ListMFADevices",
+            )
+        yield {"MFADevices": [{"SerialNumber": "x"}] if UserName.endswith("mfa") else []}
+
+    def _list_access_keys(self, UserName):
+        yield {"AccessKeyMetadata": [{"CreateDate": NOW - timedelta(days=100)}]}
+
+
+class _ReportIam(_FakeIam):
+    """Fake IAM client that serves the recorded credential report."""
+
+    REPORTED = ["alice", "bob", "ci-deploy", "legacy"]
+
+    def __init__(self, states=("STARTED", "COMPLETE"), users=REPORTED, errors=None):
+        super().__init__(list(users), errors=errors)
+        self.states = list(states)
+
+    def generate_credential_report(self):
+        return {"State": self.states.pop(0)}
+
+    def get_credential_report(self):
+        return {"Content": CREDENTIAL_REPORT.read_bytes(), "ReportFormat": "text/csv"}
+
+
+class _FakeEc2:
+    def __init__(self, region, fetched):
+        self.region = region
+        self.fetched = fetched
+
+    def get_paginator(self, operation):
+        assert operation == "describe_security_groups"
+        return _Paginator(self._describe_security_groups)
+
+    def _describe_security_groups(self):
+        self.fetched.append(self.region)
+        if self.region == "ap-east-1":
+            raise RuntimeError("region not enabled")
+        yield {"SecurityGroups": [{
+            "GroupId": f"sg-{self.region}",
+            "IpPermissions": [{"IpProtocol": "tcp", "FromPort": 22, "ToPort": 22,
+                               "IpRanges": [{"CidrIp": "0.0.0.0/0"}]}],
+        }]}
+
+
+class _FakeSts:
+    def get_caller_identity(self):
+        return {"Account": "111111111111"}
+
+
+class _FakeSession:
+    region_name = "us-east-1"
+
+    def __init__(self, users, fetched):
+        self.users = users
+        self.fetched = fetched
+
+    def client(self, service, region_name=None, config=None):
+        if service == "sts":
+            return _FakeSts()
+        if service == "iam":
+            return _FakeIam(self.users, fetched=self.fetched)
+        return _FakeEc2(region_name or self.region_name, self.fetched)
+
+
+def _ctx(iam, **options):
+    return CollectContext("111111111111", "global", {"iam": iam}, NOW, options)
+
+
+# ---------------------------------------------------------------------------
+# IAM users
+# ---------------------------------------------------------------------------
+
+class TestCollectIamUsers:
+    def test_all_pages_in_order(self):
+        names = [f"user-{i}" for i in range(9)] + ["ops-mfa"]
+        users = collect_iam_users(_ctx(_FakeIam(names), iam_source="api", iam_workers=4))
+
+        assert [rc.name for rc in users] == names
+        assert [rc.after["mfa_enabled"] for rc in users] == [False] * 9 + [True]
+        assert users[0].after["access_keys"] == [{"age_days": 100}]
+        assert users[0].type == "aws_iam_user"
+
+    def test_per_user_calls_are_bounded(self):
+        iam = _FakeIam([f"user-{i}" for i in range(12)], delay=0.02)
+        collect_iam_users(_ctx(iam, iam_source="api", iam_workers=3))
+
+        assert 1 < iam.peak <= 3
+
+    def test_unknown_source(self):
+        with pytest.raises(ValueError, match="Unknown IAM source"):
+            collect_iam_users(_ctx(_FakeIam([]), iam_source="scim"))
+
+    def test_report_timeout_falls_back_to_api(self, capsys):
+        iam = _FakeIam(["alice"])
+        users = collect_iam_users(_ctx(iam))
+
+        assert [rc.name for rc in users] == ["alice"]
+        assert iam.fetched == ["iam"]
+        err = capsys.readouterr().err
+        assert err.count("\n") == 1
+        assert "111111111111: IAM credential report unavailable" in err
+        assert "no credential report in this fake" in err
+
+
+class TestCredentialReport:
+    def test_parse_recorded_report(self):
+        with open(CREDENTIAL_REPORT, newline="") as fh:
+            rows = {user.name: (user, complete) for user, complete in parse_credential_report(fh)}
+
+        assert list(rows) == ["alice", "bob", "ci-deploy", "legacy"]
+        alice, complete = rows["alice"]
+        assert complete and alice.mfa is True
+        assert alice.key_dates == [datetime(2024, 4, 1, tzinfo=timezone.utc)]
+        assert len(rows["bob"][0].key_dates) == 2
+        assert rows["ci-deploy"][0].key_dates == [] and rows["ci-deploy"][1] is True
+        # Active key without a rotation date: needs the API.
+        assert rows["legacy"][1] is False
+
+    def test_missing_column_is_incomplete(self):
+        lines = ["user,arn,mfa_active\n", "dave,arn:aws:iam::1:user/dave,true\n"]
+        [(user, complete)] = parse_credential_report(lines)
+
+        assert user.mfa is True
+        assert complete is False
+
+    def test_api_only_for_incomplete_rows(self):
+        sleeps = []
+        iam = _ReportIam()
+        users = collect_iam_users(_ctx(iam, iam_workers=2, sleep=sleeps.append))
+
+        assert sleeps == [live.CREDENTIAL_REPORT_POLL_SECONDS]
+        assert [rc.name for rc in users] == ["alice", "bob", "ci-deploy", "legacy"]
+        assert iam.described == ["legacy"]
+        assert users[3].after["access_keys"] == [{"age_days": 100}]
+
+    def test_reconciled_with_list_users(self):
+        # ci-deploy was deleted and carol created since the report was generated.
+        iam = _ReportIam(users=["alice", "bob", "carol", "legacy"])
+        users = collect_iam_users(_ctx(iam, iam_workers=1, sleep=lambda s: None))
+
+        assert [rc.name for rc in users] == ["alice", "bob", "carol", "legacy"]
+        assert iam.described == ["carol", "legacy"]
+
+    def test_user_deleted_during_lookup_is_dropped(self, capsys):
+        iam = _ReportIam(errors={"legacy": "NoSuchEntity"})
+        users = collect_iam_users(_ctx(iam, sleep=lambda s: None))
+
+        assert [rc.name for rc in users] == ["alice", "bob", "ci-deploy"]
+        assert capsys.readouterr().err == ""
+
+    def test_lookup_error_is_not_a_report_fallback(self, capsys):
+        iam = _ReportIam(errors={"legacy": "Throttling"})
+        with pytest.raises(live.ClientError, match="Throttling"):
+            collect_iam_users(_ctx(iam, sleep=lambda s: None))
+
+        assert iam.fetched == ["iam"]
+        assert "credential report unavailable" not in capsys.readouterr().err
+
+    def test_findings_through_the_check_engine(self):
+        users = collect_iam_users(_ctx(_ReportIam(), sleep=lambda s: None))
+        findings = list(evaluate_resources(users))
+
+        assert [(f.resource, f.rule_id) for f in findings] == [
+            ("aws_iam_user.bob", "CS-IAM-001"),
+            ("aws_iam_user.legacy", "CS-IAM-001"),
+        ]
+
+
+class TestCheckIamUserCredentials:
+    def test_admin_without_mfa(self):
+        findings = check_iam_user_credentials(
+            "aws_iam_user", "root-ish",
+            {"admin": True, "mfa_enabled": False, "access_keys": [{"age_days": 91}]},
+        )
+        assert [f.rule_id for f in findings] == ["CS-IAM-001", "CS-IAM-002"]
+        assert findings[0]["issue"] == "Access key not rotated in over 90 days"
+
+    def test_plan_resource_has_no_credential_state(self):
+        assert check_iam_user_credentials("aws_iam_user", "ci", {"name": "ci"}) == []
+
+
+# ---------------------------------------------------------------------------
+# Security groups
+# ---------------------------------------------------------------------------
+
+class TestSecurityGroupResource:
+    def test_all_traffic_rule_is_caught(self):
+        """IpProtocol -1 has no FromPort; the shared check still flags SSH/RDP."""
+        rc = security_group_resource({
+            "GroupId": "sg-1",
+            "IpPermissions": [{"IpProtocol": "-1", "IpRanges": [],
+                               "Ipv6Ranges": [{"CidrIpv6": "::/0"}]}],
+        })
+        findings = check_sg_open_ingress(rc.type, rc.name, rc.after)
+
+        assert [f.params["port"] for f in findings] == [22, 3389]
+        assert findings[0].resource == "aws_security_group.sg-1"
+
+    def test_private_range_is_not_flagged(self):
+        rc = security_group_resource({
+            "GroupId": "sg-2",
+            "IpPermissions": [{"IpProtocol": "tcp", "FromPort": 22, "ToPort": 22,
+                               "IpRanges": [{"CidrIp": "10.0.0.0/8"}]}],
+        })
+        assert check_sg_open_ingress(rc.type, rc.name, rc.after) == []
+
+
+# ---------------------------------------------------------------------------
+# Fan-out
+# ---------------------------------------------------------------------------
+
+ROLE = "arn:aws:iam::{}:role/cloudsentry-audit"
+
+
+def _session_for(fetched):
+    def session_for(role_arn):
+        if role_arn and "999999999999" in role_arn:
+            raise RuntimeError("AccessDenied on sts:AssumeRole")
+        return _FakeSession(["alice"], fetched)
+    return session_for
+
+
+def _collect(*args, fetched=None, **kwargs):
+    kwargs.setdefault("options", {"iam_source": "api"})
+    return list(collect(*args, session_for=_session_for(fetched if fetched is not None else []),
+                        now=NOW, **kwargs))
+
+
+class TestCollect:
+    def test_current_account_default_region(self):
+        results = _collect()
+
+        assert [r.target for r in results] == [
+            ("111111111111", "global", "iam_users"),
+            ("111111111111", "us-east-1", "security_groups"),
+        ]
+        assert all(r.error is None and r.fetched_at == NOW for r in results)
+
+    def test_accounts_and_regions_in_order(self):
+        roles = [ROLE.format("222222222222"), ROLE.format("333333333333")]
+        results = _collect(roles, ["eu-west-1", "us-west-2"], workers=4)
+
+        assert [r.target.label for r in results] == [
+            "222222222222/global/iam_users",
+            "222222222222/eu-west-1/security_groups",
+            "222222222222/us-west-2/security_groups",
+            "333333333333/global/iam_users",
+            "333333333333/eu-west-1/security_groups",
+            "333333333333/us-west-2/security_groups",
+        ]
+        assert results[1].resources[0].name == "sg-eu-west-1"
+
+    def test_failed_targets_do_not_stop_the_rest(self):
+        roles = [ROLE.format("999999999999"), ROLE.format("222222222222")]
+        results = _collect(roles, ["eu-west-1", "ap-east-1"])
+
+        errors = [(r.target.label, r.error) for r in results if r.error]
+        assert errors == [
+            (f"{roles[0]}/*/*", "AccessDenied on sts:AssumeRole"),
+            ("222222222222/ap-east-1/security_groups", "region not enabled"),
+        ]
+        assert len([r for r in results if r.error is None]) == 2
+
+    def test_collector_selection(self):
+        results = _collect(collectors=["security_groups"])
+        assert [r.target.collector for r in results] == ["security_groups"]
+
+
+# ---------------------------------------------------------------------------
+# botocore Stubber
+# ---------------------------------------------------------------------------
+
+class TestWithStubber:
+    @pytest.fixture
+    def iam(self):
+        botocore_session = pytest.importorskip("botocore.session")
+        stub = pytest.importorskip("botocore.stub")
+        client = botocore_session.get_session().create_client(
+            "iam",
+            region_name="us-east-1",
+            aws_access_key_id="testing",
+            aws_secret_access_key="testing",
+        )
+        with stub.Stubber(client) as stubber:
+            yield client, stubber
+            stubber.assert_no_pending_responses()
+
+    def test_paginates_users_mfa_and_keys(self, iam):
+        client, stubber = iam
+        created = NOW - timedelta(days=365)
+
+        def user(name):
+            return {
+                "Path": "/", "UserName": name, "UserId": "AIDA" + name.upper().ljust(16, "X"),
+                "Arn": f"arn:aws:iam::123456789012:user/{name}", "CreateDate": created,
+            }
+
+        stubber.add_response(
+            "list_users", {"Users": [user("alice")], "IsTruncated": True, "Marker": "m1"}, {}
+        )
+        stubber.add_response(
+            "list_users", {"Users": [user("bob")], "IsTruncated": False}, {"Marker": "m1"}
+        )
+        for name, mfa in (("alice", True), ("bob", False)):
+            devices = [{
+                "UserName": name, "SerialNumber": f"arn:aws:iam::123456789012:mfa/{name}",
+                "EnableDate": created,
+            }] if mfa else []
+            stubber.add_response(
+                "list_mfa_devices", {"MFADevices": devices, "IsTruncated": False},
+                {"UserName": name},
+            )
+            stubber.add_response(
+                "list_access_keys",
+                {"AccessKeyMetadata": [{
+                    "UserName": name, "AccessKeyId": "AKIA" + "X" * 16,
+                    "Status": "Active", "CreateDate": created,
+                }], "IsTruncated": False},
+                {"UserName": name},
+            )
+
+        # Stubber replays responses in order, so run the per-user calls serially.
+        users = collect_iam_users(_ctx(client, iam_source="api", iam_workers=1))
+
+        assert [rc.name for rc in users] == ["alice", "bob"]
+        assert [rc.after["mfa_enabled"] for rc in users] == [True, False]
+        assert users[0].after["access_keys"] == [{"age_days": 365}]
+
+    def test_report_access_denied_falls_back_to_api(self, iam, capsys):
+        client, stubber = iam
+        stubber.add_client_error(
+            "generate_credential_report", "AccessDenied", http_status_code=403
+        )
+        stubber.add_response("list_users", {"Users": [], "IsTruncated": False}, {})
+
+        assert collect_iam_users(_ctx(client)) == []
+        assert "AccessDenied" in capsys.readouterr().err
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+class TestLiveCommand:
+    def _run(self, tmp_path, *argv):
+        from cloudsentry_cli.cli import build_parser, cmd_live
+
+        out = tmp_path / "report.json"
+        args = build_parser().parse_args(["live", *argv, "--output", str(out)])
+        return cmd_live(args), out
+
+    def test_mock_inventory_fails_the_gate(self, tmp_path):
+        rc, out = self._run(tmp_path, "--mock")
+        report = json.loads(out.read_text())
+
+        assert rc == 1
+        assert report["mode"] == "mock"
+        assert report["summary"]["targets"] == 2
+        assert report["summary"]["high"] == 3
+        assert [p["input"] for p in report["plans"]] == [
+            "mock/global/iam_users", "mock/us-east-1/security_groups",
+        ]
+
+    def test_findings_carry_account_and_region(self, tmp_path):
+        _, out = self._run(tmp_path, "--mock")
+        report = json.loads(out.read_text())
+
+        tags = {
+            (f["resource"], f["params"]["account"], f["params"]["region"])
+            for plan in report["plans"] for f in plan["findings"]
+        }
+        assert tags == {
+            ("aws_iam_user.test-admin", "mock", "global"),
+            ("aws_security_group.sg-0123", "mock", "us-east-1"),
+        }
+
+    def test_fail_fast_stops_at_first_failing_target(self, tmp_path):
+        rc, out = self._run(tmp_path, "--mock", "--fail-fast")
+        report = json.loads(out.read_text())
+
+        assert rc == 1 and report["partial"] is True
+        assert len(report["plans"]) == 1
+
+    def test_missing_snapshot(self, tmp_path, capsys):
+        rc, _ = self._run(tmp_path, "--snapshot", str(tmp_path / "nope.sqlite"))
+
+        assert rc == 1
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert captured.err == f"ERROR: Snapshot not found: {tmp_path / 'nope.sqlite'}\n"
+
+    def test_snapshot_ttl_validation(self):
+        from cloudsentry_cli.cli import build_parser
+
+        with pytest.raises(SystemExit):
+            build_parser().parse_args(["live", "--snapshot-ttl", "lambdas=60"])
+
+
+class TestLegacyEntryPoint:
+    def test_environment_maps_to_live_options(self):
+        argv = cloudsentry.live_argv({
+            "CLOUDSENTRY_MODE": "aws",
+            "CLOUDSENTRY_REGIONS": "us-east-1, eu-west-1",
+            "CLOUDSENTRY_SNAPSHOT_TTL_EC2": "60",
+        })
+        assert argv == [
+            "live", "--region", "us-east-1", "--region", "eu-west-1",
+            "--snapshot-ttl", "security_groups=60",
+        ]
+
+    def test_mock_is_the_default(self):
+        assert cloudsentry.live_argv({}) == ["live", "--mock"]
+        assert cloudsentry.live_argv({}, ["--snapshot", "inv.sqlite"]) == [
+            "live", "--snapshot", "inv.sqlite",
+        ]
@@ -0,0 +1,81 @@
+"""Tests for the network exposure engine."""
+
+from __future__ import annotations
+
+import pytest
+
+from cloudsentry_cli.checks import check_sg_open_ingress
+from cloudsentry_cli.network import ExposureMatcher
+
+SSH_RDP = ExposureMatcher(risky_ports=(3389, 22))
+
+
+def _rule(cidrs=(), ipv6=(), from_port=0, to_port=65535, **extra) -> dict:
+    return {
+        "from_port": from_port,
+        "to_port": to_port,
+        "cidr_blocks": list(cidrs),
+        "ipv6_cidr_blocks": list(ipv6),
+        **extra,
+    }
+
+
+class TestIsWorld:
+    @pytest.mark.parametrize("cidr", [
+        "0.0.0.0/0", "0.0.0.0/1", "128.0.0.0/1", " 1.2.3.4/0 ",
+        "::/0", "2000::/3",
+    ])
+    def test_wide_public_ranges(self, cidr):
+        assert SSH_RDP.is_world(cidr)
+
+    @pytest.mark.parametrize("cidr", [
+        "10.0.0.0/8", "172.16.0.0/12", "192.168.1.0/24", "203.0.113.7/32",
+        "8.8.8.0/24", "52.0.0.0/8", "64.0.0.0/2", "2600::/12", "fc00::/7",
+        "2001:db8::/32", "not-a-cidr", "",
+    ])
+    def test_private_narrow_or_invalid(self, cidr):
+        assert not SSH_RDP.is_world(cidr)
+
+    def test_wider_threshold_is_opt_in(self):
+        strict = ExposureMatcher(risky_ports=(22,), wide_prefixlen={4: 8, 6: 32})
+        assert strict.is_world("52.0.0.0/8")
+        assert strict.is_world("2600::/32")
+        assert not strict.is_world("10.0.0.0/8")
+
+
+class TestExposedPorts:
+    def test_ports_sorted_and_range_bounded(self):
+        assert SSH_RDP.exposed_ports(_rule(["0.0.0.0/0"])) == [22, 3389]
+        assert SSH_RDP.exposed_ports(_rule(["0.0.0.0/0"], from_port=20, to_port=23)) == [22]
+        assert SSH_RDP.exposed_ports(_rule(["0.0.0.0/0"], from_port=80, to_port=80)) == []
+
+    def test_exposure_names_the_matching_cidr(self):
+        rule = _rule(["10.0.0.0/8", " 0.0.0.0/1 ", "0.0.0.0/0"], from_port=22, to_port=22)
+        assert SSH_RDP.exposure(rule) == ([22], "0.0.0.0/1")
+        assert SSH_RDP.exposure(_rule(["52.0.0.0/8"])) == ([], None)
+
+    def test_any_world_cidr_among_many(self):
+        cidrs = [f"10.{i // 256}.{i % 256}.0/24" for i in range(2000)] + ["0.0.0.0/1"]
+        assert SSH_RDP.exposed_ports(_rule(cidrs, from_port=22, to_port=22)) == [22]
+
+    def test_all_protocols_open_every_port(self):
+        rule = _rule(["0.0.0.0/0"], from_port=0, to_port=0, protocol="-1")
+        assert SSH_RDP.exposed_ports(rule) == [22, 3389]
+
+    def test_icmp_opens_no_ports(self):
+        rule = _rule(["0.0.0.0/0"], from_port=-1, to_port=-1, protocol="icmp")
+        assert SSH_RDP.exposed_ports(rule) == []
+
+
+class TestCheckUsesEngine:
+    def test_half_internet_on_security_group(self):
+        after = {"ingress": [_rule(["0.0.0.0/1", "128.0.0.0/1"], from_port=22, to_port=22)]}
+        findings = check_sg_open_ingress("aws_security_group", "split", after)
+        assert len(findings) == 1
+        assert findings[0].params == {"port": 22, "cidr": "0.0.0.0/1"}
+        assert "(0.0.0.0/1)" in findings[0].issue
+
+    def test_half_internet_on_standalone_rule(self):
+        after = dict(_rule(ipv6=["2000::/3"], from_port=3389, to_port=3389), type="ingress")
+        findings = check_sg_open_ingress("aws_security_group_rule", "rdp", after)
+        assert ["3389" in f["issue"] for f in findings] == [True]
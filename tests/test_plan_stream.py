@@ -0,0 +1,98 @@
+"""Tests for the streaming Terraform plan reader."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from cloudsentry_cli.plan_stream import ResourceChange, iter_resource_changes
+from cloudsentry_cli.scanner import scan_plan
+
+
+def _write(tmp_path: Path, text: str) -> str:
+    plan_file = tmp_path / "tfplan.json"
+    plan_file.write_text(text)
+    return str(plan_file)
+
+
+def _bloated_plan() -> dict:
+    """A plan whose non-resource_changes subtrees contain tricky strings."""
+    return {
+        "format_version": "1.2",
+        "prior_state": {"values": {"note": 'brackets } ] { [ and "quotes" \\'}},
+        "planned_values": [1, 2.5, True, None, {"x": ["y", {"z": "}"}]}],
+        "resource_changes": [
+            {
+                "address": "module.net.aws_security_group.web",
+                "type": "aws_security_group",
+                "name": "web",
+                "change": {
+                    "actions": ["create"],
+                    "before": {"huge": "x" * 5000},
+                    "after": {
+                        "ingress": [
+                            {
+                                "from_port": 22,
+                                "to_port": 22,
+                                "cidr_blocks": ["0.0.0.0/0"],
+                                "ipv6_cidr_blocks": [],
+                            }
+                        ]
+                    },
+                },
+            },
+            {
+                "address": "aws_s3_bucket.logs",
+                "type": "aws_s3_bucket",
+                "name": "logs",
+                "change": {"actions": ["delete"], "after": None},
+            },
+        ],
+        "configuration": {"root_module": {"resources": [{"a": "ü ☃"}]}},
+    }
+
+
+class TestIterResourceChanges:
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+    def test_matches_full_parse(self, tmp_path, chunk_size):
+        path = _write(tmp_path, json.dumps(_bloated_plan(), indent=2))
+        changes = list(iter_resource_changes(path, chunk_size=chunk_size))
+        assert [rc.address for rc in changes] == [
+            "module.net.aws_security_group.web",
+            "aws_s3_bucket.logs",
+        ]
+        assert changes[0].actions == ["create"]
+        assert changes[0].after["ingress"][0]["from_port"] == 22
+        assert changes[1] == ResourceChange(
+            "aws_s3_bucket", "logs", "aws_s3_bucket.logs", ["delete"], None
+        )
+
+    def test_reads_open_binary_file(self, tmp_path):
+        path = _write(tmp_path, json.dumps(_bloated_plan(), ensure_ascii=False))
+        with open(path, "rb") as fh:
+            changes = list(iter_resource_changes(fh, chunk_size=7))
+            assert not fh.closed
+        assert [rc.name for rc in changes] == ["web", "logs"]
+
+    def test_missing_resource_changes_yields_nothing(self, tmp_path):
+        path = _write(tmp_path, '{"format_version": "1.2", "resource_changes": null}')
+        assert list(iter_resource_changes(path)) == []
+
+    def test_truncated_document_raises(self, tmp_path):
+        text = json.dumps(_bloated_plan())
+        path = _write(tmp_path, text[: len(text) // 2])
+        with pytest.raises(ValueError):
+            list(iter_resource_changes(path, chunk_size=16))
+
+    def test_missing_file_raises(self):
+        with pytest.raises(FileNotFoundError):
+            list(iter_resource_changes("/nonexistent/path/tfplan.json"))
+
+
+class TestScanPlanStream:
+    def test_stream_and_full_load_agree(self, tmp_path):
+        path = _write(tmp_path, json.dumps(_bloated_plan()))
+        assert scan_plan(path, stream=True) == scan_plan(path)
+        assert len(scan_plan(path, stream=True)) == 1
@@ -0,0 +1,84 @@
+"""Tests for scan profiling."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from cloudsentry_cli.cli import build_parser, cmd_scan
+from cloudsentry_cli.profile import ScanProfile
+from cloudsentry_cli.scanner import scan_plan
+
+
+def _plan(count: int) -> dict:
+    return {"resource_changes": [
+        {
+            "address": f"module.m.aws_s3_bucket.b{i}",
+            "type": "aws_s3_bucket",
+            "name": f"b{i}",
+            "change": {"actions": ["create"], "after": {"acl": "private"}},
+        }
+        for i in range(count)
+    ] + [{
+        "type": "aws_security_group",
+        "name": "web",
+        "change": {"actions": ["create"], "after": {"ingress": []}},
+    }]}
+
+
+class TestScanProfile:
+    def test_counts_calls_per_check(self):
+        profile = ScanProfile()
+        scan_plan(_plan(20), profile=profile)
+
+        checks = {c["check"]: c for c in profile.to_dict()["checks"]}
+        assert checks["check_s3_public_acl"]["calls"] == 20
+        assert checks["check_sg_open_ingress"]["calls"] == 1
+        slowest = checks["check_s3_public_acl"]["slowest"]
+        assert len(slowest) == 5
+        assert slowest[0]["resource"].startswith("module.m.aws_s3_bucket.")
+        assert slowest[0]["seconds"] >= slowest[-1]["seconds"]
+        assert profile.stages["evaluate"] > 0
+
+    def test_worker_profiles_are_merged(self, tmp_path, monkeypatch):
+        from cloudsentry_cli import scanner
+
+        monkeypatch.setattr(scanner, "PARALLEL_CHUNK_SIZE", 4)
+        path = tmp_path / "tfplan.json"
+        path.write_text(json.dumps(_plan(20)))
+        profile = ScanProfile()
+        scan_plan(str(path), jobs=2, profile=profile)
+
+        calls = {name: c.calls for name, c in profile.checks.items()}
+        assert calls == {"check_s3_public_acl": 20, "check_sg_open_ingress": 1}
+        assert profile.stages["load"] > 0
+
+
+class TestProfileOption:
+    def test_report_has_profile_section(self, tmp_path, capsys):
+        plan_file = tmp_path / "tfplan.json"
+        plan_file.write_text(json.dumps(_plan(3)))
+        out_file = tmp_path / "report.json"
+        args = build_parser().parse_args([
+            "scan", "--input", str(plan_file), "--output", str(out_file), "--profile",
+        ])
+        assert cmd_scan(args) == 0
+
+        profile = json.loads(Path(out_file).read_text())["profile"]
+        assert set(profile["stages"]) == {"load", "evaluate", "report"}
+        assert profile["checks"][0]["check"] in ("check_s3_public_acl", "check_sg_open_ingress")
+        assert "Profile" in capsys.readouterr().out
+
+    def test_batch_profiles_aggregate(self, tmp_path):
+        for name in ("a", "b"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "tfplan.json").write_text(json.dumps(_plan(2)))
+        out_file = tmp_path / "report.json"
+        args = build_parser().parse_args([
+            "scan", "--input", str(tmp_path / "*" / "tfplan.json"),
+            "--output", str(out_file), "--workers", "2", "--profile",
+        ])
+        cmd_scan(args)
+
+        checks = json.loads(out_file.read_text())["profile"]["checks"]
+        assert {c["check"]: c["calls"] for c in checks}["check_s3_public_acl"] == 4
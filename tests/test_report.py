@@ -0,0 +1,170 @@
+"""Tests for report writers and the report reader."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from cloudsentry_cli.cli import build_parser, cmd_scan
+from cloudsentry_cli.findings import Finding, Severity
+from cloudsentry_cli.report import CompactReportWriter, NdjsonReportWriter, read_report
+
+
+def _write_plan(tmp_path: Path, buckets: int) -> str:
+    plan_file = tmp_path / "tfplan.json"
+    plan_file.write_text(json.dumps({"resource_changes": [
+        {
+            "type": "aws_s3_bucket",
+            "name": f"b{i}",
+            "change": {"actions": ["create"], "after": {"acl": "public-read"}},
+        }
+        for i in range(buckets)
+    ]}))
+    return str(plan_file)
+
+
+def _scan(tmp_path: Path, *extra: str) -> tuple[int, Path]:
+    out_file = tmp_path / "report.out"
+    args = build_parser().parse_args(
+        ["scan", "--output", str(out_file), *extra]
+    )
+    return cmd_scan(args), out_file
+
+
+class TestNdjsonReport:
+    def test_findings_then_trailing_summary(self, tmp_path):
+        rc, out_file = _scan(
+            tmp_path, "--input", _write_plan(tmp_path, 3), "--format", "ndjson"
+        )
+        assert rc == 1
+
+        records = [json.loads(line) for line in out_file.read_text().splitlines()]
+        assert [r["resource"] for r in records[:-1]] == [
+            "aws_s3_bucket.b0", "aws_s3_bucket.b1", "aws_s3_bucket.b2",
+        ]
+        assert records[-1]["record"] == "summary"
+        assert records[-1]["summary"]["total_findings"] == 3
+        assert "findings" not in records[-1]
+
+    def test_same_findings_as_json_report(self, tmp_path):
+        plan = _write_plan(tmp_path, 5)
+        _, ndjson_file = _scan(tmp_path, "--input", plan, "--format", "ndjson")
+        ndjson_findings = [
+            json.loads(line) for line in ndjson_file.read_text().splitlines()
+        ][:-1]
+        _, json_file = _scan(tmp_path, "--input", plan)
+        assert json.loads(json_file.read_text())["findings"] == ndjson_findings
+
+    def test_missing_plan_keeps_previous_report(self, tmp_path):
+        _, out_file = _scan(
+            tmp_path, "--input", _write_plan(tmp_path, 2), "--format", "ndjson"
+        )
+        previous = out_file.read_text()
+        rc, _ = _scan(
+            tmp_path, "--input", str(tmp_path / "missing.json"), "--format", "ndjson"
+        )
+        assert rc == 1
+        assert out_file.read_text() == previous
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["report.out", "tfplan.json"]
+
+    def test_missing_plan_writes_nothing(self, tmp_path):
+        rc, out_file = _scan(
+            tmp_path, "--input", str(tmp_path / "missing.json"), "--format", "ndjson"
+        )
+        assert rc == 1
+        assert list(tmp_path.iterdir()) == []
+
+    def test_aborted_writer_leaves_no_file(self, tmp_path):
+        out_file = tmp_path / "report.ndjson"
+        writer = NdjsonReportWriter(str(out_file))
+        writer.write_finding(Finding("aws_s3_bucket.b", Severity.LOW, "issue", "fix"))
+        writer.abort()
+        assert list(tmp_path.iterdir()) == []
+
+
+def _write_mixed_plan(tmp_path: Path) -> str:
+    plan_file = tmp_path / "mixed.json"
+    plan_file.write_text(json.dumps({"resource_changes": [
+        {
+            "type": "aws_security_group",
+            "name": "web",
+            "change": {"actions": ["create"], "after": {"ingress": [{
+                "from_port": 22, "to_port": 3389, "protocol": "tcp",
+                "cidr_blocks": ["0.0.0.0/0"],
+            }]}},
+        },
+        {
+            "type": "aws_s3_bucket",
+            "name": "logs",
+            "change": {"actions": ["create"], "after": {"acl": "public-read"}},
+        },
+    ]}))
+    return str(plan_file)
+
+
+class TestCompactReport:
+    def test_rule_text_stored_once(self, tmp_path):
+        _, out_file = _scan(
+            tmp_path, "--input", _write_plan(tmp_path, 4), "--format", "compact"
+        )
+        report = json.loads(out_file.read_text())
+
+        assert report["format"] == "compact"
+        assert list(report["rules"]) == ["CS-S3-001"]
+        assert report["findings"][0] == [
+            "aws_s3_bucket.b0", "CS-S3-001", {"acl": "public-read"},
+        ]
+        assert report["summary"]["total_findings"] == 4
+
+    def test_unregistered_findings_kept_in_full(self, tmp_path):
+        finding = {"resource": "x.y", "issue": "i", "severity": "LOW",
+                   "recommendation": "r"}
+        writer = CompactReportWriter(str(tmp_path / "r.json"))
+        writer.write_finding(Finding.from_dict(finding))
+        writer.close({"tool": "cloudsentry-cli"})
+
+        report = json.loads((tmp_path / "r.json").read_text())
+        assert report["findings"] == [finding]
+        assert report["rules"] == {}
+
+
+class TestReadReport:
+    @pytest.mark.parametrize("fmt", ["compact", "ndjson"])
+    def test_round_trips_to_json_layout(self, tmp_path, fmt):
+        plan = _write_mixed_plan(tmp_path)
+        _, json_file = _scan(tmp_path, "--input", plan)
+        expected = json.loads(json_file.read_text())
+        _, out_file = _scan(tmp_path, "--input", plan, "--format", fmt)
+
+        report = read_report(str(out_file))
+        assert report["findings"] == expected["findings"]
+        assert report["summary"] == expected["summary"]
+
+    @pytest.mark.parametrize("fmt", ["compact", "ndjson"])
+    def test_batch_round_trip(self, tmp_path, fmt):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        _write_mixed_plan(tmp_path / "a")
+        _write_plan(tmp_path / "b", 2)
+        pattern = str(tmp_path / "*" / "*.json")
+        _, json_file = _scan(tmp_path, "--input", pattern, "--workers", "1")
+        expected = json.loads(json_file.read_text())
+        _, out_file = _scan(
+            tmp_path, "--input", pattern, "--workers", "1", "--format", fmt
+        )
+
+        assert read_report(str(out_file))["plans"] == expected["plans"]
+
+    def test_json_report_returned_unchanged(self, tmp_path):
+        _, out_file = _scan(tmp_path, "--input", _write_plan(tmp_path, 1))
+        assert read_report(str(out_file)) == json.loads(out_file.read_text())
+
+    def test_truncated_ndjson_rejected(self, tmp_path):
+        _, out_file = _scan(
+            tmp_path, "--input", _write_plan(tmp_path, 2), "--format", "ndjson"
+        )
+        out_file.write_text("".join(out_file.read_text().splitlines(True)[:-1]))
+        with pytest.raises(ValueError, match="no summary"):
+            read_report(str(out_file))
@@ -0,0 +1,148 @@
+"""Tests for declarative rule files."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from cloudsentry_cli import checks, rulefile
+from cloudsentry_cli.rulefile import load_rule_file, register_rule_files
+from cloudsentry_cli.scanner import scan_plan
+
+
+def _rule(operator: tuple = ("equals", True), **overrides) -> dict:
+    rule = {
+        "id": "CS-RDS-001",
+        "resource_types": ["aws_db_instance"],
+        "attribute": "storage_encrypted",
+        operator[0]: operator[1],
+        "severity": "high",
+        "issue": "RDS instance storage is not encrypted",
+        "recommendation": "Set storage_encrypted = true.",
+    }
+    rule.update(overrides)
+    return rule
+
+
+def _write_rules(tmp_path: Path, *rules: dict, name: str = "rules.json") -> str:
+    path = tmp_path / name
+    path.write_text(json.dumps({"rules": list(rules)}))
+    return str(path)
+
+
+@pytest.fixture
+def isolated_registry(monkeypatch):
+    """Keep rules registered by a test out of the global check registry."""
+    monkeypatch.setattr(checks, "CHECKS", list(checks.CHECKS))
+    monkeypatch.setattr(checks, "_DISPATCH_INDEX", checks._DISPATCH_INDEX)
+    monkeypatch.setattr(checks, "RULES", dict(checks.RULES))
+    monkeypatch.setattr(rulefile, "_loaded_files", {})
+
+
+class TestCompiledRules:
+    @pytest.mark.parametrize("value, violates", [
+        (True, False), (False, True), (None, True), (1, True),
+    ])
+    def test_equals_true(self, tmp_path, value, violates):
+        [check] = load_rule_file(_write_rules(tmp_path, _rule()), tmp_path / "cache")
+        after = {} if value is None else {"storage_encrypted": value}
+        findings = check("aws_db_instance", "db", after)
+        assert bool(findings) is violates
+        if findings:
+            assert findings[0]["severity"] == "HIGH"
+            assert findings[0]["resource"] == "aws_db_instance.db"
+
+    def test_nested_path_and_not_one_of(self, tmp_path):
+        rule = _rule(("not_one_of", ["", "tmp"]), attribute="logging.0.target_bucket")
+        [check] = load_rule_file(_write_rules(tmp_path, rule), tmp_path / "cache")
+        assert check("aws_s3_bucket", "b", {"logging": [{"target_bucket": "tmp"}]})
+        assert not check("aws_s3_bucket", "b", {"logging": [{"target_bucket": "logs"}]})
+        assert not check("aws_s3_bucket", "b", {"logging": []})
+
+    def test_present_false(self, tmp_path):
+        rule = _rule(("present", False), attribute="password")
+        [check] = load_rule_file(_write_rules(tmp_path, rule), tmp_path / "cache")
+        assert check("aws_db_instance", "db", {"password": "hunter2"})
+        assert not check("aws_db_instance", "db", {"password": None})
+
+    @pytest.mark.parametrize("overrides", [
+        {"id": ""},
+        {"severity": "SEVERE"},
+        {"one_of": [1]},
+        {"resource_types": []},
+        {"resource_types": 5},
+        {"resource_types": {"aws_db_instance": True}},
+    ])
+    def test_invalid_rule_rejected(self, tmp_path, overrides):
+        with pytest.raises(ValueError):
+            load_rule_file(_write_rules(tmp_path, _rule(**overrides)), tmp_path / "cache")
+
+    def test_conflicting_redefinition_rejected(self, tmp_path, isolated_registry):
+        load_rule_file(_write_rules(tmp_path, _rule()), tmp_path / "cache")
+        with pytest.raises(ValueError, match="already defined"):
+            load_rule_file(
+                _write_rules(tmp_path, _rule(severity="LOW"), name="other.json"),
+                tmp_path / "cache",
+            )
+
+    def test_yaml_rule_file(self, tmp_path):
+        yaml = pytest.importorskip("yaml")
+        path = tmp_path / "rules.yaml"
+        path.write_text(yaml.safe_dump({"rules": [_rule()]}))
+        [check] = load_rule_file(str(path), tmp_path / "cache")
+        assert check("aws_db_instance", "db", {})
+
+
+class TestRuleCache:
+    def test_cached_specs_reused_and_keyed_by_content(
+        self, tmp_path, monkeypatch, isolated_registry
+    ):
+        cache_dir = tmp_path / "cache"
+        path = _write_rules(tmp_path, _rule())
+        _parse = rulefile._parse
+        load_rule_file(path, cache_dir)
+        assert len(list(cache_dir.glob("*.json"))) == 1
+
+        monkeypatch.setattr(rulefile, "_parse", lambda *a: pytest.fail("re-parsed"))
+        [check] = load_rule_file(path, cache_dir)
+        assert check.rule_id == "CS-RDS-001"
+
+        monkeypatch.setattr(rulefile, "_parse", _parse)
+        load_rule_file(_write_rules(tmp_path, _rule(id="CS-RDS-002")), cache_dir)
+        assert len(list(cache_dir.glob("*.json"))) == 2
+
+    def test_pool_workers_use_the_same_cache_dir(
+        self, tmp_path, monkeypatch, isolated_registry
+    ):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+        cache_dir = tmp_path / "cache"
+        register_rule_files([_write_rules(tmp_path, _rule())], cache_dir)
+        files = rulefile.loaded_rule_files()
+        assert files == [(str(tmp_path / "rules.json"), cache_dir)]
+
+        # A spawned worker starts with no rule files registered.
+        monkeypatch.setattr(rulefile, "_loaded_files", {})
+        monkeypatch.setattr(rulefile, "_parse", lambda *a: pytest.fail("re-parsed"))
+        rulefile.register_loaded_rule_files(files)
+
+        assert rulefile.loaded_rule_files() == files
+        assert not (tmp_path / "xdg").exists()
+
+
+class TestRegisteredRules:
+    def test_rules_run_alongside_builtin_checks(self, tmp_path, isolated_registry):
+        rules = _write_rules(tmp_path, _rule())
+        assert register_rule_files([rules], tmp_path / "cache") == 1
+        assert register_rule_files([rules], tmp_path / "cache") == 0
+
+        plan = tmp_path / "tfplan.json"
+        plan.write_text(json.dumps({"resource_changes": [
+            {"type": "aws_db_instance", "name": "db",
+             "change": {"actions": ["create"], "after": {"storage_encrypted": False}}},
+            {"type": "aws_s3_bucket", "name": "b",
+             "change": {"actions": ["create"], "after": {"acl": "public-read"}}},
+        ]}))
+        findings = scan_plan(str(plan))
+        assert [f["resource"] for f in findings] == ["aws_db_instance.db", "aws_s3_bucket.b"]
@@ -8,9 +8,14 @@ from pathlib import Path
 
 import pytest
 
+from cloudsentry_cli import checks
 from cloudsentry_cli.checks import (
+    WILDCARD,
+    build_dispatch_index,
     check_s3_public_acl,
     check_sg_open_ingress,
+    checks_for,
+    handles,
 )
 from cloudsentry_cli.scanner import _is_active_change, scan_plan
 
@@ -162,6 +167,58 @@ class TestCheckS3PublicAcl:
         assert findings == []
 
 
+# ---------------------------------------------------------------------------
+# Dispatch index
+# ---------------------------------------------------------------------------
+
+class TestDispatchIndex:
+    def test_builtin_checks_indexed_by_type(self):
+        assert checks_for("aws_security_group") == (check_sg_open_ingress,)
+        assert checks_for("aws_s3_bucket") == (check_s3_public_acl,)
+        assert checks_for("aws_instance") == ()
+
+    def test_wildcard_checks_join_every_bucket_in_order(self):
+        def any_type(resource_type, resource_name, after):
+            return []
+
+        @handles("aws_s3_bucket")
+        def s3_only(resource_type, resource_name, after):
+            return []
+
+        index = build_dispatch_index([s3_only, any_type])
+        assert index["aws_s3_bucket"] == (s3_only, any_type)
+        assert index[WILDCARD] == (any_type,)
+
+    def test_register_check_updates_index(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(checks, "CHECKS", list(checks.CHECKS))
+        monkeypatch.setattr(checks, "_DISPATCH_INDEX", checks._DISPATCH_INDEX)
+
+        @handles("aws_instance")
+        def no_public_ip(resource_type, resource_name, after):
+            if after.get("associate_public_ip_address"):
+                return [{
+                    "resource": f"{resource_type}.{resource_name}",
+                    "issue": "Instance has a public IP",
+                    "severity": "MEDIUM",
+                    "recommendation": "Place the instance behind a load balancer.",
+                }]
+            return []
+
+        checks.register_check(no_public_ip)
+        rc = [
+            {
+                "type": "aws_instance",
+                "name": "web",
+                "change": {
+                    "actions": ["create"],
+                    "after": {"associate_public_ip_address": True},
+                },
+            }
+        ]
+        findings = scan_plan(_write_plan(tmp_path, rc))
+        assert [f["issue"] for f in findings] == ["Instance has a public IP"]
+
+
 # ---------------------------------------------------------------------------
 # _is_active_change
 # ---------------------------------------------------------------------------
@@ -276,6 +333,195 @@ class TestScanPlan:
         assert len(findings) == 2
 
 
+class TestScanPlanParallel:
+    def test_jobs_matches_serial_order(self, tmp_path, monkeypatch):
+        from cloudsentry_cli import scanner
+
+        monkeypatch.setattr(scanner, "PARALLEL_CHUNK_SIZE", 3)
+        rc = []
+        for i in range(20):
+            sg = json.loads(json.dumps(_OPEN_SSH_SG))
+            sg["name"] = f"sg{i}"
+            rc.append(sg)
+            rc.append({
+                "type": "aws_s3_bucket",
+                "name": f"bucket{i}",
+                "change": {"actions": ["create"], "after": {"acl": "public-read"}},
+            })
+        path = _write_plan(tmp_path, rc)
+
+        serial = scan_plan(path)
+        assert len(serial) == 40
+        assert scan_plan(path, jobs=3) == serial
+        assert scan_plan(path, stream=True, jobs=2) == serial
+
+
+class TestScanPlanBaseline:
+    def test_only_new_or_changed_resources_evaluated(self, tmp_path):
+        from cloudsentry_cli.scanner import ScanStats, load_baseline
+
+        old_dir = tmp_path / "old"
+        old_dir.mkdir()
+        untouched = {
+            "address": "aws_s3_bucket.legacy",
+            "type": "aws_s3_bucket",
+            "name": "legacy",
+            "change": {"actions": ["update"], "after": {"acl": "public-read"}},
+        }
+        changed_old = {
+            "address": "aws_s3_bucket.assets",
+            "type": "aws_s3_bucket",
+            "name": "assets",
+            "change": {"actions": ["create"], "after": {"acl": "private"}},
+        }
+        changed_new = json.loads(json.dumps(changed_old))
+        changed_new["change"]["after"]["acl"] = "public-read-write"
+        added = dict(_OPEN_SSH_SG, address="aws_security_group.bad_sg")
+
+        baseline = load_baseline(_write_plan(old_dir, [untouched, changed_old]))
+        stats = ScanStats()
+        findings = scan_plan(
+            _write_plan(tmp_path, [untouched, changed_new, added]),
+            baseline=baseline,
+            stats=stats,
+        )
+        assert [f["resource"] for f in findings] == [
+            "aws_s3_bucket.assets",
+            "aws_security_group.bad_sg",
+        ]
+        assert stats.unchanged == 1
+
+
+class TestIterFindings:
+    def test_accepts_path_file_or_parsed_plan(self, tmp_path):
+        from cloudsentry_cli.scanner import iter_findings
+
+        path = _write_plan(tmp_path, [_OPEN_SSH_SG, _PRIVATE_BUCKET])
+        expected = scan_plan(path)
+        assert len(expected) == 1
+        assert list(iter_findings(Path(path))) == expected
+        assert list(iter_findings(json.loads(Path(path).read_text()))) == expected
+        for mode in ("r", "rb"):
+            for stream in (False, True):
+                with open(path, mode) as fh:
+                    assert list(iter_findings(fh, stream=stream)) == expected
+                    assert not fh.closed
+
+    def test_evaluates_lazily(self, tmp_path, monkeypatch):
+        from itertools import islice
+
+        from cloudsentry_cli import scanner
+        from cloudsentry_cli.scanner import ScanStats, iter_findings
+
+        monkeypatch.setattr(scanner, "PARALLEL_CHUNK_SIZE", 5)
+        stats = ScanStats()
+        findings = iter_findings(
+            _make_plan(_public_buckets(100)), stream=True, stats=stats
+        )
+        assert len(list(islice(findings, 3))) == 3
+        assert stats.resources == 5
+
+
+def _public_buckets(count: int) -> list:
+    return [
+        {
+            "type": "aws_s3_bucket",
+            "name": f"b{i}",
+            "change": {"actions": ["create"], "after": {"acl": "public-read"}},
+        }
+        for i in range(count)
+    ]
+
+
+class TestFailFast:
+    def test_stops_at_first_blocking_finding(self, tmp_path):
+        from cloudsentry_cli.findings import Severity
+        from cloudsentry_cli.scanner import ScanStats
+
+        stats = ScanStats()
+        findings = scan_plan(
+            _write_plan(tmp_path, _public_buckets(50)),
+            fail_at=Severity.HIGH,
+            stats=stats,
+        )
+        assert [f["resource"] for f in findings] == ["aws_s3_bucket.b0"]
+        assert stats.stopped_early
+
+    def test_parallel_stops_early(self, tmp_path, monkeypatch):
+        from cloudsentry_cli import scanner
+        from cloudsentry_cli.findings import Severity
+
+        monkeypatch.setattr(scanner, "PARALLEL_CHUNK_SIZE", 5)
+        findings = scan_plan(
+            _write_plan(tmp_path, _public_buckets(50)), jobs=2, fail_at=Severity.HIGH
+        )
+        assert len(findings) == 1
+
+    def test_gate_orders_and_filters_checks(self, monkeypatch):
+        from cloudsentry_cli.checks import define_rule, emits
+        from cloudsentry_cli.findings import Severity
+
+        monkeypatch.setattr(checks, "CHECKS", list(checks.CHECKS))
+        monkeypatch.setattr(checks, "_DISPATCH_INDEX", checks._DISPATCH_INDEX)
+        monkeypatch.setattr(checks, "RULES", dict(checks.RULES))
+        low = define_rule("T-LOW", "LOW", "low", "fix")
+        critical = define_rule("T-CRIT", "CRITICAL", "critical", "fix")
+
+        @handles("aws_instance")
+        @emits(low)
+        def low_check(resource_type, resource_name, after):
+            return []
+
+        @handles("aws_instance")
+        @emits(critical)
+        def critical_check(resource_type, resource_name, after):
+            return []
+
+        @handles("aws_instance")
+        def undeclared(resource_type, resource_name, after):
+            return []
+
+        checks.register_checks([low_check, critical_check, undeclared])
+        assert checks_for("aws_instance", Severity.HIGH) == (critical_check, undeclared)
+        assert checks_for("aws_instance", Severity.LOW) == (
+            critical_check, undeclared, low_check,
+        )
+        assert checks_for("aws_instance") == (low_check, critical_check, undeclared)
+
+    def test_cli_marks_report_partial(self, tmp_path):
+        from cloudsentry_cli.cli import build_parser, cmd_scan
+
+        out_file = tmp_path / "report.json"
+        args = build_parser().parse_args([
+            "scan", "--input", _write_plan(tmp_path, _public_buckets(10)),
+            "--output", str(out_file), "--fail-fast",
+        ])
+        assert cmd_scan(args) == 1
+
+        report = json.loads(out_file.read_text())
+        assert report["partial"] is True
+        assert report["summary"]["total_findings"] == 1
+
+    def test_batch_stops_at_first_failing_plan(self, tmp_path):
+        from cloudsentry_cli.cli import build_parser, cmd_scan
+
+        stacks = _write_stacks(tmp_path)
+        manifest = tmp_path / "plans.txt"
+        manifest.write_text(
+            f"{stacks / 'net' / 'tfplan.json'}\n{stacks / 'clean' / 'tfplan.json'}\n"
+        )
+        out_file = tmp_path / "report.json"
+        args = build_parser().parse_args([
+            "scan", "--manifest", str(manifest), "--output", str(out_file),
+            "--workers", "1", "--fail-fast",
+        ])
+        assert cmd_scan(args) == 1
+
+        report = json.loads(out_file.read_text())
+        assert report["partial"] is True
+        assert report["summary"]["plans"] == 1
+
+
 # ---------------------------------------------------------------------------
 # CLI integration via argparse
 # ---------------------------------------------------------------------------
@@ -406,3 +652,223 @@ class TestCLI:
         assert report["summary"]["total_findings"] >= 1
         assert report["summary"]["high"] >= 1
         assert isinstance(report["findings"], list)
+
+    def test_load_errors_are_reported_before_any_output(self, tmp_path, capsys):
+        from cloudsentry_cli.cli import build_parser, cmd_scan
+
+        broken = tmp_path / "broken.json"
+        broken.write_text('{"resource_changes": [')
+        for path in (tmp_path / "missing.json", broken):
+            args = build_parser().parse_args(["scan", "--input", str(path)])
+            assert cmd_scan(args) == 1
+            out, err = capsys.readouterr()
+            assert out == ""
+            assert err.startswith("ERROR:")
+
+
+# ---------------------------------------------------------------------------
+# Batch mode
+# ---------------------------------------------------------------------------
+
+_OPEN_SSH_SG = {
+    "type": "aws_security_group",
+    "name": "bad_sg",
+    "change": {
+        "actions": ["create"],
+        "after": {
+            "ingress": [
+                {
+                    "from_port": 22,
+                    "to_port": 22,
+                    "cidr_blocks": ["0.0.0.0/0"],
+                    "ipv6_cidr_blocks": [],
+                }
+            ]
+        },
+    },
+}
+
+_PRIVATE_BUCKET = {
+    "type": "aws_s3_bucket",
+    "name": "safe",
+    "change": {"actions": ["create"], "after": {"acl": "private"}},
+}
+
+
+def _write_stacks(tmp_path: Path) -> Path:
+    """Write two stacks, one clean and one with an open SG, under stacks/."""
+    for stack, rc in (("clean", [_PRIVATE_BUCKET]), ("net", [_OPEN_SSH_SG])):
+        stack_dir = tmp_path / "stacks" / stack
+        stack_dir.mkdir(parents=True)
+        (stack_dir / "tfplan.json").write_text(json.dumps(_make_plan(rc)))
+    return tmp_path / "stacks"
+
+
+class TestBatchScan:
+    @pytest.mark.parametrize("cpu_max, expected", [
+        ("max 100000\n", None),
+        ("200000 100000\n", 2),
+        ("150000 100000\n", 2),
+        ("5000 100000\n", 1),
+    ])
+    def test_cgroup_cpu_quota(self, tmp_path, cpu_max, expected):
+        from cloudsentry_cli.scanner import _cgroup_cpu_quota
+
+        path = tmp_path / "cpu.max"
+        path.write_text(cpu_max)
+        assert _cgroup_cpu_quota(str(path)) == expected
+        assert _cgroup_cpu_quota(str(tmp_path / "missing")) is None
+
+    def test_default_workers_capped_by_cgroup_quota(self, tmp_path, monkeypatch):
+        from cloudsentry_cli import scanner
+
+        monkeypatch.setattr(scanner.os, "sched_getaffinity", lambda pid: set(range(8)),
+                            raising=False)
+        cpu_max = tmp_path / "cpu.max"
+        monkeypatch.setattr(scanner, "CGROUP_CPU_MAX", str(cpu_max))
+        cpu_max.write_text("200000 100000\n")
+        assert scanner.default_workers() == 2
+        cpu_max.write_text("max 100000\n")
+        assert scanner.default_workers() == 8
+
+    def test_scan_plans_pool_preserves_input_order(self, tmp_path):
+        from cloudsentry_cli.scanner import scan_plans
+
+        stacks = _write_stacks(tmp_path)
+        paths = [str(stacks / "net" / "tfplan.json"), str(stacks / "clean" / "tfplan.json")]
+        results = list(scan_plans(paths, workers=2))
+        assert [r.input for r in results] == paths
+        assert [len(r.findings) for r in results] == [1, 0]
+
+    def test_glob_input_aggregates_report(self, tmp_path):
+        from cloudsentry_cli.cli import build_parser, cmd_scan
+
+        stacks = _write_stacks(tmp_path)
+        out_file = tmp_path / "report.json"
+        args = build_parser().parse_args([
+            "scan", "--input", str(stacks / "**" / "tfplan.json"),
+            "--output", str(out_file), "--workers", "1",
+        ])
+        assert cmd_scan(args) == 1
+
+        report = json.loads(out_file.read_text())
+        assert report["summary"]["plans"] == 2
+        assert report["summary"]["high"] == 1
+        assert [Path(p["input"]).parent.name for p in report["plans"]] == ["clean", "net"]
+        assert report["plans"][1]["summary"]["total_findings"] == 1
+
+    def test_manifest_missing_plan_fails_gate(self, tmp_path):
+        from cloudsentry_cli.cli import build_parser, cmd_scan
+
+        stacks = _write_stacks(tmp_path)
+        manifest = tmp_path / "plans.txt"
+        manifest.write_text(
+            f"# clean stack only\n{stacks / 'clean' / 'tfplan.json'}\n\n"
+            f"{tmp_path / 'missing.json'}\n"
+        )
+        out_file = tmp_path / "report.json"
+        args = build_parser().parse_args(
+            ["scan", "--manifest", str(manifest), "--output", str(out_file)]
+        )
+        assert cmd_scan(args) == 1
+
+        report = json.loads(out_file.read_text())
+        assert report["summary"]["plan_errors"] == 1
+        assert "not found" in report["plans"][1]["error"]
+
+
+# ---------------------------------------------------------------------------
+# count/for_each instance deduplication
+# ---------------------------------------------------------------------------
+
+def _sg_rules(name: str, count: int, cidr: str = "0.0.0.0/0") -> list:
+    return [
+        {
+            "address": f"aws_security_group_rule.{name}[{i}]",
+            "type": "aws_security_group_rule",
+            "name": name,
+            "change": {
+                "actions": ["create"],
+                "after": {
+                    "type": "ingress",
+                    "from_port": 22,
+                    "to_port": 22,
+                    "cidr_blocks": [cidr],
+                },
+            },
+        }
+        for i in range(count)
+    ]
+
+
+class TestInstanceDeduplication:
+    def test_identical_instances_are_evaluated_once(self, monkeypatch):
+        from cloudsentry_cli import scanner
+        from cloudsentry_cli.scanner import ScanStats
+
+        calls = []
+        real = scanner._evaluate_resource
+        monkeypatch.setattr(
+            scanner, "_evaluate_resource",
+            lambda rc, *args: calls.append(rc.address) or real(rc, *args),
+        )
+        stats = ScanStats()
+        findings = scan_plan(_make_plan(_sg_rules("ssh", 500)), stats=stats)
+
+        assert calls == ["aws_security_group_rule.ssh[0]"]
+        assert len(findings) == 500
+        assert {f.resource for f in findings} == {"aws_security_group_rule.ssh"}
+        assert (stats.evaluated, stats.deduplicated) == (1, 499)
+
+    def test_groups_are_per_type_and_content(self):
+        from cloudsentry_cli.scanner import ScanStats
+
+        plan = _make_plan(
+            _sg_rules("a", 3) + _sg_rules("b", 2, cidr="10.0.0.0/8")
+            + _sg_rules("c", 2) + [_OPEN_SSH_SG, _OPEN_SSH_SG]
+        )
+        stats = ScanStats()
+        findings = scan_plan(plan, stats=stats)
+
+        # a and c share content but keep their own labels; plain resources
+        # (no instance key) are never grouped.
+        assert [f.resource for f in findings] == (
+            ["aws_security_group_rule.a"] * 3
+            + ["aws_security_group_rule.c"] * 2
+            + ["aws_security_group.bad_sg"] * 2
+        )
+        assert (stats.evaluated, stats.deduplicated) == (4, 5)
+
+    def test_same_result_with_jobs_cache_and_fail_fast(self, tmp_path):
+        from cloudsentry_cli.cache import FindingsCache
+        from cloudsentry_cli.findings import Severity
+
+        rules = _sg_rules("a", 1200) + _sg_rules("b", 5, cidr="10.0.0.0/8")
+        plan = _make_plan(rules)
+        serial = [f.to_dict() for f in scan_plan(plan)]
+
+        assert [f.to_dict() for f in scan_plan(plan, jobs=2)] == serial
+        with FindingsCache(str(tmp_path / "cache.sqlite")) as cache:
+            assert [f.to_dict() for f in scan_plan(plan, cache=cache)] == serial
+        assert len(scan_plan(plan, fail_at=Severity.HIGH)) == 1
+
+    def test_group_limit(self, monkeypatch):
+        from cloudsentry_cli import scanner
+        from cloudsentry_cli.scanner import ScanStats
+
+        monkeypatch.setattr(scanner, "DEDUP_MAX_GROUPS", 1)
+        stats = ScanStats()
+        plan = _make_plan(_sg_rules("a", 3) + _sg_rules("b", 3, cidr="10.0.0.0/8"))
+        scan_plan(plan, stats=stats)
+        assert (stats.evaluated, stats.deduplicated) == (4, 2)
+
+    def test_cli_reports_unique_evaluations(self, tmp_path, capsys):
+        from cloudsentry_cli.cli import build_parser, cmd_scan
+
+        path = _write_plan(tmp_path, _sg_rules("ssh", 50))
+        out_file = tmp_path / "report.json"
+        args = build_parser().parse_args(["scan", "--input", path, "--output", str(out_file)])
+
+        assert cmd_scan(args) == 1
+        assert "Evaluations    : 1 unique of 50 resource(s)" in capsys.readouterr().out
+        assert json.loads(out_file.read_text())["evaluations"] == {"resources": 50, "unique": 1}
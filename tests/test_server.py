@@ -0,0 +1,265 @@
+"""Tests for the scan daemon and its thin client."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from cloudsentry_cli import checks, client, rulefile
+from cloudsentry_cli import server as server_module
+from cloudsentry_cli.server import (
+    ScanService,
+    check_cwd,
+    make_server,
+    parse_listen,
+    run_scan,
+    serve,
+)
+
+from tests.test_rulefile import _rule, _write_rules
+from tests.test_scanner import _OPEN_SSH_SG, _write_plan
+
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def daemon():
+    """Start a daemon on an ephemeral port; yields a factory taking the service."""
+    servers = []
+
+    def start(service, address=("127.0.0.1", 0)):
+        token = None if isinstance(address, str) else TOKEN
+        server = make_server(address, service, quiet=True, token=token)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append((server, service))
+        if isinstance(address, str):
+            return f"unix:{address}"
+        return f"127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server, service in servers:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+def _in_threads(workers=1, queue_size=0, run=run_scan):
+    return ScanService(workers, queue_size, pool_factory=ThreadPoolExecutor, run=run)
+
+
+def _crash_on_request(argv, cwd):
+    """A scan that kills its worker process when asked to."""
+    if argv == ["crash"]:
+        os._exit(1)
+    return {"exit_code": 0, "stdout": "", "stderr": ""}
+
+
+class TestParseListen:
+    def test_addresses(self):
+        assert parse_listen("127.0.0.1:8787") == ("127.0.0.1", 8787)
+        assert parse_listen("[::1]:9000") == ("::1", 9000)
+        assert parse_listen("unix:/tmp/cs.sock") == "/tmp/cs.sock"
+
+    @pytest.mark.parametrize("spec", ["0.0.0.0:8787", "example.com:80", "8787", "unix:"])
+    def test_rejected(self, spec):
+        with pytest.raises(ValueError):
+            parse_listen(spec)
+
+
+class TestAccessControl:
+    def test_tcp_requires_a_token(self, capsys):
+        service = _in_threads()
+        try:
+            with pytest.raises(ValueError, match="token"):
+                make_server(("127.0.0.1", 0), service)
+        finally:
+            service.close()
+        assert serve("127.0.0.1:0", workers=1) == 1
+        assert "CLOUDSENTRY_TOKEN" in capsys.readouterr().err
+
+    def test_wrong_or_missing_token_is_refused(self, daemon):
+        server = daemon(_in_threads())
+        assert client.request(server, "GET", "/health")[0] == 401
+        assert client.request(server, "GET", "/health", token="nope")[0] == 401
+        assert client.request(server, "GET", "/health", token=TOKEN)[0] == 200
+
+    def test_unix_socket_is_owner_only(self, tmp_path, daemon):
+        path = tmp_path / "run" / "cs.sock"
+        daemon(_in_threads(), str(path))
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        assert stat.S_IMODE(os.stat(path.parent).st_mode) == 0o700
+
+    def test_default_socket_is_per_user(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        assert client.default_server() == f"unix:{tmp_path / 'cloudsentry.sock'}"
+        monkeypatch.delenv("XDG_RUNTIME_DIR")
+        assert f"cloudsentry-{os.getuid()}" in client.default_server()
+
+    def test_cwd_must_be_an_owned_absolute_directory(self, tmp_path, monkeypatch):
+        assert check_cwd(str(tmp_path)) == str(tmp_path)
+        for bad in (None, "relative", str(tmp_path / "missing")):
+            with pytest.raises(ValueError):
+                check_cwd(bad)
+        monkeypatch.setattr(server_module.os, "getuid", lambda: os.stat(tmp_path).st_uid + 1)
+        with pytest.raises(PermissionError):
+            check_cwd(str(tmp_path))
+
+    def test_bad_cwd_is_rejected_before_scanning(self, tmp_path, daemon):
+        server = daemon(_in_threads(), str(tmp_path / "cs.sock"))
+        status, body = client.request(
+            server, "POST", "/scan", {"argv": [], "cwd": "relative"}
+        )
+        assert status == 400 and "cwd" in body["error"]
+
+
+class TestRunScan:
+    def test_matches_the_cli(self, tmp_path):
+        _write_plan(tmp_path, [_OPEN_SSH_SG])
+        result = run_scan(["--input", "tfplan.json", "--output", "report.json"], str(tmp_path))
+
+        assert result["exit_code"] == 1
+        assert "above threshold" in result["stdout"]
+        report = json.loads((tmp_path / "report.json").read_text())
+        assert report["summary"]["high"] == 1
+
+    def test_usage_errors_become_exit_codes(self, tmp_path):
+        result = run_scan(["--fail-on", "NOPE"], str(tmp_path))
+        assert result["exit_code"] == 2
+        assert "usage:" in result["stderr"]
+
+    def test_rule_files_do_not_leak_between_requests(self, tmp_path):
+        rules = _write_rules(tmp_path, _rule())
+        _write_plan(tmp_path, [])
+        before = (list(checks.CHECKS), dict(checks.RULES), rulefile.loaded_rule_files())
+
+        result = run_scan(
+            ["--input", "tfplan.json", "--rules", rules, "--rules-cache", "cache"],
+            str(tmp_path),
+        )
+
+        assert result["exit_code"] == 0, result["stderr"]
+        assert (checks.CHECKS, checks.RULES, rulefile.loaded_rule_files()) == before
+
+
+class TestScanService:
+    def test_full_queue_is_refused(self):
+        release = threading.Event()
+        service = _in_threads(workers=1, queue_size=1, run=lambda argv, cwd: (
+            release.wait(5), {"exit_code": 0, "stdout": "", "stderr": ""})[1])
+        try:
+            first = service.submit([])
+            second = service.submit([])
+            assert service.submit([]) is None
+            assert service.status()["running"] == 1
+            assert service.status()["queued"] == 1
+
+            release.set()
+            assert first.result()["exit_code"] == second.result()["exit_code"] == 0
+            assert service.submit([]).result()["exit_code"] == 0
+            assert service.status()["rejected"] == 1
+        finally:
+            release.set()
+            service.close()
+
+
+    def test_crashed_worker_pool_is_replaced(self):
+        service = ScanService(workers=1, queue_size=0, run=_crash_on_request)
+        try:
+            with pytest.raises(BrokenProcessPool):
+                service.submit(["crash"]).result()
+
+            assert service.submit(["ok"]).result()["exit_code"] == 0
+            status = service.status()
+            assert status["status"] == "ok" and status["restarts"] == 1
+        finally:
+            service.close()
+
+
+class TestClient:
+    def test_round_trip_over_tcp(self, tmp_path, daemon, capsys, monkeypatch):
+        _write_plan(tmp_path, [_OPEN_SSH_SG])
+        server = daemon(_in_threads())
+        monkeypatch.chdir(tmp_path)
+
+        monkeypatch.setenv(client.TOKEN_ENV, TOKEN)
+
+        with pytest.raises(SystemExit) as exc:
+            client.main(["--server", server, "scan", "--input", "tfplan.json",
+                         "--output", "report.json"])
+
+        assert exc.value.code == 1
+        assert "above threshold" in capsys.readouterr().out
+        assert (tmp_path / "report.json").exists()
+
+    def test_round_trip_over_unix_socket(self, tmp_path, daemon):
+        _write_plan(tmp_path, [])
+        server = daemon(_in_threads(), str(tmp_path / "cs.sock"))
+
+        result = client.forward_scan(server, ["--input", "tfplan.json"], str(tmp_path))
+
+        assert result["exit_code"] == 0
+        assert client.request(server, "GET", "/health")[1]["completed"] == 1
+
+    def test_full_queue_is_reported(self, daemon):
+        release = threading.Event()
+        service = _in_threads(workers=1, queue_size=0, run=lambda argv, cwd: (
+            release.wait(5), {"exit_code": 0, "stdout": "", "stderr": ""})[1])
+        server = daemon(service)
+        try:
+            service.submit([])
+            result = client.forward_scan(server, ["--input", "x.json"], token=TOKEN)
+        finally:
+            release.set()
+
+        assert result["exit_code"] == client.UNAVAILABLE_EXIT
+        assert "queue is full" in result["stderr"]
+
+    def test_bad_request(self, daemon):
+        server = daemon(_in_threads())
+        status, body = client.request(
+            server, "POST", "/scan", {"argv": "--input x"}, token=TOKEN
+        )
+        assert status == 400 and "argv" in body["error"]
+
+    def test_dropped_connection_is_unavailable(self, tmp_path, capsys):
+        path = str(tmp_path / "drop.sock")
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        listener.listen(1)
+
+        def drop():
+            conn, _ = listener.accept()
+            conn.recv(65536)
+            conn.close()
+
+        threading.Thread(target=drop, daemon=True).start()
+        try:
+            with pytest.raises(SystemExit) as exc:
+                client.main(["--server", f"unix:{path}", "--no-fallback", "scan",
+                             "--input", "tfplan.json"])
+        finally:
+            listener.close()
+        assert exc.value.code == client.UNAVAILABLE_EXIT
+        assert "dropped the request" in capsys.readouterr().err
+
+    def test_falls_back_to_a_local_scan(self, tmp_path, capsys, monkeypatch):
+        _write_plan(tmp_path, [])
+        monkeypatch.chdir(tmp_path)
+        server = f"unix:{tmp_path / 'missing.sock'}"
+
+        with pytest.raises(SystemExit) as exc:
+            client.main(["--server", server, "scan", "--input", "tfplan.json"])
+        assert exc.value.code == 0
+
+        with pytest.raises(SystemExit) as exc:
+            client.main(["--server", server, "--no-fallback", "scan", "--input", "tfplan.json"])
+        assert exc.value.code == client.UNAVAILABLE_EXIT
+        assert "No cloudsentry daemon" in capsys.readouterr().err
@@ -0,0 +1,102 @@
+"""Tests for live inventory snapshots."""
+
+from __future__ import annotations
+
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from cloudsentry_cli.live import LiveTarget, collect, iam_user_resource, _IamUser
+from cloudsentry_cli.snapshot import SnapshotStore, replay_snapshot
+
+from tests.test_live import NOW, _session_for
+
+TARGET = LiveTarget("111111111111", "eu-west-1", "security_groups")
+
+
+class TestSnapshotStore:
+    def test_round_trip(self, tmp_path):
+        user = iam_user_resource(_IamUser("alice", True, False, [NOW - timedelta(days=5)]), NOW)
+        with SnapshotStore(str(tmp_path / "inv.sqlite")) as store:
+            store.put(TARGET, [user], NOW)
+            resources, fetched_at = store.get(TARGET)
+
+        assert resources == [user]
+        assert fetched_at == NOW
+
+    def test_expired_entries_are_misses(self, tmp_path):
+        fetched = datetime.fromtimestamp(time.time() - 600, timezone.utc)
+        with SnapshotStore(str(tmp_path / "inv.sqlite")) as store:
+            store.put(TARGET, [], fetched)
+
+            assert store.get(TARGET, ttl=300) is None
+            assert store.get(TARGET, ttl=900) is not None
+            assert store.get(TARGET._replace(region="us-east-1")) is None
+
+
+class TestCollectWithStore:
+    def _collect(self, store, fetched, **kwargs):
+        return list(collect(
+            regions=["eu-west-1", "us-west-2"],
+            session_for=_session_for(fetched),
+            options={"iam_source": "api"},
+            store=store,
+            **kwargs,
+        ))
+
+    def test_fresh_inventory_is_reused(self, tmp_path):
+        fetched = []
+        with SnapshotStore(str(tmp_path / "inv.sqlite")) as store:
+            first = self._collect(store, fetched)
+            second = self._collect(store, fetched)
+
+        assert sorted(fetched) == ["eu-west-1", "iam", "us-west-2"]
+        assert [r.cached for r in second] == [True, True, True]
+        assert [r.resources for r in second] == [r.resources for r in first]
+
+    def test_only_expired_collectors_are_refreshed(self, tmp_path):
+        fetched = []
+        with SnapshotStore(str(tmp_path / "inv.sqlite")) as store:
+            self._collect(store, fetched)
+            fetched.clear()
+            self._collect(store, fetched, ttls={"security_groups": -1})
+
+        assert sorted(fetched) == ["eu-west-1", "us-west-2"]
+
+
+class TestReplay:
+    def test_replay_through_the_cli_is_reproducible(self, tmp_path):
+        from cloudsentry_cli.cli import build_parser, cmd_live
+
+        path = str(tmp_path / "inv.sqlite")
+        with SnapshotStore(path) as store:
+            list(collect(
+                [], ["eu-west-1"], session_for=_session_for([]),
+                options={"iam_source": "api"}, store=store, now=NOW,
+            ))
+
+        reports = []
+        for n in range(2):
+            out = tmp_path / f"report-{n}.json"
+            args = build_parser().parse_args(
+                ["live", "--snapshot", path, "--output", str(out)]
+            )
+            assert cmd_live(args) == 1
+            report = json.loads(out.read_text())
+            reports.append(report["plans"])
+
+        assert reports[0] == reports[1]
+        assert [p["input"] for p in reports[0]] == [
+            "111111111111/global/iam_users",
+            "111111111111/eu-west-1/security_groups",
+        ]
+        # Key age is as of the snapshot, not of the replay.
+        assert reports[0][0]["findings"][0]["rule_id"] == "CS-IAM-001"
+
+    def test_replay_yields_stored_targets(self, tmp_path):
+        path = str(tmp_path / "inv.sqlite")
+        with SnapshotStore(path) as store:
+            store.put(TARGET, [], NOW)
+
+        [result] = replay_snapshot(path)
+        assert result.target == TARGET and result.cached
@@ -0,0 +1,140 @@
+"""Tests for incremental rescans (watch mode)."""
+
+from __future__ import annotations
+
+import copy
+import os
+
+import pytest
+
+from cloudsentry_cli import cli, decoders, scanner
+from cloudsentry_cli.watch import IncrementalScan, file_changes
+
+from tests.test_scanner import _OPEN_SSH_SG, _PRIVATE_BUCKET, _write_plan
+
+
+def _sg(name: str, port: int = 22) -> dict:
+    sg = copy.deepcopy(_OPEN_SSH_SG)
+    sg["name"] = name
+    sg["address"] = f"aws_security_group.{name}"
+    ingress = sg["change"]["after"]["ingress"][0]
+    ingress["from_port"] = ingress["to_port"] = port
+    return sg
+
+
+def _closed(name: str) -> dict:
+    sg = _sg(name)
+    sg["change"]["after"]["ingress"][0]["cidr_blocks"] = ["10.0.0.0/8"]
+    return sg
+
+
+class TestIncrementalScan:
+    def test_first_pass_reports_everything_as_new(self, tmp_path):
+        scan = IncrementalScan()
+        delta = scan.update(_write_plan(tmp_path, [_sg("a"), _PRIVATE_BUCKET]))
+
+        assert delta.evaluated == 2 and delta.unchanged == 0
+        assert [f.resource for f in delta.new] == ["aws_security_group.a"]
+        assert delta.resolved == []
+
+    def test_only_changed_resources_are_evaluated(self, tmp_path, monkeypatch):
+        scan = IncrementalScan()
+        scan.update(_write_plan(tmp_path, [_sg("a"), _sg("b"), _sg("c")]))
+
+        evaluated = []
+        real = scanner._evaluate_resource
+        monkeypatch.setattr(
+            scanner, "_evaluate_resource",
+            lambda rc, *args: evaluated.append(rc.name) or real(rc, *args),
+        )
+        delta = scan.update(_write_plan(tmp_path, [_sg("a"), _closed("b"), _sg("c")]))
+
+        assert evaluated == ["b"]
+        assert (delta.evaluated, delta.unchanged) == (1, 2)
+        assert delta.new == []
+        assert [f.resource for f in delta.resolved] == ["aws_security_group.b"]
+        assert len(scan.findings()) == 2
+
+    def test_new_and_removed_resources(self, tmp_path):
+        scan = IncrementalScan()
+        scan.update(_write_plan(tmp_path, [_sg("a"), _sg("b")]))
+        delta = scan.update(_write_plan(tmp_path, [_sg("b"), _sg("d", port=3389)]))
+
+        assert delta.removed == 1
+        assert [f.resource for f in delta.new] == ["aws_security_group.d"]
+        assert [f.resource for f in delta.resolved] == ["aws_security_group.a"]
+
+    def test_unreadable_plan_keeps_previous_results(self, tmp_path):
+        scan = IncrementalScan()
+        path = _write_plan(tmp_path, [_sg("a")])
+        scan.update(path)
+        (tmp_path / "tfplan.json").write_text('{"resource_changes": [')
+
+        with pytest.raises(ValueError):
+            scan.update(path)
+        assert len(scan.findings()) == 1
+        assert scan.update(_write_plan(tmp_path, [_sg("a")])).evaluated == 0
+
+    def test_plan_is_read_not_mapped(self, tmp_path, monkeypatch):
+        # A plan truncated while mapped would kill the watcher with SIGBUS.
+        def no_mmap(*args, **kwargs):
+            raise AssertionError("watched plan was memory-mapped")
+
+        monkeypatch.setattr(decoders.mmap, "mmap", no_mmap)
+        delta = IncrementalScan().update(_write_plan(tmp_path, [_sg("a")]))
+
+        assert [f.resource for f in delta.new] == ["aws_security_group.a"]
+
+
+class TestFileChanges:
+    def test_yields_on_each_change_only(self, tmp_path):
+        path = tmp_path / "tfplan.json"
+        path.write_text("{}")
+        edits = iter([None, "{ }", None, None, '{"a": 1}'])
+        mtime = [os.stat(path).st_mtime_ns]
+
+        def sleep(_interval):
+            text = next(edits)
+            if text is not None:
+                path.write_text(text)
+                mtime[0] += 1_000_000_000
+                os.utime(path, ns=(mtime[0], mtime[0]))
+
+        changes = file_changes(str(path), sleep=sleep)
+        assert sum(1 for _ in zip(range(3), changes)) == 3
+
+    def test_missing_file_is_waited_for(self, tmp_path):
+        path = tmp_path / "tfplan.json"
+        polls = []
+
+        def sleep(_interval):
+            polls.append(1)
+            if len(polls) == 3:
+                path.write_text("{}")
+
+        next(file_changes(str(path), sleep=sleep))
+        assert len(polls) == 3
+
+
+class TestCmdWatch:
+    def test_prints_deltas_and_exits_on_interrupt(self, tmp_path, capsys, monkeypatch):
+        versions = [[_sg("a")], [_closed("a"), _sg("b", port=3389)], None]
+
+        def changes(path, interval):
+            for resources in versions:
+                if resources is None:
+                    raise KeyboardInterrupt
+                _write_plan(tmp_path, resources)
+                yield
+
+        monkeypatch.setattr(cli, "file_changes", changes)
+        args = cli.build_parser().parse_args(
+            ["watch", "--input", str(tmp_path / "tfplan.json")]
+        )
+
+        assert cli.cmd_watch(args) == 1
+        out = capsys.readouterr().out
+        assert "+ [HIGH    ] aws_security_group.a" in out
+        assert "- [HIGH    ] aws_security_group.a" in out
+        assert "+ [HIGH    ] aws_security_group.b" in out
+        assert "1 resource(s) re-evaluated, 0 unchanged" in out